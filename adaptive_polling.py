@@ -0,0 +1,107 @@
+# adaptive_polling.py
+from register_map import restrict_plan
+
+# Unchanged polls in a row before a register's interval is doubled.
+DEFAULT_BACKOFF_AFTER = 3
+
+
+class AdaptivePollScheduler:
+    """
+    Per-register poll intervals for one table, adapted to how often each
+    register changes.
+
+    Every register has a tier t (a power of two between 1 and `max_tier`)
+    and is read on every t-th refresh cycle. Changes are detected on the raw
+    words, so enums, flags and 32-bit values count as well as the
+    single-word numbers the GUI colours. A register that changed drops
+    to half its tier; one that stayed the same for `backoff_after` polls in
+    a row moves up a tier. Registers in the same group always share the
+    lowest tier of the group so they keep being read together, and `pinned`
+    registers (e.g. alarm inputs) stay at tier 1.
+
+    plan() returns the read plan for the registers due this cycle, derived
+    from the table's full plan with restrict_plan(), so blocks only shrink
+    or drop out and never bridge addresses the full plan would not read.
+    Plans are cached per due set and rebuilt when tiers change.
+    """
+
+    def __init__(self, table, max_tier=8, pinned=(), backoff_after=DEFAULT_BACKOFF_AFTER):
+        self.table = table
+        self.max_tier = max(1, max_tier)
+        self.backoff_after = backoff_after
+        self.pinned = frozenset(pinned)
+        self.tiers = {reg["address"]: 1 for reg in table.registers}
+        self.unchanged = dict.fromkeys(self.tiers, 0)
+        self.last_raw = {}
+        present = set(self.tiers)
+        self.groups = []
+        for _, addresses in table.groups:
+            members = tuple(address for address in addresses if address in present)
+            if len(members) > 1:
+                self.groups.append(members)
+        self.cycle = 0
+        self._dirty = False
+        self._plans = {}
+
+    def set_pinned(self, pinned):
+        """Replace the pinned registers; newly pinned ones are due again from the current cycle."""
+        self.pinned = frozenset(pinned)
+        for address in self.pinned:
+            if self.tiers.get(address, 1) != 1:
+                self.tiers[address] = 1
+                self.unchanged[address] = 0
+                self._dirty = True
+
+    def due(self):
+        cycle = self.cycle
+        return frozenset(address for address, tier in self.tiers.items() if cycle % tier == 0)
+
+    def plan(self):
+        """Read plan for the current cycle."""
+        due = self.due()
+        plan = self._plans.get(due)
+        if plan is None:
+            plan = self._plans[due] = restrict_plan(self.table.read_plan, lambda reg: reg["address"] in due)
+        return plan
+
+    def observe(self, address, raw_list):
+        """Record the value a register read this cycle; returns True if it changed."""
+        tier = self.tiers.get(address)
+        if tier is None or raw_list is None:
+            return False
+        previous = self.last_raw.get(address)
+        self.last_raw[address] = raw_list
+        if previous is None:
+            return False
+        if raw_list != previous:
+            self.unchanged[address] = 0
+            if tier > 1:
+                self.tiers[address] = tier // 2
+                self._dirty = True
+            return True
+        count = self.unchanged[address] + 1
+        if count >= self.backoff_after and tier < self.max_tier and address not in self.pinned:
+            self.tiers[address] = tier * 2
+            self._dirty = True
+            count = 0
+        self.unchanged[address] = count
+        return False
+
+    def advance(self):
+        """Finish the current cycle: align groups and move to the next cycle."""
+        if self._dirty:
+            tiers = self.tiers
+            for members in self.groups:
+                lowest = min(tiers[address] for address in members)
+                for address in members:
+                    tiers[address] = lowest
+            for address in self.pinned:
+                if address in tiers:
+                    tiers[address] = 1
+            self._plans.clear()
+            self._dirty = False
+        self.cycle += 1
+
+    def summary(self):
+        """(registers due this cycle, registers in the table)."""
+        return len(self.due()), len(self.tiers)
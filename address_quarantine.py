@@ -0,0 +1,134 @@
+# address_quarantine.py
+import logging
+import time
+
+from register_map import ReadBlock, read_block, read_units, split_block
+
+logger = logging.getLogger("quarantine")
+
+# Seconds before a quarantined register is first probed again; the delay
+# doubles after every failed probe, up to DEFAULT_MAX_DELAY.
+DEFAULT_REPROBE_DELAY = 60.0
+DEFAULT_MAX_DELAY = 3600.0
+
+
+class AddressQuarantine:
+    """
+    Registers the inverter refuses to read, keyed by (function, address), so
+    tables sharing a function code (input, self-test, parallel) share them.
+
+    read() reads a block and, if the inverter answers with an exception
+    response, bisects it until the registers that fail on their own are
+    found. Those are quarantined and the rest of the block's values are still
+    returned. apply() then takes quarantined registers out of a read plan,
+    splitting blocks so that no request spans one, and adds a probe for each
+    register whose re-probe time has come. A probe that succeeds releases the
+    register; one that fails doubles its delay.
+
+    Blocks are only ever split between read units (register_map.read_units),
+    so a register group (LSB/MSB halves, the inputs of a derived metric)
+    still comes from one request: a failing group is quarantined, skipped
+    and probed as a whole.
+
+    Only exception responses are bisected. A request that raises (timeout,
+    lost connection) says nothing about the addresses it covered.
+    """
+
+    def __init__(self, reprobe_delay=DEFAULT_REPROBE_DELAY, max_delay=DEFAULT_MAX_DELAY, clock=time.monotonic):
+        self.reprobe_delay = reprobe_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.entries = {}       # (function, address) -> [failed probes, next probe time]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def clear(self):
+        self.entries.clear()
+
+    def fail(self, function, reg):
+        """Quarantine a register that failed on its own, or back off its next probe."""
+        key = (function, reg["address"])
+        entry = self.entries.get(key)
+        failures = 0 if entry is None else entry[0] + 1
+        delay = min(self.max_delay, self.reprobe_delay * 2 ** failures)
+        self.entries[key] = [failures, self.clock() + delay]
+        if entry is None:
+            logger.info("Quarantined %s register 0x%04X (%s), re-probing in %.0f s",
+                        function, reg["address"], reg["description"], delay)
+
+    def release(self, function, reg):
+        if self.entries.pop((function, reg["address"]), None) is not None:
+            logger.info("Released %s register 0x%04X (%s)", function, reg["address"], reg["description"])
+
+    def apply(self, function, read_plan, groups=()):
+        """
+        (plan, skipped): the read plan without quarantined registers plus a
+        probe block per register due for a re-probe, and the registers left
+        out this time. Blocks are only split between read units (see
+        register_map.read_units), so a group with a quarantined member is
+        left out, or probed, as a whole.
+        """
+        entries = self.entries
+        if not entries:
+            return read_plan, ()
+        now = self.clock()
+        blocks = []
+        probes = []
+        skipped = []
+        for block in read_plan:
+            if not any((function, reg["address"]) in entries for reg in block.registers):
+                blocks.append(block)
+                continue
+            run = []
+            for start, end, members in read_units(block.registers, groups):
+                due = [entries[key][1] for key in ((function, reg["address"]) for reg in members) if key in entries]
+                if not due:
+                    run.extend(members)
+                    continue
+                if run:
+                    blocks.append(_span(run))
+                    run = []
+                if now >= min(due):
+                    probes.append(ReadBlock(start, end - start, tuple(members)))
+                else:
+                    skipped.extend(members)
+            if run:
+                blocks.append(_span(run))
+        return blocks + probes, skipped
+
+    def read(self, client, function, block, on_request=None, groups=()):
+        """
+        [(register, raw_list or None)] for a block, bisecting it between read
+        units on an exception response. A unit that fails on its own (one
+        register, or a group with what lies between its members) is
+        quarantined as a whole. on_request(block, seconds, error) is called
+        after every request. Transport exceptions propagate.
+        """
+        t0 = time.perf_counter()
+        resp = read_block(client, function, block.start, block.count)
+        error = resp.isError()
+        if on_request is not None:
+            on_request(block, time.perf_counter() - t0, error)
+        if not error:
+            if self.entries:
+                for reg in block.registers:
+                    self.release(function, reg)
+            return list(split_block(block, resp.registers))
+        units = [members for _, _, members in read_units(block.registers, groups)]
+        if len(units) == 1:
+            for reg in units[0]:
+                self.fail(function, reg)
+            return [(reg, None) for reg in units[0]]
+        half = len(units) // 2
+        return (self.read(client, function, _span([reg for unit in units[:half] for reg in unit]), on_request, groups)
+                + self.read(client, function, _span([reg for unit in units[half:] for reg in unit]), on_request, groups))
+
+
+def _span(members):
+    start = min(reg["address"] for reg in members)
+    end = max(reg["address"] + reg["length"] for reg in members)
+    return ReadBlock(start, end - start, tuple(members))
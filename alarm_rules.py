@@ -0,0 +1,260 @@
+# alarm_rules.py
+import fnmatch
+import json
+import logging
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import urllib.request
+
+from register_utils import decode_numeric
+
+logger = logging.getLogger("alarms")
+
+_COMPARE = {
+    ">": lambda v, t: v > t,
+    ">=": lambda v, t: v >= t,
+    "<": lambda v, t: v < t,
+    "<=": lambda v, t: v <= t,
+    "==": lambda v, t: v == t,
+    "!=": lambda v, t: v != t,
+}
+
+
+class AlarmEvent:
+    __slots__ = ("rule", "register", "raised", "value", "timestamp")
+
+    def __init__(self, rule, register, raised, value, timestamp):
+        self.rule = rule
+        self.register = register
+        self.raised = raised
+        self.value = value
+        self.timestamp = timestamp
+
+    def message(self):
+        state = "RAISED" if self.raised else "cleared"
+        return (f"[{self.rule.severity}] {self.rule.name} {state}: "
+                f"{self.register['description']} (0x{self.register['address']:04X}) = {self.value}")
+
+    def as_dict(self):
+        return {
+            "rule": self.rule.name,
+            "severity": self.rule.severity,
+            "state": "raised" if self.raised else "cleared",
+            "register": self.register["description"],
+            "address": f"0x{self.register['address']:04X}",
+            "value": self.value,
+            "timestamp": self.timestamp,
+        }
+
+
+class AlarmRule:
+    """
+    A rule from the rules file:
+      {"name": "Battery hot", "table": "input", "register": "TemperatureBat",
+       "condition": ">", "threshold": 45, "hysteresis": 3, "hold": 30,
+       "severity": "warning", "notify": ["log", "desktop", "webhook"]}
+
+    "register" may be a description, a "0x...." address or an fnmatch pattern
+    ("BatFaultMessage*"); every matching register gets its own alarm state.
+    Conditions: > >= < <= == != compare the scaled value with "threshold";
+    "nonzero" fires on any non-zero raw value; "bits" fires when any bit of
+    "mask" (default 0xFFFF) is set. "hysteresis" moves the clear point away
+    from the threshold and "hold"/"clear_hold" are seconds the condition must
+    persist before the alarm is raised/cleared.
+    """
+
+    def __init__(self, definition):
+        self.name = definition["name"]
+        self.table = definition.get("table", "input")
+        self.register = definition["register"]
+        self.condition = definition.get("condition", "nonzero")
+        self.threshold = definition.get("threshold", 0)
+        self.hysteresis = definition.get("hysteresis", 0)
+        self.mask = definition.get("mask", 0xFFFF)
+        self.hold = definition.get("hold", 0)
+        self.clear_hold = definition.get("clear_hold", 0)
+        self.severity = definition.get("severity", "warning")
+        self.notify = definition.get("notify", ["log"])
+        if self.condition not in _COMPARE and self.condition not in ("nonzero", "bits"):
+            raise ValueError(f"Rule {self.name!r}: unknown condition {self.condition!r}")
+
+    def matches(self, reg):
+        pattern = self.register
+        if pattern.lower().startswith("0x"):
+            return reg["address"] == int(pattern, 0)
+        return fnmatch.fnmatchcase(reg["description"], pattern)
+
+    def evaluate(self, reg, raw_list, active):
+        """Return (condition_true, display_value); `active` selects the clear threshold."""
+        if self.condition in ("nonzero", "bits"):
+            raw = raw_list[0] if len(raw_list) == 1 else raw_list[0] | (raw_list[1] << 16)
+            mask = 0xFFFFFFFF if self.condition == "nonzero" else self.mask
+            return bool(raw & mask), f"0x{raw:04X}"
+        value = decode_numeric(reg, raw_list)
+        if value is None:
+            return False, None
+        threshold = self.threshold
+        if active and self.hysteresis:
+            # Once raised, the value has to come back past the threshold by the hysteresis.
+            if self.condition in (">", ">="):
+                threshold -= self.hysteresis
+            elif self.condition in ("<", "<="):
+                threshold += self.hysteresis
+        return _COMPARE[self.condition](value, threshold), value
+
+
+class _AlarmState:
+    __slots__ = ("rule", "register", "active", "since", "last_value")
+
+    def __init__(self, rule, register):
+        self.rule = rule
+        self.register = register
+        self.active = False
+        self.since = None        # When the pending transition started
+        self.last_value = None
+
+
+class AlarmEngine:
+    """
+    Evaluates alarm rules against decoded snapshots.
+
+    Rules are expanded per matching register and indexed by (table, address),
+    so process() only evaluates rules whose input register changed since the
+    previous snapshot, plus the few rules waiting out a hold time. Raised and
+    cleared events are handed to the configured notifiers.
+    """
+
+    def __init__(self, rules, tables, notifiers=None):
+        self.notifiers = notifiers or {"log": LogNotifier()}
+        self._index = {}
+        self._states = []
+        self._pending = set()
+        self._last_raw = {}
+        for rule in rules:
+            table = tables.get(rule.table)
+            if table is None:
+                continue
+            for reg in table.registers:
+                if rule.matches(reg):
+                    state = _AlarmState(rule, reg)
+                    self._states.append(state)
+                    self._index.setdefault((rule.table, reg["address"]), []).append(state)
+        self.watched = {}
+        for table_name, address in self._index:
+            self.watched.setdefault(table_name, set()).add(address)
+
+    def active_alarms(self):
+        return [state for state in self._states if state.active]
+
+    def process(self, table_name, values, timestamp=None):
+        """
+        Feed raw register values ({address: raw_list or None}) from one table.
+        Returns the AlarmEvents emitted by this snapshot.
+        """
+        now = time.time() if timestamp is None else timestamp
+        to_check = set()
+        last_raw = self._last_raw
+        for address, raw_list in values.items():
+            key = (table_name, address)
+            states = self._index.get(key)
+            if states is None or raw_list is None:
+                continue
+            if last_raw.get(key) != raw_list:
+                last_raw[key] = raw_list
+                to_check.update(states)
+        to_check.update(s for s in self._pending if s.rule.table == table_name)
+
+        events = []
+        for state in to_check:
+            raw_list = last_raw[(table_name, state.register["address"])]
+            condition, value = state.rule.evaluate(state.register, raw_list, state.active)
+            state.last_value = value
+            if condition == state.active:
+                state.since = None
+                self._pending.discard(state)
+                continue
+            if state.since is None:
+                state.since = now
+            hold = state.rule.hold if condition else state.rule.clear_hold
+            if now - state.since < hold:
+                self._pending.add(state)
+                continue
+            state.active = condition
+            state.since = None
+            self._pending.discard(state)
+            events.append(AlarmEvent(state.rule, state.register, condition, value, now))
+        for event in events:
+            self._notify(event)
+        return events
+
+    def _notify(self, event):
+        for name in event.rule.notify:
+            notifier = self.notifiers.get(name)
+            if notifier is not None:
+                notifier.send(event)
+
+
+class LogNotifier:
+    def send(self, event):
+        logger.log(logging.WARNING if event.raised else logging.INFO, event.message())
+
+
+class DesktopNotifier:
+    """Desktop notification through notify-send, when it is installed."""
+
+    def __init__(self):
+        self.command = shutil.which("notify-send")
+
+    def send(self, event):
+        if self.command is None:
+            return
+        try:
+            subprocess.Popen([self.command, "Solax alarm", event.message()],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            logger.debug("notify-send failed: %s", e)
+
+
+class WebhookNotifier:
+    """POSTs each event as JSON from a background thread so polling never waits on HTTP."""
+
+    def __init__(self, url, timeout=5.0, max_queue=1000):
+        self.url = url
+        self.timeout = timeout
+        self.queue = queue.Queue(max_queue)
+        self.thread = threading.Thread(target=self._run, name="alarm-webhook", daemon=True)
+        self.thread.start()
+
+    def send(self, event):
+        try:
+            self.queue.put_nowait(event.as_dict())
+        except queue.Full:
+            logger.warning("Webhook queue full, dropping alarm event %s", event.rule.name)
+
+    def _run(self):
+        while True:
+            payload = self.queue.get()
+            request = urllib.request.Request(self.url, data=json.dumps(payload).encode("utf-8"),
+                                             headers={"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+                    resp.read()
+            except OSError as e:
+                logger.warning("Webhook %s failed: %s", self.url, e)
+
+
+def load_rules(path):
+    """
+    Load a rules file: {"webhook": "http://...", "rules": [...]}.
+    Returns (rules, notifiers).
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    rules = [AlarmRule(definition) for definition in data.get("rules", ())]
+    notifiers = {"log": LogNotifier(), "desktop": DesktopNotifier()}
+    if data.get("webhook"):
+        notifiers["webhook"] = WebhookNotifier(data["webhook"])
+    return rules, notifiers
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Raw register archive vs plain CSV.
+
+Records N polling cycles of the simulated inverter (all four register
+tables, 1 Hz timestamps), then writes them both as a register archive and
+as a CSV file with one row per cycle and one column per register. Reports
+file size, encode and decode throughput and the time to seek to the middle.
+
+  benchmarks/archive_benchmark.py [--records 3600] [--keyframe 300]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inverter_simulator import SimulatedInverter  # noqa: E402
+from modbus_poller import Poller  # noqa: E402
+from register_archive import ArchiveLayout, ArchiveReader, ArchiveWriter  # noqa: E402
+from register_map import load_register_map  # noqa: E402
+
+
+def record_cycles(register_map, count, start):
+    simulator = SimulatedInverter(register_map, seed=1)
+    poller = Poller(simulator, register_map)
+    cycles = []
+    for i in range(count):
+        simulator.step(1.0)
+        values, _ = poller.poll()
+        cycles.append((start + i, values))
+    return cycles
+
+
+def write_csv(path, layout, cycles):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp"] + [f"{bank}:0x{address:04X}" for bank, address in layout.keys])
+        for timestamp, values in cycles:
+            row = [f"{timestamp:.3f}"]
+            for key in layout.keys:
+                raw_list = values.get(key, "")
+                row.append("E" if raw_list is None else " ".join(map(str, raw_list)))
+            writer.writerow(row)
+
+
+def read_csv(path, start=None):
+    count = 0
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            timestamp = float(row[0])
+            if start is not None and timestamp < start:
+                continue
+            [[int(word) for word in cell.split()] if cell not in ("", "E") else None for cell in row[1:]]
+            count += 1
+            if start is not None:
+                break
+    return count
+
+
+def read_archive(path, start=None):
+    count = 0
+    with ArchiveReader(path) as reader:
+        for record in reader.records(start):
+            record.values()
+            count += 1
+            if start is not None:
+                break
+    return count
+
+
+def timed(function, *args):
+    t0 = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the raw register archive with plain CSV.")
+    parser.add_argument("--records", type=int, default=3600, help="Polling cycles to record")
+    parser.add_argument("--keyframe", type=int, default=300, help="Archive records per chunk")
+    args = parser.parse_args(argv)
+
+    register_map = load_register_map()
+    layout = ArchiveLayout.from_register_map(register_map)
+    start = 1_700_000_000.0
+    cycles = record_cycles(register_map, args.records, start)
+    middle = start + args.records // 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = os.path.join(tmp, "bench.slxa")
+        csv_path = os.path.join(tmp, "bench.csv")
+
+        def write_archive():
+            with ArchiveWriter(archive_path, register_map, args.keyframe) as writer:
+                for timestamp, values in cycles:
+                    writer.append(values, timestamp)
+
+        _, archive_write = timed(write_archive)
+        _, csv_write = timed(write_csv, csv_path, layout, cycles)
+        _, archive_read = timed(read_archive, archive_path)
+        _, csv_read = timed(read_csv, csv_path)
+        _, archive_seek = timed(read_archive, archive_path, middle)
+        _, csv_seek = timed(read_csv, csv_path, middle)
+        archive_size = os.path.getsize(archive_path)
+        csv_size = os.path.getsize(csv_path)
+
+    n = args.records
+    print(f"{n} records, {layout.slot_count} registers / {layout.word_count} words per record")
+    print(f"{'':10}{'bytes':>12}{'B/record':>10}{'encode rec/s':>14}{'decode rec/s':>14}{'seek ms':>10}")
+    for name, size, write, read, seek in (("csv", csv_size, csv_write, csv_read, csv_seek),
+                                          ("archive", archive_size, archive_write, archive_read, archive_seek)):
+        print(f"{name:10}{size:>12}{size / n:>10.1f}{n / write:>14.0f}{n / read:>14.0f}{seek * 1000:>10.2f}")
+    print(f"compression ratio vs CSV: {csv_size / archive_size:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
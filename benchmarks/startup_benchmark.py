@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+GUI startup: import, window shown and time to first value.
+
+Every run is a fresh interpreter, so lazy imports and cold module caches
+count as they do for a user. A run imports solax-xhybrid-gui.py, creates
+the window with the chosen tab selected, pumps the Tk event loop until it
+is drawn, then connects to the simulated inverter and pumps again until
+the first values are painted. Times are milliseconds since the run
+started; the median over all runs is reported. --history appends the
+medians as one JSON line per invocation, so startup can be tracked from
+change to change. Needs a display (xvfb-run on a headless machine).
+
+  benchmarks/startup_benchmark.py [--runs 5] [--tab input] [--history startup.jsonl]
+  benchmarks/startup_benchmark.py --profile      # one run under cProfile
+"""
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_PATH = os.path.join(ROOT, "solax-xhybrid-gui.py")
+MILESTONES = ("import", "window", "connected", "first_value")
+
+
+def run_once(tab, latency):
+    """Start the GUI in this interpreter; returns {milestone: ms since start}."""
+    t0 = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location("solax_gui", GUI_PATH)
+    gui = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gui)
+    times = {"import": time.perf_counter() - t0}
+
+    root = gui.tk.Tk()
+    app = gui.ModbusGUI(root, model="all", update_interval=0)
+    app.notebook.select(app.tabs[tab].frame)
+    root.update()
+    times["window"] = time.perf_counter() - t0
+
+    from inverter_simulator import SimulatedInverter
+    app.client = SimulatedInverter(app.register_map, latency=latency, seed=1)
+    app.on_connect()
+    times["connected"] = app.stats.created + app.stats.milestones["connected"] - t0
+    # The first cycle flushes its rows; one more pass of the event loop paints them.
+    deadline = time.monotonic() + 30.0
+    root.update()
+    while app.renderer.applied == 0 or len(app.renderer):
+        if time.monotonic() > deadline:
+            raise RuntimeError("No values shown within 30 s")
+        root.update()
+    times["first_value"] = time.perf_counter() - t0
+    root.destroy()
+    return {name: seconds * 1000.0 for name, seconds in times.items()}
+
+
+def run_child(args):
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        times = profiler.runcall(run_once, args.tab, args.latency)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(30)
+    else:
+        times = run_once(args.tab, args.latency)
+    print(json.dumps(times))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure GUI startup and time to first value.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter runs")
+    parser.add_argument("--tab", default="input", choices=("holding", "input", "selftest", "parallel"),
+                        help="Tab shown at startup")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per Modbus request")
+    parser.add_argument("--history", default=None, metavar="FILE",
+                        help="Append the medians to this JSON-lines file")
+    parser.add_argument("--profile", action="store_true", help="Single run under cProfile (report on stderr)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child or args.profile:
+        return run_child(args)
+
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--tab", args.tab,
+               "--latency", str(args.latency)]
+    runs = []
+    for _ in range(args.runs):
+        t0 = time.perf_counter()
+        out = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        times = json.loads(out.splitlines()[-1])
+        times["process"] = (time.perf_counter() - t0) * 1000.0
+        runs.append(times)
+
+    medians = {name: statistics.median(run[name] for run in runs) for name in MILESTONES + ("process",)}
+    print(f"{args.runs} runs, tab {args.tab}, latency {args.latency * 1000:.0f} ms/request")
+    print(f"{'milestone':14}{'median ms':>11}{'min ms':>9}{'max ms':>9}")
+    for name in MILESTONES + ("process",):
+        values = [run[name] for run in runs]
+        print(f"{name:14}{medians[name]:>11.1f}{min(values):>9.1f}{max(values):>9.1f}")
+
+    if args.history:
+        entry = {"timestamp": time.time(), "runs": args.runs, "tab": args.tab, "latency": args.latency,
+                 "median_ms": {name: round(value, 2) for name, value in medians.items()}}
+        with open(args.history, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
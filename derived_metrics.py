@@ -0,0 +1,173 @@
+# derived_metrics.py
+import ast
+
+from register_map import _REF_PATTERN
+from register_utils import format_display_str
+
+# No ast.Pow: "9 ** 9 ** 9" would keep the GUI busy for hours.
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.IfExp, ast.Compare, ast.BoolOp, ast.Call,
+    ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.USub, ast.UAdd,
+    ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq, ast.And, ast.Or, ast.Not,
+)
+_FUNCTIONS = {"abs": abs, "min": min, "max": max, "round": round}
+
+
+class DerivedMetric:
+    """
+    One computed quantity, declared in the register map as
+      {"name": ..., "expression": "{Powerdc1(Hybrid)} + {Powerdc2(Hybrid)}",
+       "unit": "W", "scale": 1.0}
+    `scale` only selects the display precision, like for native registers.
+    """
+
+    def __init__(self, definition):
+        self.name = definition["name"]
+        self.expression = definition["expression"]
+        self.unit = definition.get("unit", "")
+        self.scale = definition.get("scale", 1.0)
+        self.refs = []          # Raw reference strings in argument order
+        self.inputs = []        # Resolved: ("reg", address) or ("derived", name)
+        self.func = None
+        self.value = None
+
+    def compile(self):
+        refs = []
+
+        def substitute(match):
+            ref = match.group(1).strip()
+            if ref not in refs:
+                refs.append(ref)
+            return f"_v{refs.index(ref)}"
+
+        source = _REF_PATTERN.sub(substitute, self.expression)
+        tree = ast.parse(source, mode="eval")
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(f"{self.name}: {type(node).__name__} is not allowed in expressions")
+            if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS):
+                raise ValueError(f"{self.name}: only {', '.join(_FUNCTIONS)} may be called")
+            if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                raise ValueError(f"{self.name}: only numeric constants are allowed in expressions")
+            if isinstance(node, ast.Name) and node.id not in _FUNCTIONS and not node.id.startswith("_v"):
+                raise ValueError(f"{self.name}: unknown name {node.id!r}; wrap register names in braces")
+        args = ", ".join(f"_v{i}" for i in range(len(refs)))
+        code = compile(f"lambda {args}: {source}", f"<derived {self.name}>", "eval")
+        self.func = eval(code, {"__builtins__": {}, **_FUNCTIONS})
+        self.refs = refs
+
+    def render(self):
+        if self.value is None:
+            return "n/a"
+        return format_display_str(self.value, self.scale, self.unit)
+
+
+class DerivedMetricsEngine:
+    """
+    Evaluates the derived metrics of one register table incrementally.
+
+    Expressions are compiled once into a dependency graph (registers and other
+    derived metrics as inputs). update() is given the decoded values of the
+    latest snapshot; only metrics downstream of an input whose value actually
+    changed are re-evaluated, in topological order. Metrics that reference a
+    register missing from the table (e.g. pruned by the model profile) are
+    dropped.
+    """
+
+    def __init__(self, table):
+        self.metrics = []
+        self._dependents = {}       # address -> metrics reading it directly or transitively
+        self._last_inputs = {}
+        self._all_dirty = True
+        by_name = {}
+        for definition in getattr(table, "derived", ()):
+            metric = DerivedMetric(definition)
+            metric.compile()
+            by_name[metric.name] = metric
+
+        # Resolve references; a metric is usable only if all of its inputs are.
+        resolved = {}
+
+        def resolve(metric, visiting=()):
+            if metric.name in resolved:
+                return resolved[metric.name]
+            if metric.name in visiting:
+                raise ValueError(f"Derived metric cycle through {metric.name!r}")
+            ok = True
+            inputs = []
+            for ref in metric.refs:
+                if ref in by_name:
+                    ok = resolve(by_name[ref], visiting + (metric.name,)) and ok
+                    inputs.append(("derived", ref))
+                    continue
+                reg = table.lookup(int(ref, 0)) if ref.lower().startswith("0x") else table.lookup(ref)
+                if reg is None or reg["length"] > 2:
+                    ok = False
+                    continue
+                inputs.append(("reg", reg["address"]))
+            metric.inputs = inputs
+            resolved[metric.name] = ok
+            if ok:
+                self.metrics.append(metric)   # Appended after its inputs: topological order
+            return ok
+
+        for metric in by_name.values():
+            resolve(metric)
+
+        order = {metric.name: i for i, metric in enumerate(self.metrics)}
+        self._by_name = {metric.name: metric for metric in self.metrics}
+        for metric in self.metrics:
+            for address in self._source_addresses(metric):
+                self._dependents.setdefault(address, set()).add(metric.name)
+        self._dependents = {address: sorted((self._by_name[n] for n in names), key=lambda m: order[m.name])
+                            for address, names in self._dependents.items()}
+        self.input_addresses = frozenset(self._dependents)
+
+    def _source_addresses(self, metric):
+        for kind, key in metric.inputs:
+            if kind == "reg":
+                yield key
+            else:
+                yield from self._source_addresses(self._by_name[key])
+
+    def reset(self):
+        self._last_inputs.clear()
+        self._all_dirty = True
+        for metric in self.metrics:
+            metric.value = None
+
+    def update(self, values):
+        """
+        Feed decoded register values ({address: number or None}) and return the
+        metrics whose value changed.
+        """
+        if self._all_dirty:
+            dirty = list(self.metrics)
+            self._all_dirty = False
+        else:
+            dirty_names = set()
+            for address in self.input_addresses:
+                if address in values and values[address] != self._last_inputs.get(address):
+                    dirty_names.update(m.name for m in self._dependents[address])
+            dirty = [metric for metric in self.metrics if metric.name in dirty_names]
+        for address in self.input_addresses:
+            if address in values:
+                self._last_inputs[address] = values[address]
+
+        changed = []
+        for metric in dirty:
+            args = []
+            for kind, key in metric.inputs:
+                args.append(self._last_inputs.get(key) if kind == "reg" else self._by_name[key].value)
+            if None in args:
+                value = None
+            else:
+                try:
+                    value = metric.func(*args)
+                except (ZeroDivisionError, OverflowError, ValueError):
+                    value = None
+            if value != metric.value:
+                metric.value = value
+                changed.append(metric)
+        return changed
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Incremental hourly/daily/monthly energy rollups in SQLite.
+
+Energy counters (by default the export/import counters of the day, PV
+yield and battery charge totals) are turned into energy increments as
+snapshots arrive and added to one row per (period, bucket, counter):
+
+  hour    2024-06-01T13
+  day     2024-06-01
+  month   2024-06
+
+Buckets are local time. An increment that spans several hours (e.g. after
+the poller was stopped) is spread over them in proportion to time. Readings
+not newer than the last one counted are ignored, so importing an archive
+twice adds nothing. Counter readings are kept as raw integers so
+wrap-around is exact:
+
+  - a reading above the previous one adds the difference
+  - a lower reading is only believed when the next reading confirms it
+    (one bad read does not count the day twice). It is then a rollover
+    if the previous reading was in the top quarter of the register's range
+    and the new one in the bottom quarter, otherwise a reset (the
+    "today" counters at midnight, a replaced inverter): the energy since
+    the reset is the new reading
+
+The last reading of each counter is stored with the rollups in the same
+transaction, so a restarted poller carries on where it stopped. Rows are
+committed every `commit_interval` seconds. Reports are range scans of the
+primary key and take milliseconds regardless of how long data was logged.
+
+  modbus_poller.py --host 192.168.0.100 --rollups energy.sqlite
+  energy_rollups.py import solax.slxa energy.sqlite
+  energy_rollups.py report energy.sqlite --period month --last 3
+"""
+import argparse
+import csv
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+from register_map import load_register_map
+from register_utils import registers_to_int
+
+DEFAULT_COUNTERS = ("feedin_energy_today", "consum_energy_today", "SolarEnergyTotal", "EchargeTotal")
+DEFAULT_COMMIT_INTERVAL = 60.0      # seconds between transactions
+
+PERIODS = ("hour", "day", "month")
+_BUCKET_FORMATS = {"hour": "%Y-%m-%dT%H", "day": "%Y-%m-%d", "month": "%Y-%m"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup (
+    period  TEXT NOT NULL,
+    bucket  TEXT NOT NULL,
+    counter TEXT NOT NULL,
+    energy  REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (period, bucket, counter)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS counter_state (
+    counter   TEXT PRIMARY KEY,
+    raw       INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    pending   INTEGER
+);
+"""
+
+_UPSERT = ("INSERT INTO rollup (period, bucket, counter, energy, samples) VALUES (?, ?, ?, ?, ?) "
+           "ON CONFLICT (period, bucket, counter) DO UPDATE SET "
+           "energy = energy + excluded.energy, samples = samples + excluded.samples")
+
+
+class CounterTracker:
+    """Turns successive raw readings of one energy counter into increments (see the module docstring)."""
+
+    __slots__ = ("name", "key", "scale", "modulus", "raw", "timestamp", "pending")
+
+    def __init__(self, name, key, reg):
+        self.name = name
+        self.key = key                  # (bank, address) in snapshot values
+        self.scale = reg.get("scale", 1.0)
+        self.modulus = 1 << (16 * reg["length"])
+        self.raw = None
+        self.timestamp = None
+        self.pending = None
+
+    def update(self, raw, timestamp):
+        """
+        Increment in raw counts since the last accepted reading, and that
+        reading's time (None: nothing to add). A reading that is not newer than
+        the last accepted one (an archive imported twice, or one older than the
+        saved state) is ignored.
+        """
+        previous, since = self.raw, self.timestamp
+        if since is not None and timestamp <= since:
+            return 0, None
+        if previous is None:
+            increment = 0
+        elif raw >= previous:
+            increment = raw - previous
+        elif self.pending is None or raw < self.pending:
+            self.pending = raw          # wait for the next reading to confirm the drop
+            return 0, since
+        elif previous >= self.modulus * 3 // 4 and raw < self.modulus // 4:
+            increment = self.modulus - previous + raw
+        else:
+            increment = raw
+        self.raw, self.timestamp, self.pending = raw, timestamp, None
+        return increment, since
+
+
+def _hour_slices(start, end):
+    """(local hour start, fraction of end - start) for every local hour the interval touches."""
+    if start is None or end <= start:
+        yield datetime.fromtimestamp(end), 1.0
+        return
+    length = end - start
+    t = start
+    while t < end:
+        hour = datetime.fromtimestamp(t).replace(minute=0, second=0, microsecond=0)
+        stop = min(end, (hour + timedelta(hours=1)).timestamp())
+        yield hour, (stop - t) / length
+        t = stop
+
+
+class EnergyRollups:
+    """
+    Maintains the rollups of a SQLite database from snapshots:
+    update({(bank, address): raw_list or None}, timestamp) per cycle, as
+    for ArchiveWriter.append().
+    """
+
+    def __init__(self, path, register_map=None, counters=DEFAULT_COUNTERS,
+                 commit_interval=DEFAULT_COMMIT_INTERVAL):
+        self.path = path
+        self.commit_interval = commit_interval
+        register_map = register_map or load_register_map()
+        self.trackers = []
+        for name in counters:
+            for table in register_map.tables.values():
+                reg = table.lookup(name)
+                if reg is not None:
+                    self.trackers.append(CounterTracker(name, (table.function, reg["address"]), reg))
+                    break
+            else:
+                raise ValueError(f"Unknown energy counter: {name}")
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+        for tracker in self.trackers:
+            row = self.db.execute("SELECT raw, timestamp, pending FROM counter_state WHERE counter = ?",
+                                  (tracker.name,)).fetchone()
+            if row is not None:
+                tracker.raw, tracker.timestamp, tracker.pending = row
+        self._pending = {}              # (period, bucket, counter) -> [energy, samples]
+        self._last_commit = time.monotonic()
+
+    def update(self, values, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        pending = self._pending
+        for tracker in self.trackers:
+            raw_list = values.get(tracker.key)
+            if raw_list is None:
+                continue
+            increment, since = tracker.update(registers_to_int(raw_list, False), timestamp)
+            if since is None:
+                continue
+            energy = increment * tracker.scale
+            last = None
+            for hour, share in _hour_slices(since, timestamp):
+                for period in PERIODS:
+                    key = (period, hour.strftime(_BUCKET_FORMATS[period]), tracker.name)
+                    entry = pending.get(key)
+                    if entry is None:
+                        entry = pending[key] = [0.0, 0]
+                    entry[0] += energy * share
+                last = hour
+            for period in PERIODS:
+                pending[(period, last.strftime(_BUCKET_FORMATS[period]), tracker.name)][1] += 1
+        if time.monotonic() - self._last_commit >= self.commit_interval:
+            self.commit()
+
+    def commit(self):
+        """Write the accumulated increments and the counters' last readings in one transaction."""
+        with self.db:
+            self.db.executemany(_UPSERT, [key + tuple(entry) for key, entry in self._pending.items()])
+            self.db.executemany("INSERT OR REPLACE INTO counter_state (counter, raw, timestamp, pending) "
+                                "VALUES (?, ?, ?, ?)",
+                                [(t.name, t.raw, t.timestamp, t.pending) for t in self.trackers if t.raw is not None])
+        self._pending = {}
+        self._last_commit = time.monotonic()
+
+    def close(self):
+        self.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def query_rollups(db, period, start=None, end=None, counters=None):
+    """
+    {bucket: {counter: kWh}} for one period, in bucket order. start/end are
+    bucket labels or prefixes of them ("2024-06" selects every day of June
+    for period "day") and are inclusive.
+    """
+    sql = "SELECT bucket, counter, energy FROM rollup WHERE period = ?"
+    params = [period]
+    if start:
+        sql += " AND bucket >= ?"
+        params.append(start)
+    if end:
+        sql += " AND bucket <= ?"
+        params.append(end + "~")        # "~" sorts after every label character
+    if counters:
+        sql += f" AND counter IN ({', '.join('?' * len(counters))})"
+        params.extend(counters)
+    result = {}
+    for bucket, counter, energy in db.execute(sql + " ORDER BY bucket", params):
+        result.setdefault(bucket, {})[counter] = energy
+    return result
+
+
+def _last_buckets(period, count, now=None):
+    """Label of the first of the last `count` buckets of a period, the current one included."""
+    now = datetime.fromtimestamp(time.time() if now is None else now)
+    if period == "hour":
+        now -= timedelta(hours=count - 1)
+    elif period == "day":
+        now -= timedelta(days=count - 1)
+    else:
+        months = now.year * 12 + now.month - 1 - (count - 1)
+        now = now.replace(year=months // 12, month=months % 12 + 1, day=1)
+    return now.strftime(_BUCKET_FORMATS[period])
+
+
+def cmd_report(args):
+    db = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    start = _last_buckets(args.period, args.last) if args.last else args.start
+    t0 = time.perf_counter()
+    rows = query_rollups(db, args.period, start, args.end, args.counter or None)
+    elapsed = time.perf_counter() - t0
+    counters = args.counter or sorted({counter for values in rows.values() for counter in values})
+    if args.csv:
+        writer = csv.writer(sys.stdout)
+        writer.writerow([args.period] + counters)
+        for bucket, values in rows.items():
+            writer.writerow([bucket] + [f"{values.get(counter, 0.0):.3f}" for counter in counters])
+        return 0
+    width = max([len(c) for c in counters] + [10]) + 2
+    print(f"{args.period:16}" + "".join(f"{c:>{width}}" for c in counters))
+    totals = dict.fromkeys(counters, 0.0)
+    for bucket, values in rows.items():
+        print(f"{bucket:16}" + "".join(f"{values.get(c, 0.0):>{width}.2f}" for c in counters))
+        for counter in counters:
+            totals[counter] += values.get(counter, 0.0)
+    print(f"{'total kWh':16}" + "".join(f"{totals[c]:>{width}.2f}" for c in counters))
+    print(f"{len(rows)} {args.period} bucket(s) in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+def cmd_import(args):
+    # Imported here: only the import command reads archives.
+    from register_archive import ArchiveReader
+    register_map = load_register_map(args.register_map)
+    records = skipped = 0
+    with ArchiveReader(args.archive) as reader, \
+            EnergyRollups(args.database, register_map, args.counter or DEFAULT_COUNTERS,
+                          commit_interval=float("inf")) as rollups:
+        # Counters already past a record's time ignore it (see CounterTracker.update).
+        counted = [t.timestamp for t in rollups.trackers if t.timestamp is not None]
+        resume = min(counted) if len(counted) == len(rollups.trackers) else None
+        for record in reader.records():
+            if resume is not None and record.timestamp <= resume:
+                skipped += 1
+                continue
+            rollups.update(record.values(), record.timestamp)
+            records += 1
+    print(f"{records} records of {args.archive} added to {args.database}")
+    if skipped:
+        print(f"{skipped} records not newer than the saved counter state were skipped", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Energy rollups per hour, day and month.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="Energy per period from the rollups")
+    report.add_argument("database")
+    report.add_argument("--period", choices=PERIODS, default="day")
+    report.add_argument("--from", dest="start", default=None, metavar="BUCKET",
+                        help="First bucket or prefix, e.g. 2024-06 or 2024-06-01T13")
+    report.add_argument("--to", dest="end", default=None, metavar="BUCKET", help="Last bucket or prefix")
+    report.add_argument("--last", type=int, default=0, metavar="N",
+                        help="The last N buckets up to now (instead of --from)")
+    report.add_argument("--counter", action="append", default=[], metavar="NAME",
+                        help="Only this counter (repeatable)")
+    report.add_argument("--csv", action="store_true", help="Print CSV")
+    imp = sub.add_parser("import", help="Add the energy counters of a raw register archive to the rollups")
+    imp.add_argument("archive")
+    imp.add_argument("database")
+    imp.add_argument("--counter", action="append", default=[], metavar="NAME",
+                     help=f"Counter to roll up (repeatable, default: {', '.join(DEFAULT_COUNTERS)})")
+    imp.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    args = parser.parse_args(argv)
+    if args.command == "report":
+        return cmd_report(args)
+    return cmd_import(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Closed-loop export / battery control.
+
+Reads feedin_power (0x00C0) and battery power (0x00C4) in a single block
+request, runs a control law and writes the result to the export limit
+(holding 0x00B6, in W). Writes are rate limited and
+every iteration's end-to-end latency (read request to write acknowledgement)
+is measured. The loop runs on its own connection and timer, independent of
+the GUI's refresh interval.
+
+  export_control.py --host 192.168.0.100 --target 0
+  export_control.py --serial /dev/ttyUSB0 --baud 19200 --target 0
+  export_control.py --simulate --target 0 --period 0.2 --duration 30
+"""
+import argparse
+import sys
+import threading
+import time
+
+from modbus_transport import add_transport_args, client_kwargs_from_args, connect_client
+from perf_stats import PerfStats
+from register_map import load_register_map, plan_reads, read_block, split_block
+from register_utils import decode_numeric
+
+STAGE_CONTROL_READ = "control_read"
+STAGE_CONTROL_WRITE = "control_write"
+STAGE_CONTROL_LOOP = "control_loop"
+
+FEEDIN_POWER_ADDR = 0x00C0
+BATTERY_POWER_ADDR = 0x00C4
+
+EXPORT_LIMIT_ADDR = 0x00B6        # Export control user limit (W), the control output
+
+
+class PIControlLaw:
+    """
+    PI law in velocity form: each update moves the current output by
+    kp * (error - previous error) + ki * error * dt, which drives the measured
+    value towards `target`. Errors inside `deadband` leave the output alone.
+    The output is clamped to [out_min, out_max]; the law keeps no integral
+    of its own, so a clamped output cannot wind up. `sign` is +1 when raising
+    the output raises the measurement.
+    """
+
+    def __init__(self, target=0.0, kp=0.5, ki=1.0, deadband=50.0, out_min=0.0, out_max=10000.0, sign=1.0):
+        self.target = target
+        self.kp = kp
+        self.ki = ki
+        self.deadband = deadband
+        self.out_min = out_min
+        self.out_max = out_max
+        self.sign = sign
+        self.prev_error = None
+
+    def update(self, measured, output, dt):
+        error = (self.target - measured) * self.sign
+        prev_error, self.prev_error = self.prev_error, error
+        if abs(error) <= self.deadband:
+            return output
+        if prev_error is None:
+            prev_error = error
+        wanted = output + self.kp * (error - prev_error) + self.ki * error * dt
+        return min(self.out_max, max(self.out_min, wanted))
+
+
+class ControlSample:
+    __slots__ = ("timestamp", "feedin_power", "battery_power", "output", "written", "latency")
+
+    def __init__(self, timestamp, feedin_power, battery_power, output, written, latency):
+        self.timestamp = timestamp
+        self.feedin_power = feedin_power
+        self.battery_power = battery_power
+        self.output = output
+        self.written = written
+        self.latency = latency
+
+
+class ExportController:
+    """
+    Fast control loop over one minimal read block.
+
+    The measured quantity is feedin_power, optionally plus battery power
+    (`include_battery`) for self-consumption control. A new output is written
+    only if it moved by at least `min_change`, no more often than every
+    `min_write_interval` seconds, and by at most `max_step` per write.
+    """
+
+    def __init__(self, client, law, period=0.5, register_map=None,
+                 min_write_interval=1.0, max_step=500.0, min_change=10.0, include_battery=False):
+        self.client = client
+        self.law = law
+        self.output_address = EXPORT_LIMIT_ADDR
+        self.period = period
+        self.min_write_interval = min_write_interval
+        self.max_step = max_step
+        self.min_change = min_change
+        self.include_battery = include_battery
+        self.stats = PerfStats()
+        self.last_sample = None
+        self._last_write = float("-inf")
+        self._output = None
+
+        table = (register_map or load_register_map()).table("input")
+        wanted = [table.lookup(FEEDIN_POWER_ADDR), table.lookup(BATTERY_POWER_ADDR)]
+        # Bridge the defined registers between the two so one request covers both.
+        blocks = plan_reads(wanted, max_gap=BATTERY_POWER_ADDR - FEEDIN_POWER_ADDR)
+        if len(blocks) != 1:
+            raise ValueError("feedin and battery power do not fit one read block")
+        self.read_block = blocks[0]
+        self.function = table.function
+
+    def read_output(self):
+        resp = self.client.read_holding_registers(address=self.output_address, count=1)
+        if resp.isError():
+            raise IOError(f"Could not read output register 0x{self.output_address:04X}: {resp}")
+        return float(resp.registers[0])
+
+    def step(self, dt):
+        """Run one read -> control -> (maybe) write iteration."""
+        stats = self.stats
+        t0 = time.perf_counter()
+        resp = read_block(self.client, self.function, self.read_block.start, self.read_block.count)
+        t1 = time.perf_counter()
+        stats.add_sample(STAGE_CONTROL_READ, t1 - t0)
+        if resp.isError():
+            stats.count_request(self.read_block.count, error=True)
+            return None
+        stats.count_request(self.read_block.count)
+        values = {reg["address"]: decode_numeric(reg, raw_list)
+                  for reg, raw_list in split_block(self.read_block, resp.registers)}
+        feedin = values[FEEDIN_POWER_ADDR]
+        battery = values[BATTERY_POWER_ADDR]
+        measured = feedin + battery if self.include_battery else feedin
+
+        if self._output is None:
+            self._output = self.read_output()
+        wanted = self.law.update(measured, self._output, dt)
+        step = max(-self.max_step, min(self.max_step, wanted - self._output))
+        new_output = round(self._output + step)
+
+        written = False
+        now = time.monotonic()
+        if abs(new_output - self._output) >= self.min_change and now - self._last_write >= self.min_write_interval:
+            t2 = time.perf_counter()
+            wresp = self.client.write_register(address=self.output_address, value=int(new_output) & 0xFFFF)
+            stats.add_sample(STAGE_CONTROL_WRITE, time.perf_counter() - t2)
+            if wresp.isError():
+                stats.count_request(1, error=True)
+            else:
+                stats.count_request(1)
+                self._output = float(new_output)
+                self._last_write = now
+                written = True
+        latency = time.perf_counter() - t0
+        stats.add_sample(STAGE_CONTROL_LOOP, latency)
+        self.last_sample = ControlSample(time.time(), feedin, battery, self._output, written, latency)
+        return self.last_sample
+
+    def run(self, stop_event=None, duration=None, on_sample=None):
+        """Run the loop on a fixed period until stopped or `duration` elapses."""
+        stop_event = stop_event or threading.Event()
+        start = last = time.monotonic()
+        next_tick = start
+        while not stop_event.is_set():
+            now = time.monotonic()
+            if duration is not None and now - start >= duration:
+                break
+            self.stats.begin_cycle()
+            sample = self.step(now - last if now > last else self.period)
+            self.stats.end_cycle()
+            last = now
+            if on_sample is not None and sample is not None:
+                on_sample(sample)
+            next_tick += self.period
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                next_tick = time.monotonic()  # Overran; don't try to catch up.
+                delay = 0
+            stop_event.wait(delay)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Closed-loop export/battery control for Solax inverters.")
+    add_transport_args(parser)
+    parser.add_argument("--simulate", action="store_true", help="Run against the built-in simulated inverter")
+    parser.add_argument("--target", type=float, default=0.0, help="Target feed-in power in W")
+    parser.add_argument("--include-battery", action="store_true",
+                        help="Control feed-in plus battery power (self-consumption)")
+    parser.add_argument("--kp", type=float, default=0.5)
+    parser.add_argument("--ki", type=float, default=1.0, help="Integral gain in 1/s")
+    parser.add_argument("--deadband", type=float, default=50.0, help="Ignore errors below this many W")
+    parser.add_argument("--min", dest="out_min", type=float, default=0.0, help="Lowest export limit in W")
+    parser.add_argument("--max", dest="out_max", type=float, default=10000.0, help="Highest export limit in W")
+    parser.add_argument("--max-step", type=float, default=500.0, help="Largest output change per write")
+    parser.add_argument("--min-write-interval", type=float, default=1.0, help="Seconds between writes")
+    parser.add_argument("--period", type=float, default=0.5, help="Loop period in seconds")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    register_map = load_register_map(args.register_map)
+    if args.simulate:
+        from inverter_simulator import SimulatedInverter
+        simulator = SimulatedInverter(register_map, latency=0.005)
+        client = simulator
+    else:
+        simulator = None
+        try:
+            client = connect_client(**client_kwargs_from_args(args))
+        except ConnectionError as e:
+            sys.exit(str(e))
+
+    law = PIControlLaw(args.target, args.kp, args.ki, args.deadband, args.out_min, args.out_max)
+    controller = ExportController(client, law, args.period, register_map,
+                                  args.min_write_interval, args.max_step, include_battery=args.include_battery)
+
+    def report(sample):
+        if simulator is not None:
+            simulator.step()
+        print(f"feedin {sample.feedin_power:7.0f} W  battery {sample.battery_power:7.0f} W  "
+              f"output {sample.output:7.0f}{' *' if sample.written else '  '}  "
+              f"loop {sample.latency * 1000:6.1f} ms")
+
+    try:
+        controller.run(duration=args.duration, on_sample=report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+    print(controller.stats.to_json())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Fleet-scale load test: how many inverters can one collector host poll?
+
+Serves N simulated Solax inverters over Modbus TCP from one asyncio event
+loop in a separate process. Devices are spread over `--ports` consecutive
+ports; devices sharing a port are addressed by unit id 1, 2, ... as behind
+a Modbus TCP gateway. Each device is a SimulatedInverter with its own plant
+model, serving every table of the register map, and answers one request at
+a time after a random per-request latency.
+
+Collector processes then poll every device with the same engine as
+modbus_poller.py (connect_client + Poller, one thread per device) at a
+fixed interval, and report over a measurement window after warm-up:
+
+  - achieved samples (complete poll cycles) per second per device
+  - collector CPU per device, in percent of one core
+  - collector resident memory per device
+
+  fleet_simulator.py --devices 200 --interval 1 --duration 30
+  fleet_simulator.py --devices 500 --ports 50 --processes 4 --latency 0.03
+  fleet_simulator.py --serve --devices 200 --listen 0.0.0.0      # endpoints only
+  fleet_simulator.py --connect 192.168.0.50 --devices 200        # poll a fleet served elsewhere
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import struct
+import sys
+import threading
+import time
+
+from inverter_simulator import SimulatedInverter, handle_pdu
+from modbus_poller import Poller, select_profile
+from modbus_transport import connect_client
+from register_map import load_register_map
+
+logger = logging.getLogger("fleet")
+
+DEFAULT_BASE_PORT = 5020
+# Typical request round trip of an inverter's Modbus TCP interface (seconds).
+DEFAULT_LATENCY = 0.02
+DEFAULT_JITTER = 0.5
+
+# Modbus exception code for a unit that does not exist behind a gateway
+GATEWAY_TARGET_FAILED = 0x0B
+
+_MBAP = struct.Struct(">HHHB")     # transaction id, protocol id, length, unit id
+
+
+def device_endpoint(index, host="127.0.0.1", base_port=DEFAULT_BASE_PORT, units_per_port=1):
+    """(host, port, unit) of device `index` (0-based)."""
+    return host, base_port + index // units_per_port, 1 + index % units_per_port
+
+
+class FleetServer:
+    """
+    Modbus TCP endpoints for a fleet of SimulatedInverters on one event loop.
+
+    Device i listens on base_port + i // units_per_port as unit
+    1 + i % units_per_port. Requests to a device are served one at a time,
+    each after a delay drawn uniformly from latency * (1 +- jitter); requests
+    for a unit that does not exist get exception 0x0B like from a gateway.
+    Every second all plant models are stepped.
+    """
+
+    def __init__(self, register_map, devices, base_port=DEFAULT_BASE_PORT, units_per_port=1,
+                 latency=DEFAULT_LATENCY, jitter=DEFAULT_JITTER, host="127.0.0.1", model="X3", seed=None):
+        self.host = host
+        self.base_port = base_port
+        self.units_per_port = max(1, units_per_port)
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.simulators = [SimulatedInverter(register_map, model, seed=self.random.random())
+                           for _ in range(devices)]
+        self.ports = (devices + self.units_per_port - 1) // self.units_per_port
+        self.requests = 0
+        self.connections = 0
+        self._locks = []
+
+    def _delay(self):
+        if not self.latency:
+            return 0.0
+        return self.latency * self.random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    async def serve(self, ready=None, stop_event=None):
+        """Serve until stop_event (threading or multiprocessing Event) is set; ready.set() once listening."""
+        self._locks = [asyncio.Lock() for _ in self.simulators]
+        servers = []
+        try:
+            for port_index in range(self.ports):
+                servers.append(await asyncio.start_server(
+                    lambda reader, writer, port_index=port_index: self._serve_client(port_index, reader, writer),
+                    self.host, self.base_port + port_index))
+            logger.info("Serving %d simulated inverters on %s:%d-%d", len(self.simulators), self.host,
+                        self.base_port, self.base_port + self.ports - 1)
+            if ready is not None:
+                ready.set()
+            while stop_event is None or not stop_event.is_set():
+                await asyncio.sleep(1.0)
+                for simulator in self.simulators:
+                    simulator.step()
+        finally:
+            for server in servers:
+                server.close()
+            for server in servers:
+                await server.wait_closed()
+
+    async def _serve_client(self, port_index, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                transaction, protocol, length, unit = _MBAP.unpack(await reader.readexactly(_MBAP.size))
+                pdu = await reader.readexactly(length - 1)
+                if not pdu:
+                    continue
+                index = port_index * self.units_per_port + unit - 1
+                if protocol != 0 or not 1 <= unit <= self.units_per_port or index >= len(self.simulators):
+                    reply = bytes([pdu[0] | 0x80, GATEWAY_TARGET_FAILED])
+                else:
+                    async with self._locks[index]:
+                        await asyncio.sleep(self._delay())
+                        reply = handle_pdu(self.simulators[index], pdu[0], pdu[1:])
+                    self.requests += 1
+                writer.write(_MBAP.pack(transaction, 0, len(reply) + 1, unit) + reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+
+def raise_fd_limit():
+    """Every device costs a socket on each side; lift the soft open-file limit to the hard one."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def rss_bytes():
+    """Current resident set size of this process (peak size where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_fleet_server(devices, base_port, units_per_port, latency, jitter, host, register_map_path, model,
+                     ready=None, stop_event=None, results=None):
+    """Target of the server process; puts {"cpu_s", "requests"} on `results` when stopped."""
+    raise_fd_limit()
+    server = FleetServer(load_register_map(register_map_path), devices, base_port, units_per_port,
+                         latency, jitter, host, model, seed=1)
+    try:
+        asyncio.run(server.serve(ready, stop_event))
+    finally:
+        if results is not None:
+            results.put({"cpu_s": time.process_time(), "requests": server.requests})
+
+
+class DeviceStats:
+    __slots__ = ("samples", "errors", "overruns", "cycle_times", "failed")
+
+    def __init__(self):
+        self.samples = 0
+        self.errors = 0
+        self.overruns = 0
+        self.cycle_times = []
+        self.failed = None
+
+
+def poll_device(endpoint, register_map, model, interval, window, stop_event, stats):
+    """One device's acquisition loop, as run_poller() without publishing; counts cycles inside `window`."""
+    host, port, unit = endpoint
+    try:
+        client = connect_client(host=host, port=port, unit=unit)
+    except Exception as e:
+        stats.failed = str(e)
+        return
+    try:
+        poller = Poller(client, register_map, select_profile(client, register_map, model))
+        start, end = window
+        next_tick = time.monotonic()
+        while not stop_event.is_set():
+            t0 = time.monotonic()
+            _, errors = poller.poll()
+            t1 = time.monotonic()
+            counted = start <= t1 < end
+            if counted:
+                stats.samples += 1
+                stats.errors += errors
+                stats.cycle_times.append(t1 - t0)
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                if counted:
+                    stats.overruns += 1
+                next_tick = time.monotonic()
+                delay = 0
+            stop_event.wait(delay)
+    except Exception as e:
+        stats.failed = str(e)
+    finally:
+        client.close()
+
+
+def run_collector(endpoints, register_map_path, model, interval, warmup, duration, results):
+    """
+    Target of a collector process: poll `endpoints` ((host, port, unit) each)
+    with one thread per device and put a report dict on `results`.
+    """
+    raise_fd_limit()
+    register_map = load_register_map(register_map_path)
+    rss_base = rss_bytes()
+    start = time.monotonic() + warmup
+    end = start + duration
+    stop_event = threading.Event()
+    devices = [DeviceStats() for _ in endpoints]
+    threads = [threading.Thread(target=poll_device, daemon=True, name=f"poll-{port}-{unit}",
+                                args=((host, port, unit), register_map, model, interval, (start, end),
+                                      stop_event, stats))
+               for (host, port, unit), stats in zip(endpoints, devices)]
+    for thread in threads:
+        thread.start()
+
+    time.sleep(max(0.0, start - time.monotonic()))
+    cpu_start = time.process_time()
+    time.sleep(max(0.0, end - time.monotonic()))
+    cpu = time.process_time() - cpu_start
+    rss = rss_bytes()
+    stop_event.set()
+    for thread in threads:
+        thread.join(interval + 5.0)
+
+    results.put({
+        "pid": os.getpid(),
+        "devices": len(endpoints),
+        "cpu_s": cpu,
+        "rss_base": rss_base,
+        "rss": rss,
+        "samples": [stats.samples for stats in devices],
+        "errors": sum(stats.errors for stats in devices),
+        "overruns": sum(stats.overruns for stats in devices),
+        "failed": [stats.failed for stats in devices if stats.failed],
+        "cycle_times": [t for stats in devices for t in stats.cycle_times],
+    })
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(reports, interval, duration, server=None):
+    """Combine the collector reports into per-device figures."""
+    devices = sum(report["devices"] for report in reports)
+    rates = [samples / duration for report in reports for samples in report["samples"]]
+    target = 1.0 / interval
+    cycle_times = [t for report in reports for t in report["cycle_times"]]
+    cpu = sum(report["cpu_s"] for report in reports)
+    memory = sum(report["rss"] - report["rss_base"] for report in reports)
+    summary = {
+        "devices": devices,
+        "collector_processes": len(reports),
+        "target_rate_hz": target,
+        "rate_hz": {"mean": statistics.fmean(rates) if rates else 0.0,
+                    "min": min(rates, default=0.0),
+                    "p5": _percentile(rates, 0.05)},
+        "devices_on_target": sum(1 for rate in rates if rate >= 0.95 * target),
+        "cycle_ms": {"p50": _percentile(cycle_times, 0.50) * 1000.0,
+                     "p95": _percentile(cycle_times, 0.95) * 1000.0,
+                     "max": max(cycle_times, default=0.0) * 1000.0},
+        "overruns": sum(report["overruns"] for report in reports),
+        "poll_errors": sum(report["errors"] for report in reports),
+        "failed_devices": [error for report in reports for error in report["failed"]],
+        "collector_cpu_percent": cpu / duration * 100.0,
+        "cpu_percent_per_device": cpu / duration * 100.0 / devices if devices else 0.0,
+        "collector_rss_bytes": sum(report["rss"] for report in reports),
+        "rss_bytes_per_device": memory / devices if devices else 0.0,
+    }
+    if server is not None:
+        summary["server_cpu_s"] = server["cpu_s"]
+        summary["server_requests"] = server["requests"]
+    return summary
+
+
+def print_summary(summary, cpu_count):
+    s = summary
+    print(f"{s['devices']} devices, {s['collector_processes']} collector process(es), "
+          f"target {s['target_rate_hz']:.2f} samples/s per device")
+    rate = s["rate_hz"]
+    print(f"  rate per device     mean {rate['mean']:.3f}/s  min {rate['min']:.3f}/s  p5 {rate['p5']:.3f}/s  "
+          f"({s['devices_on_target']}/{s['devices']} devices at >=95% of target)")
+    cycle = s["cycle_ms"]
+    print(f"  poll cycle          p50 {cycle['p50']:.0f} ms  p95 {cycle['p95']:.0f} ms  max {cycle['max']:.0f} ms  "
+          f"overruns {s['overruns']}  errors {s['poll_errors']}")
+    print(f"  collector CPU       {s['collector_cpu_percent']:.1f}% of a core "
+          f"({s['cpu_percent_per_device']:.3f}% per device, {cpu_count} cores)")
+    print(f"  collector memory    {s['collector_rss_bytes'] / 2**20:.1f} MiB "
+          f"({s['rss_bytes_per_device'] / 1024:.1f} KiB per device)")
+    if s["failed_devices"]:
+        print(f"  failed devices      {len(s['failed_devices'])} (first: {s['failed_devices'][0]})")
+    if "server_cpu_s" in s:
+        print(f"  simulator           {s['server_requests']} requests, {s['server_cpu_s']:.1f} s CPU "
+              "(run it on another host with --serve if it competes with the collector)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test polling of many simulated inverters over Modbus TCP.")
+    parser.add_argument("--devices", type=int, default=100, help="Number of simulated inverters")
+    parser.add_argument("--ports", type=int, default=None,
+                        help="Ports to spread the devices over (default: one port per device)")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="First TCP port")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="Mean seconds per request")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="Latency spread, fraction of the mean")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval per device in seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds before measuring (connect, detection)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measurement window in seconds")
+    parser.add_argument("--processes", type=int, default=1, help="Collector processes to split the devices over")
+    parser.add_argument("--model", default="auto", help="Model profile used by the collector: auto, all, X1, X3")
+    parser.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    parser.add_argument("--serve", action="store_true", help="Only serve the simulated fleet until interrupted")
+    parser.add_argument("--listen", default="127.0.0.1", help="Address the simulated fleet listens on")
+    parser.add_argument("--connect", default=None, metavar="HOST",
+                        help="Poll a fleet served by --serve on HOST instead of starting one")
+    parser.add_argument("--json", default=None, metavar="FILE", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+    if args.ports is None:
+        args.ports = args.devices
+    args.units_per_port = max(1, -(-args.devices // max(1, args.ports)))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    context = multiprocessing.get_context("spawn")
+    server_args = (args.devices, args.base_port, args.units_per_port, args.latency, args.jitter,
+                   args.listen, args.register_map, "X3")
+
+    if args.serve:
+        stop_event = threading.Event()
+        try:
+            run_fleet_server(*server_args, stop_event=stop_event)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    server = None
+    server_results = context.Queue()
+    stop_event = context.Event()
+    if args.connect is None:
+        ready = context.Event()
+        server = context.Process(target=run_fleet_server, name="fleet-server", daemon=True,
+                                 args=server_args, kwargs={"ready": ready, "stop_event": stop_event,
+                                                           "results": server_results})
+        server.start()
+        if not ready.wait(60.0):
+            server.terminate()
+            sys.exit("Simulated fleet failed to start")
+
+    host = args.connect or args.listen
+    endpoints = [device_endpoint(i, host, args.base_port, args.units_per_port) for i in range(args.devices)]
+    processes = max(1, min(args.processes, args.devices))
+    results = context.Queue()
+    collectors = [context.Process(target=run_collector, name=f"collector-{n}", daemon=True,
+                                  args=(endpoints[n::processes], args.register_map, args.model, args.interval,
+                                        args.warmup, args.duration, results))
+                  for n in range(processes)]
+    logger.info("Polling %d devices every %.1f s from %d process(es): %.0f s warm-up, %.0f s measurement",
+                args.devices, args.interval, processes, args.warmup, args.duration)
+    for collector in collectors:
+        collector.start()
+    reports = [results.get(timeout=args.warmup + args.duration + args.interval + 60.0) for _ in collectors]
+    for collector in collectors:
+        collector.join()
+
+    server_report = None
+    if server is not None:
+        stop_event.set()
+        server_report = server_results.get(timeout=10.0)
+        server.join(5.0)
+
+    summary = summarize(reports, args.interval, args.duration, server_report)
+    print_summary(summary, os.cpu_count())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Holding-register configuration backup, diff and restore.
+
+  holding_config.py backup  --host IP[:PORT] FILE
+  holding_config.py diff    OLD.json NEW.json
+  holding_config.py diff    --host IP[:PORT] FILE        (FILE vs live inverter)
+  holding_config.py restore --host IP[:PORT] FILE [--dry-run]
+  holding_config.py --serial /dev/ttyUSB0 --baud 9600 backup FILE   (Modbus RTU)
+
+Restore only writes registers whose value differs from the live inverter,
+coalesced into as few write_multiple_registers requests as possible, and
+reads every written block back to verify it.
+"""
+import argparse
+import datetime
+import json
+import sys
+
+from HoldingRegisterDefinitions import HoldingRegisterDefinitions
+from modbus_transport import DEFAULT_BAUDRATE, DEFAULT_UNIT, connect_client
+from register_map import load_register_map, split_block
+
+SNAPSHOT_FORMAT = 1
+
+# Modbus allows 123 registers per write_multiple_registers request.
+MAX_WRITE_REGISTERS = 123
+
+# Unchanged writable registers up to this many words may be rewritten with
+# their current value to join two writes into one request.
+DEFAULT_MAX_GAP = 8
+
+
+def take_snapshot(client, table):
+    """Read the whole table block by block; returns {address: [words]}."""
+    snapshot = {}
+    for block in table.read_plan:
+        resp = client.read_holding_registers(address=block.start, count=block.count)
+        if resp.isError():
+            continue
+        for reg, raw_list in split_block(block, resp.registers):
+            snapshot[reg["address"]] = list(raw_list)
+    return snapshot
+
+
+def save_snapshot(path, snapshot, table, register_map, source=""):
+    entries = []
+    for reg in table.registers:
+        if reg["address"] in snapshot:
+            entries.append({"address": f"0x{reg['address']:04X}",
+                            "description": reg["description"],
+                            "words": snapshot[reg["address"]]})
+    data = {
+        "format": SNAPSHOT_FORMAT,
+        "model": register_map.model,
+        "firmware": register_map.firmware,
+        "source": source,
+        "taken": datetime.datetime.now().isoformat(timespec="seconds"),
+        "registers": entries,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+
+
+def load_snapshot(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"{path}: unsupported snapshot format {data.get('format')!r}")
+    return {int(entry["address"], 0): entry["words"] for entry in data["registers"]}
+
+
+def diff_snapshots(table, old, new):
+    """Return [(reg, old_words, new_words)] for registers that differ."""
+    changes = []
+    for reg in table.registers:
+        address = reg["address"]
+        old_words = old.get(address)
+        new_words = new.get(address)
+        if old_words != new_words:
+            changes.append((reg, old_words, new_words))
+    return changes
+
+
+def plan_writes(table, live, target, max_gap=DEFAULT_MAX_GAP, max_block=MAX_WRITE_REGISTERS):
+    """
+    Compute the minimal set of write requests that turns `live` into `target`.
+    Returns [(start_address, [words])]. Read-only registers are never written;
+    a gap between two changes is bridged only if every register in it is
+    writable and its live value is known, so it can be rewritten unchanged.
+    """
+    writable = sorted((reg for reg in table.registers
+                       if not reg.get("readonly") and reg["address"] in target),
+                      key=lambda reg: reg["address"])
+    writes = []
+    run_start = run_end = None
+    run_words = []
+    pending = []  # Unchanged words that may bridge to the next change
+    for reg in writable:
+        address = reg["address"]
+        wanted = target[address]
+        current = live.get(address)
+        if len(wanted) != reg["length"]:
+            continue
+        if current == wanted:
+            if run_words and current is not None and address == run_end \
+                    and sum(len(w) for w in pending) + reg["length"] <= max_gap:
+                pending.append(current)
+                run_end = address + reg["length"]
+            else:
+                pending = []
+                if run_words:
+                    writes.append((run_start, run_words))
+                    run_words = []
+                    run_start = run_end = None
+            continue
+        if run_words and address == run_end and run_end + reg["length"] - run_start <= max_block:
+            for words in pending:
+                run_words.extend(words)
+            run_words.extend(wanted)
+        else:
+            if run_words:
+                writes.append((run_start, run_words))
+            run_start = address
+            run_words = list(wanted)
+        pending = []
+        run_end = address + reg["length"]
+    if run_words:
+        writes.append((run_start, run_words))
+    return writes
+
+
+def restore_snapshot(client, table, target, max_gap=DEFAULT_MAX_GAP, dry_run=False):
+    """
+    Write the registers of `target` that differ from the live inverter.
+    Returns (writes, failures) where failures lists (start, reason).
+    """
+    live = take_snapshot(client, table)
+    writes = plan_writes(table, live, target, max_gap)
+    failures = []
+    if dry_run:
+        return writes, failures
+    for start, words in writes:
+        resp = client.write_registers(address=start, values=words)
+        if resp.isError():
+            failures.append((start, f"write failed: {resp}"))
+            continue
+        check = client.read_holding_registers(address=start, count=len(words))
+        if check.isError():
+            failures.append((start, f"read-back failed: {check}"))
+        elif list(check.registers) != list(words):
+            failures.append((start, f"read-back mismatch: wrote {words}, read {list(check.registers)}"))
+    return writes, failures
+
+
+def format_words(defs, reg, words):
+    if words is None:
+        return "(missing)"
+    return defs.render_register(reg, words)
+
+
+def print_diff(defs, changes):
+    if not changes:
+        print("No differences.")
+        return
+    for reg, old_words, new_words in changes:
+        print(f"0x{reg['address']:04X} {reg['description']}: "
+              f"{format_words(defs, reg, old_words)} -> {format_words(defs, reg, new_words)}")
+
+
+def connect(args):
+    """Connect over TCP (--host) or Modbus RTU (--serial)."""
+    if not args.host and not args.serial:
+        sys.exit(f"{args.command} needs --host or --serial")
+    ip, _, port = (args.host or "").partition(":")
+    return connect_client(host=ip, port=int(port or 502), serial_port=args.serial,
+                          baudrate=args.baud, unit=args.unit)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Back up, diff and restore Solax holding-register settings.")
+    parser.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    parser.add_argument("--serial", default=None, help="Use Modbus RTU on this serial port instead of --host")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUDRATE, help="RTU baud rate")
+    parser.add_argument("--unit", type=int, default=DEFAULT_UNIT, help="Modbus unit (slave) id")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    backup = sub.add_parser("backup", help="Snapshot all holding registers to a file")
+    backup.add_argument("--host", help="Inverter IP, optionally host:port")
+    backup.add_argument("file")
+
+    diff = sub.add_parser("diff", help="Compare two snapshots, or a snapshot against the live inverter")
+    diff.add_argument("--host", help="Compare FILE against this live inverter")
+    diff.add_argument("files", nargs="+")
+
+    restore = sub.add_parser("restore", help="Write the settings that differ from a snapshot")
+    restore.add_argument("--host", help="Inverter IP, optionally host:port")
+    restore.add_argument("--max-gap", type=int, default=DEFAULT_MAX_GAP,
+                         help="Unchanged registers that may be rewritten to merge two writes")
+    restore.add_argument("--dry-run", action="store_true", help="Only print the planned writes")
+    restore.add_argument("file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    register_map = load_register_map(args.register_map)
+    defs = HoldingRegisterDefinitions(register_map)
+    table = defs.table
+
+    if args.command == "backup":
+        client = connect(args)
+        try:
+            snapshot = take_snapshot(client, table)
+        finally:
+            client.close()
+        save_snapshot(args.file, snapshot, table, register_map, source=args.host or args.serial)
+        print(f"Saved {len(snapshot)} of {len(table.registers)} registers to {args.file}")
+        return 0
+
+    if args.command == "diff":
+        if args.host or args.serial:
+            if len(args.files) != 1:
+                sys.exit("diff --host takes exactly one snapshot file")
+            old = load_snapshot(args.files[0])
+            client = connect(args)
+            try:
+                new = take_snapshot(client, table)
+            finally:
+                client.close()
+        else:
+            if len(args.files) != 2:
+                sys.exit("diff takes two snapshot files (or one with --host/--serial)")
+            old, new = load_snapshot(args.files[0]), load_snapshot(args.files[1])
+        print_diff(defs, diff_snapshots(table, old, new))
+        return 0
+
+    target = load_snapshot(args.file)
+    client = connect(args)
+    try:
+        writes, failures = restore_snapshot(client, table, target, args.max_gap, args.dry_run)
+    finally:
+        client.close()
+    for start, words in writes:
+        print(f"{'Would write' if args.dry_run else 'Wrote'} {len(words)} register(s) at 0x{start:04X}")
+    for start, reason in failures:
+        print(f"0x{start:04X}: {reason}", file=sys.stderr)
+    print(f"{len(writes)} write request(s), {sum(len(w) for _, w in writes)} register(s), {len(failures)} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
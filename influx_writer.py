@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Push snapshots to InfluxDB or VictoriaMetrics as line protocol.
+
+Every register with a numeric value becomes one point per cycle, tagged
+with its address as well since a few descriptions repeat within a table
+(reserved "REV" words carry no data and are left out):
+
+  solax,table=input,register=feedin_power,address=0x00C0,unit=W value=-1520.0 1717243200000000000
+
+Registers with an enum/flag decoder also get their rendered text as a
+"text" field. Derived metrics of the register map are computed from the
+same snapshot and written the same way, tagged with the metric's name:
+
+  solax,table=input,register=PV\\ Power\\ Total,unit=W value=3120.0 1717243200000000000
+
+The point prefixes (escaped measurement and tags) are built
+once from the register map, so encoding a cycle is string concatenation.
+
+add() only encodes and queues: batches are cut by line count or age and
+sent by a background thread, so a slow or dead endpoint never delays
+polling. While the endpoint is unreachable (connection errors, 5xx, 429)
+batches go to a spool directory, one file each, bounded in total size by
+dropping the oldest. Spooled batches are replayed in order, retrying with
+exponential backoff, before any newer batch is sent; new batches join the
+spool until it is empty. A batch the endpoint rejects as malformed (other
+4xx) is logged and dropped instead of blocking the spool.
+
+  modbus_poller.py --host 192.168.0.100 --influx "http://localhost:8086/api/v2/write?org=home&bucket=solar" \\
+      --influx-token TOKEN
+  influx_writer.py serve --listen 8086 --output points.lp      # local stand-in for testing
+"""
+import argparse
+import gzip
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from derived_metrics import DerivedMetricsEngine
+from register_map import is_reserved, load_register_map
+from register_utils import decode_numeric, load_definitions
+
+logger = logging.getLogger("influx")
+
+DEFAULT_MEASUREMENT = "solax"
+DEFAULT_BATCH_LINES = 5000
+DEFAULT_FLUSH_INTERVAL = 10.0           # seconds a partial batch may wait
+DEFAULT_MAX_SPOOL_BYTES = 100 * 1024 * 1024
+DEFAULT_SPOOL_DIR = "influx-spool"
+MAX_QUEUED_BATCHES = 64                 # batches waiting for the sender thread
+_RETRY_MIN = 1.0
+_RETRY_MAX = 60.0
+
+
+def _escape_tag(text):
+    return text.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def _escape_string(text):
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _prefix(measurement, table_name, name, unit, address=None):
+    tags = f"{_escape_tag(measurement)},table={table_name},register={_escape_tag(name)}"
+    if address is not None:
+        tags += f",address=0x{address:04X}"
+    if unit:
+        tags += f",unit={_escape_tag(unit)}"
+    return tags + " "
+
+
+class LineProtocolEncoder:
+    """Turns {(bank, address): raw_list or None} snapshots into line protocol."""
+
+    def __init__(self, register_map=None, measurement=DEFAULT_MEASUREMENT):
+        definitions = load_definitions(register_map or load_register_map())
+        self.points = []        # (key, register, prefix, definitions or None)
+        self.derived = []       # (engine, [(key, register)] of its inputs, {metric name: prefix})
+        for name, defs in definitions.items():
+            table = defs.table
+            for reg in table.registers:
+                if is_reserved(reg):
+                    continue
+                self.points.append(((table.function, reg["address"]), reg,
+                                    _prefix(measurement, name, reg["description"], reg.get("unit"), reg["address"]),
+                                    defs if reg.get("decoder") is not None else None))
+            engine = DerivedMetricsEngine(table)
+            if engine.metrics:
+                inputs = [((table.function, address), table.lookup(address))
+                          for address in sorted(engine.input_addresses)]
+                self.derived.append((engine, inputs, {metric.name: _prefix(measurement, name, metric.name, metric.unit)
+                                                      for metric in engine.metrics}))
+
+    def encode(self, values, timestamp):
+        suffix = f" {round(timestamp * 1000) * 1_000_000}"
+        lines = []
+        append = lines.append
+        for key, reg, prefix, defs in self.points:
+            raw_list = values.get(key)
+            if raw_list is None:
+                continue
+            value = decode_numeric(reg, raw_list[:reg["length"]])
+            if value is None:
+                continue
+            # Always a float: a field must keep one type across points.
+            fields = f"value={float(value)!r}"
+            if defs is not None:
+                fields += f',text="{_escape_string(defs.render_register(reg, raw_list[:reg["length"]]))}"'
+            append(prefix + fields + suffix)
+        for engine, inputs, prefixes in self.derived:
+            numeric_values = {}
+            for key, reg in inputs:
+                raw_list = values.get(key)
+                if raw_list is not None:
+                    numeric_values[reg["address"]] = decode_numeric(reg, raw_list[:reg["length"]])
+            engine.update(numeric_values)
+            for metric in engine.metrics:
+                if metric.value is not None:
+                    append(prefixes[metric.name] + f"value={float(metric.value)!r}" + suffix)
+        return lines
+
+
+class InfluxWriter:
+    """
+    Batches, sends and spools line protocol (see the module docstring).
+    add() and close() are called from the polling loop; everything that
+    touches the network or the spool runs on the writer's own thread.
+    """
+
+    def __init__(self, url, register_map=None, token=None, measurement=DEFAULT_MEASUREMENT,
+                 batch_lines=DEFAULT_BATCH_LINES, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 spool_dir=DEFAULT_SPOOL_DIR, max_spool_bytes=DEFAULT_MAX_SPOOL_BYTES, timeout=10.0):
+        self.url = url
+        self.token = token
+        self.encoder = LineProtocolEncoder(register_map, measurement)
+        self.batch_lines = batch_lines
+        self.flush_interval = flush_interval
+        self.spool_dir = spool_dir
+        self.max_spool_bytes = max_spool_bytes
+        self.timeout = timeout
+        self.sent_lines = 0
+        self.dropped_lines = 0
+        self._lines = []
+        self._batch_started = None
+        self._queue = queue.Queue(MAX_QUEUED_BATCHES)
+        self._stop = threading.Event()
+        os.makedirs(spool_dir, exist_ok=True)
+        self._spool = sorted(name for name in os.listdir(spool_dir) if name.endswith(".lp"))
+        self._spool_bytes = sum(os.path.getsize(os.path.join(spool_dir, name)) for name in self._spool)
+        self._spool_sequence = int(self._spool[-1][:-3]) + 1 if self._spool else 0
+        if self._spool:
+            logger.info("%d spooled batch(es) in %s will be replayed", len(self._spool), spool_dir)
+        self._thread = threading.Thread(target=self._run, name="influx-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, values, timestamp=None):
+        """Encode one snapshot and queue it; never waits for the endpoint or the disk."""
+        timestamp = time.time() if timestamp is None else timestamp
+        self._lines.extend(self.encoder.encode(values, timestamp))
+        if self._batch_started is None:
+            self._batch_started = time.monotonic()
+        if (len(self._lines) >= self.batch_lines
+                or time.monotonic() - self._batch_started >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Hand the current batch to the writer thread."""
+        lines, self._lines, self._batch_started = self._lines, [], None
+        if not lines:
+            return
+        try:
+            self._queue.put_nowait(lines)
+        except queue.Full:
+            self.dropped_lines += len(lines)
+            logger.warning("Writer thread is behind; dropped a batch of %d lines", len(lines))
+
+    def close(self, timeout=30.0):
+        """Flush, then give the thread up to `timeout` seconds to send or spool what is queued."""
+        self.flush()
+        self._stop.set()
+        self._thread.join(timeout)
+
+    # --- writer thread -------------------------------------------------
+
+    def _run(self):
+        retry_delay = _RETRY_MIN
+        retry_at = 0.0
+        while True:
+            try:
+                lines = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                lines = None
+            if lines is not None:
+                if self._spool or time.monotonic() < retry_at or not self._post_batch(lines):
+                    try:
+                        self._spool_batch(lines)
+                    except OSError as e:
+                        self.dropped_lines += len(lines)
+                        logger.error("Cannot spool to %s (%s); dropped a batch of %d lines",
+                                     self.spool_dir, e, len(lines))
+            if self._spool and time.monotonic() >= retry_at:
+                if self._replay():
+                    retry_delay = _RETRY_MIN
+                    retry_at = 0.0
+                else:
+                    retry_at = time.monotonic() + retry_delay
+                    retry_delay = min(_RETRY_MAX, retry_delay * 2)
+            if self._stop.is_set() and self._queue.empty():
+                return
+
+    def _post(self, body):
+        """True if sent, False to retry later; a rejected batch counts as sent (and is logged)."""
+        request = urllib.request.Request(self.url, data=gzip.compress(body), method="POST")
+        request.add_header("Content-Type", "text/plain; charset=utf-8")
+        request.add_header("Content-Encoding", "gzip")
+        if self.token:
+            request.add_header("Authorization", f"Token {self.token}")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+            return True
+        except urllib.error.HTTPError as e:
+            if e.code >= 500 or e.code == 429:
+                logger.warning("%s returned %d, spooling", self.url, e.code)
+                return False
+            logger.error("%s rejected a batch (%d %s): %s", self.url, e.code, e.reason,
+                         e.read(200).decode("utf-8", "replace"))
+            return True
+        except (OSError, urllib.error.URLError) as e:
+            logger.warning("%s unreachable (%s), spooling", self.url, e)
+            return False
+
+    def _post_batch(self, lines):
+        if not self._post(("\n".join(lines) + "\n").encode("utf-8")):
+            return False
+        self.sent_lines += len(lines)
+        return True
+
+    def _spool_batch(self, lines):
+        body = ("\n".join(lines) + "\n").encode("utf-8")
+        while self._spool and self._spool_bytes + len(body) > self.max_spool_bytes:
+            oldest = os.path.join(self.spool_dir, self._spool.pop(0))
+            size = os.path.getsize(oldest)
+            with open(oldest, "rb") as f:
+                self.dropped_lines += f.read().count(b"\n")
+            os.remove(oldest)
+            self._spool_bytes -= size
+            logger.warning("Spool full: dropped %s", oldest)
+        name = f"{self._spool_sequence:012d}.lp"
+        self._spool_sequence += 1
+        path = os.path.join(self.spool_dir, name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)
+        self._spool.append(name)
+        self._spool_bytes += len(body)
+
+    def _replay(self):
+        """Send spooled batches oldest first; False as soon as one cannot be sent."""
+        replayed = 0
+        while self._spool:
+            path = os.path.join(self.spool_dir, self._spool[0])
+            with open(path, "rb") as f:
+                body = f.read()
+            if not self._post(body):
+                return False
+            os.remove(path)
+            self._spool.pop(0)
+            self._spool_bytes -= len(body)
+            self.sent_lines += body.count(b"\n")
+            replayed += 1
+        if replayed:
+            logger.info("%s reachable again: replayed %d spooled batch(es)", self.url, replayed)
+        return True
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server_version = "influx-stand-in"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if random.random() < self.server.fail_rate:
+            self.send_error(503, "Simulated outage")
+            return
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        lines = body.count(b"\n")
+        with self.server.lock:
+            self.server.lines += lines
+            if self.server.output is not None:
+                self.server.output.write(body)
+                self.server.output.flush()
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.info("%s %s", self.address_string(), format % args)
+
+
+def serve(listen, output=None, fail_rate=0.0):
+    """Accept line-protocol writes on any path like an InfluxDB/VictoriaMetrics write endpoint."""
+    host, _, port = listen.rpartition(":")
+    server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), _StandInHandler)
+    server.lock = threading.Lock()
+    server.lines = 0
+    server.fail_rate = fail_rate
+    server.output = open(output, "ab") if output else None
+    logger.info("Accepting line protocol on http://%s:%s/ (failing %.0f%% of writes)",
+                host or "127.0.0.1", port, fail_rate * 100)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if server.output is not None:
+            server.output.close()
+        logger.info("%d lines received", server.lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Line-protocol writer tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stand_in = sub.add_parser("serve", help="Run a local HTTP stand-in for the write endpoint")
+    stand_in.add_argument("--listen", default="8086", metavar="[ADDR:]PORT")
+    stand_in.add_argument("--output", default=None, metavar="FILE", help="Append received lines to FILE")
+    stand_in.add_argument("--fail-rate", type=float, default=0.0,
+                          help="Fraction of writes answered with 503, to exercise spooling")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    serve(args.listen, args.output, args.fail_rate)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
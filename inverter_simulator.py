@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# inverter_simulator.py
+import argparse
+import os
+import random
+import select
+import struct
+import sys
+import threading
+import time
+import tty
+
+from register_map import load_register_map
+
+# Registers the plant model drives (input table unless noted).
+PV_POWER1_ADDR = 0x000A
+PV_POWER2_ADDR = 0x000B
+BATTERY_POWER_ADDR = 0x00C4
+BATTERY_CAPACITY_ADDR = 0x001C
+FEEDIN_POWER_ADDR = 0x00C0          # int32, LSW first
+GRID_POWER_ADDR = 0x00BC
+EXPORT_LIMIT_ADDR = 0x00B6          # holding
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_ADDRESS = 0x02
+ILLEGAL_DATA_VALUE = 0x03
+
+
+class SimulatedResponse:
+    """Mimics the parts of a pymodbus response the tools use."""
+
+    def __init__(self, registers=None, error=None):
+        self.registers = registers if registers is not None else []
+        self._error = error
+
+    def isError(self):
+        return self._error is not None
+
+    def __str__(self):
+        return self._error or "OK"
+
+
+def _ascii_words(text, length):
+    text = text.ljust(length * 2)[:length * 2]
+    return [(ord(text[i]) << 8) | ord(text[i + 1]) for i in range(0, len(text), 2)]
+
+
+def _put_int32(bank, address, value):
+    value &= 0xFFFFFFFF
+    bank[address] = value & 0xFFFF
+    bank[address + 1] = value >> 16
+
+
+class SimulatedInverter:
+    """
+    In-process stand-in for a Solax inverter behind a pymodbus client.
+
+    Every register defined in the register map reads back a value; reads of
+    undefined addresses fail like the real inverter does. A small plant model
+    (PV, house load, battery and the export limit) updates the power
+    registers each time step() runs, so control loops can be exercised
+    without hardware. `latency` adds a per-request delay in seconds.
+    """
+
+    def __init__(self, register_map=None, model="X3", latency=0.0, seed=None):
+        self.register_map = register_map or load_register_map()
+        self.latency = latency
+        self.description = f"simulated {model}"
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.holding = {}
+        self.input = {}
+        for name, table in self.register_map.tables.items():
+            bank = self.holding if table.function == "holding" else self.input
+            for reg in table.registers:
+                for offset in range(reg["length"]):
+                    bank.setdefault(reg["address"] + offset, 0)
+
+        self.holding.update(zip(range(0x0000, 0x0007), _ascii_words("H3SIM0000000001", 7)))
+        self.holding.update(zip(range(0x0007, 0x000E), _ascii_words("SOLAX SIM", 7)))
+        self.holding.update(zip(range(0x000E, 0x0015), _ascii_words(f"{model}-Hybrid", 7)))
+        self.holding[EXPORT_LIMIT_ADDR] = 10000
+
+        # Plant state in watts
+        self.pv_available = 4000.0
+        self.pv_power = 4000.0
+        self.house_load = 800.0
+        self.battery_power = 0.0        # positive = charging
+        self.battery_max_charge = 2500.0
+        self.battery_soc = 60.0
+        self.requests = 0
+        self._last_step = time.monotonic()
+        self.step(0.0)
+
+    # -- plant model -------------------------------------------------------
+
+    def step(self, dt=None):
+        """Advance the plant model by dt seconds (default: time since last step)."""
+        now = time.monotonic()
+        if dt is None:
+            dt = now - self._last_step
+        self._last_step = now
+        rnd = self.random
+        with self.lock:
+            self.pv_available = min(8000.0, max(0.0, self.pv_available + rnd.gauss(0, 40) * dt ** 0.5))
+            self.house_load = min(6000.0, max(150.0, self.house_load + rnd.gauss(0, 60) * dt ** 0.5))
+            self.pv_power = self.pv_available
+            surplus = self.pv_power - self.house_load
+            if surplus > 0 and self.battery_soc >= 100.0 or surplus < 0 and self.battery_soc <= 0.0:
+                self.battery_power = 0.0
+            else:
+                self.battery_power = max(-self.battery_max_charge, min(self.battery_max_charge, surplus))
+            self.battery_soc = min(100.0, max(0.0, self.battery_soc + self.battery_power * dt / 36000.0))
+            export = surplus - self.battery_power
+            # The inverter curtails PV to respect the export limit.
+            limit = self.holding.get(EXPORT_LIMIT_ADDR, 0)
+            if export > limit:
+                self.pv_power -= export - limit
+                export = limit
+            half = int(self.pv_power / 2)
+            self.input[PV_POWER1_ADDR] = half & 0xFFFF
+            self.input[PV_POWER2_ADDR] = half & 0xFFFF
+            self.input[BATTERY_POWER_ADDR] = int(self.battery_power) & 0xFFFF
+            self.input[BATTERY_CAPACITY_ADDR] = int(self.battery_soc)
+            self.input[GRID_POWER_ADDR] = int(self.pv_power - self.battery_power) & 0xFFFF
+            _put_int32(self.input, FEEDIN_POWER_ADDR, int(export))
+
+    # -- pymodbus client interface ------------------------------------------
+
+    def connect(self):
+        return True
+
+    def close(self):
+        pass
+
+    def _read(self, bank, address, count):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            words = [bank.get(a) for a in range(address, address + count)]
+        if None in words:
+            return SimulatedResponse(error="Exception Response: IllegalAddress")
+        return SimulatedResponse(words)
+
+    def read_holding_registers(self, address, count=1, **kwargs):
+        return self._read(self.holding, address, count)
+
+    def read_input_registers(self, address, count=1, **kwargs):
+        return self._read(self.input, address, count)
+
+    def write_registers(self, address, values, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.requests += 1
+            if any(a not in self.holding for a in range(address, address + len(values))):
+                return SimulatedResponse(error="Exception Response: IllegalAddress")
+            for offset, value in enumerate(values):
+                self.holding[address + offset] = value & 0xFFFF
+        return SimulatedResponse(list(values))
+
+    def write_register(self, address, value, **kwargs):
+        return self.write_registers(address, [value], **kwargs)
+
+
+def _crc16_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data):
+    """Modbus RTU CRC-16 (poly 0xA001, init 0xFFFF); appended low byte first."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ _CRC16_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+class RtuSlave:
+    """
+    Serves a SimulatedInverter as a Modbus RTU slave on a file descriptor,
+    normally the master side of a pseudo-terminal (see open_pty_slave()), so
+    the serial transport can be exercised end to end without RS485 hardware.
+
+    Supports read holding/input registers (0x03/0x04) and write single/multiple
+    registers (0x06/0x10). Frames with a bad CRC or for another unit id are
+    dropped silently, as on a real bus; a partial frame followed by more than
+    `frame_gap` seconds of silence is discarded.
+
+    The slave owns `fd` (and `slave_fd`, the other end of a pty pair, if
+    set); stop() closes them.
+    """
+
+    def __init__(self, simulator, fd, unit=1, frame_gap=0.004):
+        self.simulator = simulator
+        self.fd = fd
+        self.slave_fd = None
+        self.unit = unit
+        self.frame_gap = frame_gap
+        self.frames = 0
+        self.crc_errors = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, name="rtu-slave", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(1.0)
+        for name in ("fd", "slave_fd"):
+            fd = getattr(self, name)
+            if fd is not None:
+                setattr(self, name, None)
+                os.close(fd)
+
+    def serve_forever(self):
+        buffer = bytearray()
+        last_byte = 0.0
+        while not self.stop_event.is_set():
+            ready, _, _ = select.select([self.fd], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                data = os.read(self.fd, 512)
+            except OSError:
+                # EIO while no client has the pty open; wait for one.
+                time.sleep(0.05)
+                continue
+            now = time.monotonic()
+            if buffer and now - last_byte > self.frame_gap:
+                buffer.clear()
+            last_byte = now
+            buffer.extend(data)
+            while True:
+                length = self._frame_length(buffer)
+                if length is None or len(buffer) < length:
+                    break
+                frame = bytes(buffer[:length])
+                del buffer[:length]
+                reply = self.handle_frame(frame)
+                if reply:
+                    os.write(self.fd, reply)
+
+    @staticmethod
+    def _frame_length(buffer):
+        if len(buffer) < 2:
+            return None
+        function = buffer[1]
+        if function in (0x03, 0x04, 0x06):
+            return 8
+        if function == 0x10:
+            return 9 + buffer[6] if len(buffer) >= 7 else None
+        return len(buffer)  # Unsupported: consume everything and answer ILLEGAL_FUNCTION
+
+    def handle_frame(self, frame):
+        """Process one request frame and return the reply frame (b"" for none)."""
+        if len(frame) < 4 or crc16(frame[:-2]) != struct.unpack("<H", frame[-2:])[0]:
+            self.crc_errors += 1
+            return b""
+        unit, function = frame[0], frame[1]
+        if unit not in (self.unit, 0):
+            return b""
+        self.frames += 1
+        pdu = handle_pdu(self.simulator, function, frame[2:-2])
+        if unit == 0:
+            return b""  # Broadcasts are never answered
+        adu = bytes([self.unit]) + pdu
+        return adu + struct.pack("<H", crc16(adu))
+
+
+def handle_pdu(sim, function, body):
+    """
+    Answer one Modbus request PDU (function code + body) from a
+    SimulatedInverter; returns the response PDU. Shared by the RTU slave and
+    the TCP fleet server (fleet_simulator.py).
+    """
+    if function in (0x03, 0x04):
+        address, count = struct.unpack(">HH", body[:4])
+        if not 1 <= count <= 125:
+            return bytes([function | 0x80, ILLEGAL_DATA_VALUE])
+        read = sim.read_holding_registers if function == 0x03 else sim.read_input_registers
+        resp = read(address=address, count=count)
+        if resp.isError():
+            return bytes([function | 0x80, ILLEGAL_DATA_ADDRESS])
+        return bytes([function, count * 2]) + struct.pack(f">{count}H", *resp.registers)
+    if function == 0x06:
+        address, value = struct.unpack(">HH", body[:4])
+        if sim.write_register(address=address, value=value).isError():
+            return bytes([function | 0x80, ILLEGAL_DATA_ADDRESS])
+        return bytes([function]) + body[:4]
+    if function == 0x10:
+        address, count, byte_count = struct.unpack(">HHB", body[:5])
+        if not 1 <= count <= 123 or byte_count != count * 2:
+            return bytes([function | 0x80, ILLEGAL_DATA_VALUE])
+        values = list(struct.unpack(f">{count}H", body[5:5 + byte_count]))
+        if sim.write_registers(address=address, values=values).isError():
+            return bytes([function | 0x80, ILLEGAL_DATA_ADDRESS])
+        return bytes([function]) + body[:4]
+    return bytes([function | 0x80, ILLEGAL_FUNCTION])
+
+
+def open_pty_slave(simulator, unit=1):
+    """
+    Start an RtuSlave on a new pseudo-terminal pair. Returns (slave, path);
+    point a serial client at `path` (e.g. --serial /dev/pts/5).
+    """
+    master_fd, slave_fd = os.openpty()
+    try:
+        tty.setraw(slave_fd)
+        path = os.ttyname(slave_fd)
+    except OSError:
+        os.close(master_fd)
+        os.close(slave_fd)
+        raise
+    slave = RtuSlave(simulator, master_fd, unit)
+    slave.slave_fd = slave_fd   # Keep our end open so the master never sees EOF between clients
+    return slave.start(), path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulated Solax inverter for testing without hardware.")
+    parser.add_argument("--rtu", action="store_true", help="Serve Modbus RTU on a new pseudo-terminal")
+    parser.add_argument("--unit", type=int, default=1, help="Modbus unit (slave) id")
+    parser.add_argument("--model", default="X3", help="Model reported in the ModuleName register")
+    parser.add_argument("--latency", type=float, default=0.0, help="Extra delay per request in seconds")
+    parser.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    simulator = SimulatedInverter(load_register_map(args.register_map), args.model, args.latency)
+    if not args.rtu:
+        sys.exit("Nothing to serve; use --rtu")
+    slave, path = open_pty_slave(simulator, args.unit)
+    print(f"Modbus RTU slave {args.unit} on {path}  (e.g. solax-xhybrid-gui.py --serial {path})", flush=True)
+    try:
+        while True:
+            time.sleep(1.0)
+            simulator.step()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        slave.stop()
+    print(f"{slave.frames} frames served, {slave.crc_errors} CRC errors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
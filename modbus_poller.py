@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Modbus acquisition in its own process.
+
+Polls every table of the (profile-restricted) register map on a fixed
+interval and publishes each cycle into a shared-memory snapshot (see
+shared_snapshot.py). The GUI attaches with --attach NAME, or starts the
+poller itself with --poller; exporters use SharedSnapshotReader. With
+--archive every cycle is also appended to a raw register archive (see
+register_archive.py), with --rollups its energy counters are added to
+hourly/daily/monthly rollups (see energy_rollups.py), and with --influx it
+is pushed as line protocol to InfluxDB/VictoriaMetrics (see influx_writer.py).
+
+  modbus_poller.py --host 192.168.0.100 --name solax --interval 2
+  modbus_poller.py --serial /dev/ttyUSB0 --baud 9600 --name solax
+  modbus_poller.py --host 192.168.0.100 --archive solax.slxa
+  modbus_poller.py --host 192.168.0.100 --rollups energy.sqlite
+  modbus_poller.py --host 192.168.0.100 --influx http://localhost:8428/write
+"""
+import argparse
+import logging
+import multiprocessing
+import signal
+import sys
+import threading
+import time
+
+from model_profile import FULL_PROFILE, detect_capabilities, detect_profile, profile_for_model
+from modbus_transport import add_transport_args, client_kwargs_from_args, connect_client
+from perf_stats import PerfStats, STAGE_MODBUS
+from address_quarantine import AddressQuarantine
+from energy_rollups import EnergyRollups
+from influx_writer import DEFAULT_BATCH_LINES, DEFAULT_FLUSH_INTERVAL, DEFAULT_SPOOL_DIR, InfluxWriter
+from register_archive import ArchiveWriter
+from register_map import load_register_map
+from register_snapshot import acquire_snapshot
+from shared_snapshot import SharedSnapshotWriter
+
+logger = logging.getLogger("poller")
+
+# Seconds before reconnecting after a cycle failed on the transport; the
+# delay doubles while reconnecting or polling keeps failing.
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 60.0
+
+
+def select_profile(client, register_map, model):
+    if model == "all":
+        return FULL_PROFILE
+    if model == "auto":
+        return detect_profile(client, register_map)
+    return profile_for_model(register_map, model, detect_capabilities(client, register_map))
+
+
+class Poller:
+    """
+    Reads the read plan of every table once per poll() and returns the values
+    keyed by (bank, address). Registers the inverter refuses are isolated and
+    re-probed by an AddressQuarantine shared by all tables (see
+    address_quarantine.py); they are published as failed reads meanwhile.
+    """
+
+    def __init__(self, client, register_map, profile=FULL_PROFILE, quarantine=None):
+        self.client = client
+        self.tables = [table.subset(profile.capabilities) for table in register_map.tables.values()]
+        self.stats = PerfStats()
+        self.quarantine = quarantine if quarantine is not None else AddressQuarantine()
+
+    def _on_request(self, block, seconds, error):
+        self.stats.add_sample(STAGE_MODBUS, seconds)
+        self.stats.count_request(block.count, error=error)
+
+    def poll(self):
+        values = {}
+        errors = 0
+        for table in self.tables:
+            bank = table.function
+            snapshot = acquire_snapshot(self.client, table, on_request=self._on_request, quarantine=self.quarantine)
+            for reg, raw_list in snapshot.items:
+                values[(bank, reg["address"])] = raw_list
+            errors += snapshot.errors
+        return values, errors
+
+    def failed(self):
+        """(values, errors) of a cycle in which nothing could be read: every register a failed read."""
+        values = {(table.function, reg["address"]): None for table in self.tables for reg in table.registers}
+        return values, sum(len(table.read_plan) for table in self.tables)
+
+
+def run_poller(name, client_kwargs, register_map_path=None, model="auto", interval=1.0, stop_event=None,
+               archive_path=None, rollups_path=None, influx=None):
+    """
+    Acquisition loop: connect, pick the model profile, then poll and publish
+    until stop_event is set. Used as the target of the poller process.
+    influx is a dict of InfluxWriter arguments (at least "url"), or None.
+
+    A cycle that fails on the transport (lost connection, timeout, inverter
+    rebooting) publishes every register as a failed read, then the client is
+    closed and reconnected, backing off from RECONNECT_MIN to RECONNECT_MAX
+    seconds. Only the first connection failing is fatal.
+    """
+    stop_event = stop_event or threading.Event()
+    register_map = load_register_map(register_map_path)
+    writer = SharedSnapshotWriter(name, register_map)
+    archive = ArchiveWriter(archive_path, register_map) if archive_path else None
+    rollups = EnergyRollups(rollups_path, register_map) if rollups_path else None
+    influx_writer = InfluxWriter(register_map=register_map, **influx) if influx else None
+    client = None
+    try:
+        client = connect_client(**client_kwargs)
+        poller = Poller(client, register_map, select_profile(client, register_map, model))
+        logger.info("Publishing %s to shared memory %s every %.1f s", client.description, name, interval)
+        next_tick = time.monotonic()
+        reconnect_delay = RECONNECT_MIN
+        while not stop_event.is_set():
+            t0 = time.perf_counter()
+            timestamp = time.time()
+            try:
+                values, errors = poller.poll()
+            except Exception as e:
+                logger.warning("Polling %s failed (%s); reconnecting", client.description, e)
+                values, errors = poller.failed()
+                writer.publish(values, timestamp, (time.perf_counter() - t0) * 1000.0, errors)
+                client.close()
+                client = None
+                while client is None and not stop_event.wait(reconnect_delay):
+                    reconnect_delay = min(RECONNECT_MAX, reconnect_delay * 2)
+                    try:
+                        client = connect_client(**client_kwargs)
+                    except OSError as e:      # ConnectionError, or the serial port went away
+                        logger.warning("%s; retrying in %.0f s", e, reconnect_delay)
+                if client is None:
+                    break
+                logger.info("Reconnected to %s", client.description)
+                poller.client = client
+                next_tick = time.monotonic()
+                continue
+            reconnect_delay = RECONNECT_MIN
+            writer.publish(values, timestamp, (time.perf_counter() - t0) * 1000.0, errors)
+            if archive is not None:
+                archive.append(values, timestamp)
+            if rollups is not None:
+                rollups.update(values, timestamp)
+            if influx_writer is not None:
+                influx_writer.add(values, timestamp)
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                next_tick = time.monotonic()
+                delay = 0
+            stop_event.wait(delay)
+    finally:
+        if client is not None:
+            client.close()
+        if archive is not None:
+            archive.close()
+        if rollups is not None:
+            rollups.close()
+        if influx_writer is not None:
+            influx_writer.close()
+        writer.close()
+
+
+def start_poller_process(name, client_kwargs, register_map_path=None, model="auto", interval=1.0):
+    """Start run_poller() in a daemon process; returns (process, stop_event)."""
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+    process = context.Process(target=run_poller, name="modbus-poller", daemon=True,
+                              args=(name, client_kwargs, register_map_path, model, interval, stop_event))
+    process.start()
+    return process, stop_event
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Poll a Solax inverter into a shared-memory snapshot.")
+    add_transport_args(parser)
+    parser.add_argument("--name", default="solax", help="Shared memory segment name")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds")
+    parser.add_argument("--model", default="auto", help="Model profile: auto, all, or a model such as X1/X3")
+    parser.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    parser.add_argument("--archive", default=None, metavar="FILE",
+                        help="Also append every cycle to this raw register archive")
+    parser.add_argument("--rollups", default=None, metavar="FILE",
+                        help="Also keep hourly/daily/monthly energy rollups in this SQLite database")
+    parser.add_argument("--influx", default=None, metavar="URL",
+                        help="Also push line protocol to this write URL (InfluxDB /api/v2/write?org=..&bucket=.., "
+                             "InfluxDB 1.x or VictoriaMetrics /write?db=..)")
+    parser.add_argument("--influx-token", default=None, help="InfluxDB API token")
+    parser.add_argument("--influx-batch", type=int, default=DEFAULT_BATCH_LINES, metavar="LINES",
+                        help="Lines per write request")
+    parser.add_argument("--influx-flush", type=float, default=DEFAULT_FLUSH_INTERVAL, metavar="SECONDS",
+                        help="Longest time a partial batch waits")
+    parser.add_argument("--influx-spool", default=DEFAULT_SPOOL_DIR, metavar="DIR",
+                        help="Directory for batches kept while the endpoint is down")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    influx = None
+    if args.influx:
+        influx = {"url": args.influx, "token": args.influx_token, "batch_lines": args.influx_batch,
+                  "flush_interval": args.influx_flush, "spool_dir": args.influx_spool}
+    try:
+        run_poller(args.name, client_kwargs_from_args(args), args.register_map, args.model, args.interval, stop_event,
+                   args.archive, args.rollups, influx)
+    except KeyboardInterrupt:
+        pass
+    except ConnectionError as e:
+        sys.exit(str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
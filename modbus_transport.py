@@ -0,0 +1,122 @@
+# modbus_transport.py
+import inspect
+import time
+
+DEFAULT_TCP_PORT = 502
+DEFAULT_BAUDRATE = 9600
+DEFAULT_UNIT = 1
+
+# Modbus RTU frames are separated by 3.5 character times of silence; above
+# 19200 baud the spec fixes the gap at 1.75 ms.
+_BITS_PER_CHAR = 11  # start + 8 data + parity/stop + stop
+
+
+def rtu_frame_gap(baudrate):
+    """Minimum silent interval between RTU frames in seconds."""
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * _BITS_PER_CHAR / baudrate
+
+
+def rtu_timeout(baudrate, margin=0.5):
+    """Response timeout: time to receive a maximum-size (256 byte) frame plus a margin."""
+    return 256 * _BITS_PER_CHAR / baudrate + margin
+
+
+def unit_keyword(client):
+    """
+    Name of the unit-id keyword of a pymodbus client's request methods:
+    "device_id" from pymodbus 3.10 on, "slave" before.
+    """
+    try:
+        parameters = inspect.signature(client.read_holding_registers).parameters
+    except (TypeError, ValueError):
+        return "slave"
+    return "device_id" if "device_id" in parameters else "slave"
+
+
+class UnitClient:
+    """
+    Wraps a pymodbus client so callers can keep using
+    read_*_registers(address=..., count=...) while every request is addressed
+    to one unit id and spaced by at least `frame_gap` seconds (RTU inter-frame
+    silence).
+    """
+
+    def __init__(self, client, unit=DEFAULT_UNIT, frame_gap=0.0, description=""):
+        self.client = client
+        self.unit = unit
+        self.frame_gap = frame_gap
+        self.description = description
+        self._unit_keyword = unit_keyword(client)
+        self._last_io = 0.0
+
+    def _wait_gap(self):
+        if self.frame_gap:
+            delay = self._last_io + self.frame_gap - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _call(self, method, **kwargs):
+        self._wait_gap()
+        try:
+            return method(**{self._unit_keyword: self.unit}, **kwargs)
+        finally:
+            self._last_io = time.monotonic()
+
+    def connect(self):
+        return self.client.connect()
+
+    def close(self):
+        self.client.close()
+
+    def read_holding_registers(self, address, count=1):
+        return self._call(self.client.read_holding_registers, address=address, count=count)
+
+    def read_input_registers(self, address, count=1):
+        return self._call(self.client.read_input_registers, address=address, count=count)
+
+    def write_register(self, address, value):
+        return self._call(self.client.write_register, address=address, value=value)
+
+    def write_registers(self, address, values):
+        return self._call(self.client.write_registers, address=address, values=values)
+
+
+def create_client(host=None, port=DEFAULT_TCP_PORT, serial_port=None, baudrate=DEFAULT_BAUDRATE,
+                  unit=DEFAULT_UNIT, parity="N", stopbits=1, bytesize=8):
+    """
+    Build an (unconnected) client for Modbus TCP, or Modbus RTU when
+    `serial_port` is given. pymodbus is imported here so that tools which
+    never talk to an inverter do not pay for the import.
+    """
+    if serial_port:
+        from pymodbus.client import ModbusSerialClient
+        client = ModbusSerialClient(port=serial_port, baudrate=baudrate, parity=parity,
+                                    stopbits=stopbits, bytesize=bytesize, timeout=rtu_timeout(baudrate))
+        return UnitClient(client, unit, rtu_frame_gap(baudrate), f"{serial_port}@{baudrate} unit {unit}")
+    from pymodbus.client import ModbusTcpClient
+    client = ModbusTcpClient(host=host, port=port)
+    return UnitClient(client, unit, 0.0, f"{host}:{port} unit {unit}")
+
+
+def connect_client(**kwargs):
+    """create_client() + connect(); raises ConnectionError on failure."""
+    client = create_client(**kwargs)
+    if not client.connect():
+        raise ConnectionError(f"Could not connect to {client.description}")
+    return client
+
+
+def add_transport_args(parser, default_host="192.168.0.100"):
+    """Add the common --host/--serial/--baud/--unit options to an argparse parser."""
+    parser.add_argument("--host", default=default_host, help="Inverter IP. Optionally specify as host:port")
+    parser.add_argument("--serial", default=None, help="Use Modbus RTU on this serial port (e.g. /dev/ttyUSB0)")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUDRATE, help="RTU baud rate")
+    parser.add_argument("--unit", type=int, default=DEFAULT_UNIT, help="Modbus unit (slave) id")
+
+
+def client_kwargs_from_args(args):
+    host, _, port = args.host.partition(":")
+    return {"host": host, "port": int(port or DEFAULT_TCP_PORT), "serial_port": args.serial,
+            "baudrate": args.baud, "unit": args.unit}
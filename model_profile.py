@@ -0,0 +1,85 @@
+# model_profile.py
+from register_map import read_block
+from register_utils import registers_to_ascii
+
+
+class ModelProfile:
+    """
+    Detected hardware profile: the model name (e.g. "X3") and the set of
+    capability tags it provides. Registers whose "requires" tags are not all
+    provided are pruned from polling and display. A profile with
+    capabilities=None is the unfiltered view used when detection fails.
+    """
+
+    def __init__(self, model=None, capabilities=None):
+        self.model = model
+        self.capabilities = frozenset(capabilities) if capabilities is not None else None
+
+    def describe(self):
+        if self.capabilities is None:
+            return "all registers"
+        model_tag = (self.model or "").lower()
+        extras = sorted(c for c in self.capabilities if c != model_tag)
+        label = self.model or "unknown model"
+        return f"{label} + {', '.join(extras)}" if extras else label
+
+
+FULL_PROFILE = ModelProfile()
+
+
+def _rule_matches(rule, raw_list):
+    if "contains" in rule:
+        return rule["contains"] in registers_to_ascii(raw_list)
+    if "startswith" in rule:
+        return registers_to_ascii(raw_list).startswith(rule["startswith"])
+    if "equals" in rule:
+        return raw_list[0] == rule["equals"]
+    if rule.get("nonzero"):
+        return any(raw_list)
+    return False
+
+
+def _read_rule_register(client, register_map, rule, cache):
+    table = register_map.table(rule["table"])
+    reg = table.lookup(rule["register"])
+    if reg is None:
+        return None
+    key = (table.name, reg["address"])
+    if key not in cache:
+        resp = read_block(client, table.function, reg["address"], reg["length"])
+        cache[key] = None if resp.isError() else resp.registers
+    return cache[key]
+
+
+def detect_capabilities(client, register_map, cache=None):
+    """Return the capability tags of every matching capability rule."""
+    cache = {} if cache is None else cache
+    capabilities = set()
+    for rule in register_map.profiles.get("capability_rules", ()):
+        raw_list = _read_rule_register(client, register_map, rule, cache)
+        if raw_list is not None and _rule_matches(rule, raw_list):
+            capabilities.add(rule["capability"])
+    return capabilities
+
+
+def detect_profile(client, register_map):
+    """
+    Detect the inverter model and optional hardware using the "profiles"
+    rules of the register map. Model rules are tried in order and the first
+    match wins; every matching capability rule adds its capability tag.
+    Returns FULL_PROFILE if no model rule matches.
+    """
+    cache = {}
+    for rule in register_map.profiles.get("model_rules", ()):
+        raw_list = _read_rule_register(client, register_map, rule, cache)
+        if raw_list is not None and _rule_matches(rule, raw_list):
+            return profile_for_model(register_map, rule["model"],
+                                     detect_capabilities(client, register_map, cache))
+    return FULL_PROFILE
+
+
+def profile_for_model(register_map, model, with_capabilities=()):
+    """Build the profile of a model, plus any optional capabilities."""
+    capabilities = set(register_map.profiles.get("models", {}).get(model, ()))
+    capabilities.update(with_capabilities)
+    return ModelProfile(model, capabilities)
@@ -0,0 +1,227 @@
+# parallel_system.py
+import re
+import time
+
+from register_map import ReadBlock, read_block, split_block
+from register_utils import decode_numeric, format_display_str
+
+# Units whose values add up across a parallel system; others are averaged.
+ADDITIVE_UNITS = ("W", "VA", "A")
+# Spread between units, in percent of their mean, flagged as an imbalance.
+DEFAULT_IMBALANCE_PERCENT = 15.0
+
+_UNIT_SUFFIX = re.compile(r"\s*\(slave\d+(?: data)?\)$")
+
+
+class Metric:
+    """One column of the matrix: a register at a fixed offset in every unit block."""
+
+    __slots__ = ("name", "offset", "reg", "aggregate")
+
+    def __init__(self, name, offset, reg, aggregate=None):
+        self.name = name
+        self.offset = offset
+        self.reg = reg
+        self.aggregate = aggregate      # matching "_All" register of the aggregate block, if any
+
+    @property
+    def additive(self):
+        return self.reg.get("unit", "") in ADDITIVE_UNITS
+
+    @property
+    def measured(self):
+        """A physical quantity (has a unit): gets a total and an imbalance check."""
+        return bool(self.reg.get("unit")) and self.reg.get("decoder") is None
+
+
+class ParallelSystemLayout:
+    """
+    Structure of the parallel table, from its "units" entry in the register map:
+
+      "units": {"count": "SystemInvNum", "count_offset": -1,
+                "aggregate": ["0x01DD", "0x0203"],
+                "first": "0x0204", "stride": 26, "max": 9}
+
+    The aggregate ("_All") block is one read. Slave n (1-based) starts at
+    first + (n-1)*stride and is one read of its metric words. The number of
+    slave blocks read is the count register plus count_offset (the master
+    counts itself), capped at max. The columns are the registers of the first
+    slave block without their "(slaveN)" suffix and reserved words.
+    """
+
+    def __init__(self, table, spec):
+        self.table = table
+        self.function = table.function
+        self.count_register = table.lookup(_ref(spec["count"]))
+        self.count_offset = spec.get("count_offset", 0)
+        first, last = (int(address, 0) for address in spec["aggregate"])
+        self.aggregate_block = ReadBlock(first, last - first + 1, tuple(table.registers_in_range(first, last)))
+        self.first = int(spec["first"], 0)
+        self.stride = spec["stride"]
+        self.max_units = spec["max"]
+
+        aggregates = {reg["description"]: reg for reg in self.aggregate_block.registers}
+        self.metrics = []
+        seen = set()
+        for reg in table.registers_in_range(self.first, self.first + self.stride - 1):
+            name = _UNIT_SUFFIX.sub("", reg["description"])
+            if name.startswith("Rev(") or reg["address"] in seen:
+                continue
+            seen.add(reg["address"])
+            self.metrics.append(Metric(name, reg["address"] - self.first, reg, aggregates.get(name + "_All")))
+        self.unit_words = max(m.offset + m.reg["length"] for m in self.metrics) if self.metrics else 0
+        self.unit_blocks = []
+        for unit in range(self.max_units):
+            start = self.first + unit * self.stride
+            self.unit_blocks.append(ReadBlock(start, self.unit_words,
+                                              tuple(table.registers_in_range(start, start + self.unit_words - 1))))
+
+    @classmethod
+    def from_table(cls, table):
+        """Layout of a table with a "units" entry, or None."""
+        spec = getattr(table, "units", None)
+        return cls(table, spec) if spec else None
+
+    def unit_count(self, aggregate_words):
+        """Number of slave blocks to read, from the aggregate block's count register."""
+        if aggregate_words is None or self.count_register is None:
+            return 0
+        offset = self.count_register["address"] - self.aggregate_block.start
+        count = aggregate_words[offset] + self.count_offset
+        return max(0, min(self.max_units, count))
+
+
+def _ref(ref):
+    return int(ref, 0) if ref.lower().startswith("0x") else ref
+
+
+class ParallelSystemReading:
+    """
+    One read of the parallel system:
+      - aggregate: words of the aggregate block, or None if the read failed
+      - units:     words of each slave block read, None for a failed read
+      - items:     (register, raw_list or None) for the table's registers, as
+                   for a snapshot (alarms, dashboard)
+    """
+
+    __slots__ = ("layout", "timestamp", "aggregate", "units", "items")
+
+    def __init__(self, layout, timestamp, aggregate, units, items):
+        self.layout = layout
+        self.timestamp = timestamp
+        self.aggregate = aggregate
+        self.units = units
+        self.items = items
+
+
+def read_parallel_system(client, layout, on_request=None):
+    """
+    Read the aggregate block, then one block per slave reported by the
+    count register: 1 + N requests for a system of N slaves.
+    on_request(block, seconds, error) is called after each request.
+    """
+    perf_counter = time.perf_counter
+    timestamp = time.time()
+    items = []
+
+    def read(block):
+        t0 = perf_counter()
+        resp = read_block(client, layout.function, block.start, block.count)
+        error = resp.isError()
+        if on_request is not None:
+            on_request(block, perf_counter() - t0, error)
+        if error:
+            items.extend((reg, None) for reg in block.registers)
+            return None
+        items.extend(split_block(block, resp.registers))
+        return list(resp.registers)
+
+    aggregate = read(layout.aggregate_block)
+    units = [read(block) for block in layout.unit_blocks[:layout.unit_count(aggregate)]]
+    return ParallelSystemReading(layout, timestamp, aggregate, units, items)
+
+
+def _metric_value(metric, words):
+    return decode_numeric(metric.reg, words[metric.offset:metric.offset + metric.reg["length"]])
+
+
+def _aggregate_value(layout, metric, words):
+    reg = metric.aggregate
+    if reg is None or words is None:
+        return None
+    offset = reg["address"] - layout.aggregate_block.start
+    return decode_numeric(reg, words[offset:offset + reg["length"]])
+
+
+def _format(metric, value):
+    if value is None:
+        return ""
+    return format_display_str(value, metric.reg.get("scale", 1.0), metric.reg.get("unit", ""))
+
+
+def _render(layout, metric, words):
+    raw_list = words[metric.offset:metric.offset + metric.reg["length"]]
+    decoder = metric.reg.get("decoder")
+    if decoder is not None:
+        return layout.table.decoders[decoder].render(raw_list)
+    return _format(metric, decode_numeric(metric.reg, raw_list))
+
+
+def matrix_rows(reading, imbalance_percent=DEFAULT_IMBALANCE_PERCENT):
+    """
+    Rows of the slaves x metrics matrix as (label, cells, flagged):
+
+      Master      aggregate minus the sum of the slaves (additive metrics)
+      Slave n     one row per slave block read ("no data" if it failed)
+      Total       aggregate value where there is one, else the column sum
+                  (additive) or mean (voltages, capacity)
+      Imbalance   spread (max - min) between units in percent of their mean;
+                  flagged when above imbalance_percent
+    """
+    layout = reading.layout
+    metrics = layout.metrics
+    rows = []
+    columns = [[] for _ in metrics]
+    for index, words in enumerate(reading.units):
+        if words is None:
+            rows.append((f"Slave {index + 1}", ["no data"] + [""] * (len(metrics) - 1), True))
+            continue
+        cells = [_render(layout, metric, words) for metric in metrics]
+        for column, metric in zip(columns, metrics):
+            if metric.measured:
+                column.append(_metric_value(metric, words))
+        rows.append((f"Slave {index + 1}", cells, False))
+
+    master_cells, total_cells, imbalance_cells = [], [], []
+    master_values = []
+    flagged = False
+    for column, metric in zip(columns, metrics):
+        aggregate = _aggregate_value(layout, metric, reading.aggregate)
+        master = aggregate - sum(column) if aggregate is not None and metric.additive else None
+        master_values.append(master)
+        master_cells.append(_format(metric, master))
+        if aggregate is not None:
+            total = aggregate
+        elif column:
+            total = sum(column) if metric.additive else sum(column) / len(column)
+        else:
+            total = None
+        total_cells.append(_format(metric, total))
+
+        units = column + ([master] if master is not None else [])
+        mean = sum(units) / len(units) if units else 0.0
+        if len(units) > 1 and abs(mean) > metric.reg.get("scale", 1.0):
+            spread = (max(units) - min(units)) / abs(mean) * 100.0
+            over = spread > imbalance_percent
+            flagged = flagged or over
+            imbalance_cells.append(f"{spread:.0f}%" + (" !" if over else ""))
+        else:
+            imbalance_cells.append("")
+
+    result = []
+    if any(value is not None for value in master_values):
+        result.append(("Master", master_cells, False))
+    result.extend(rows)
+    result.append(("Total", total_cells, False))
+    result.append(("Imbalance", imbalance_cells, flagged))
+    return result
@@ -0,0 +1,176 @@
+# perf_stats.py
+import io
+import json
+import time
+
+# Stage names used by the refresh cycle.
+STAGE_MODBUS = "modbus"      # One Modbus request round trip
+STAGE_DECODE = "decode"      # render_register for one register
+STAGE_TREE = "tree"          # Treeview update for one row
+STAGE_LOOP_LAG = "loop_lag"  # Tk event-loop lag (late timer callbacks)
+STAGE_WATCH = "watch"        # One Modbus request of the watch-list lane
+
+
+class StageTimer:
+    """Accumulates count, total, worst-case and last duration of one stage."""
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def as_dict(self):
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000.0,
+            "mean_ms": mean * 1000.0,
+            "max_ms": self.max * 1000.0,
+            "last_ms": self.last * 1000.0,
+        }
+
+
+class PerfStats:
+    """
+    Hot-path instrumentation for the refresh cycle.
+
+    Callers time their own work with time.perf_counter() and hand the
+    duration to add_sample(), which keeps the per-sample overhead to a dict
+    lookup and a few additions. A refresh cycle is bracketed by
+    begin_cycle()/end_cycle(); the last completed cycle drives the status bar.
+
+    An optional cProfile + tracemalloc capture can be armed at runtime; it
+    covers exactly the next cycle and its report is kept for export.
+
+    mark() records startup milestones (window shown, connected, first value
+    on screen) in seconds since the PerfStats was created.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.cycles = 0
+        self.total_requests = 0
+        self.total_registers = 0
+        self.total_errors = 0
+        self.last_cycle = None
+        self.last_profile = None
+        self._cycle_start = None
+        self._cycle_requests = 0
+        self._cycle_registers = 0
+        self._cycle_errors = 0
+        self._profile_armed = False
+        self._profiler = None
+        self.created = time.perf_counter()
+        self.milestones = {}
+
+    def add_sample(self, stage, seconds):
+        timer = self.stages.get(stage)
+        if timer is None:
+            timer = self.stages[stage] = StageTimer()
+        timer.add(seconds)
+
+    def count_request(self, registers, error=False):
+        self._cycle_requests += 1
+        if error:
+            self._cycle_errors += 1
+        else:
+            self._cycle_registers += registers
+
+    def mark(self, milestone):
+        """Record the first time a startup milestone is reached."""
+        if milestone not in self.milestones:
+            self.milestones[milestone] = time.perf_counter() - self.created
+
+    def arm_profile(self):
+        """Profile the next refresh cycle with cProfile and tracemalloc."""
+        self._profile_armed = True
+
+    def begin_cycle(self):
+        self._cycle_requests = 0
+        self._cycle_registers = 0
+        self._cycle_errors = 0
+        if self._profile_armed:
+            self._profile_armed = False
+            # Imported here: only needed when a capture is armed.
+            import cProfile
+            import tracemalloc
+            tracemalloc.start()
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._cycle_start = time.perf_counter()
+
+    def end_cycle(self):
+        if self._cycle_start is None:
+            return
+        elapsed = time.perf_counter() - self._cycle_start
+        self._cycle_start = None
+        if self._profiler is not None:
+            self._finish_profile(elapsed)
+
+        self.cycles += 1
+        self.total_requests += self._cycle_requests
+        self.total_registers += self._cycle_registers
+        self.total_errors += self._cycle_errors
+        per_sec = 1.0 / elapsed if elapsed > 0 else 0.0
+        self.last_cycle = {
+            "cycle_ms": elapsed * 1000.0,
+            "requests": self._cycle_requests,
+            "registers": self._cycle_registers,
+            "errors": self._cycle_errors,
+            "requests_per_s": self._cycle_requests * per_sec,
+            "registers_per_s": self._cycle_registers * per_sec,
+            "error_rate": self._cycle_errors / self._cycle_requests if self._cycle_requests else 0.0,
+        }
+
+    def _finish_profile(self, elapsed):
+        import pstats
+        import tracemalloc
+        self._profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(25)
+        self._profiler = None
+        self.last_profile = {
+            "cycle_ms": elapsed * 1000.0,
+            "cprofile": out.getvalue(),
+            "tracemalloc_current_bytes": current,
+            "tracemalloc_peak_bytes": peak,
+            "tracemalloc_top": [str(stat) for stat in snapshot.statistics("lineno")[:15]],
+        }
+
+    def status_text(self):
+        c = self.last_cycle
+        if c is None:
+            return "No refresh cycle completed yet"
+        lag = self.stages.get(STAGE_LOOP_LAG)
+        lag_ms = lag.last * 1000.0 if lag else 0.0
+        return (f"Cycle {c['cycle_ms']:.0f} ms | {c['requests_per_s']:.1f} req/s | "
+                f"{c['registers_per_s']:.0f} reg/s | errors {c['error_rate'] * 100:.1f}% | "
+                f"loop lag {lag_ms:.0f} ms")
+
+    def as_dict(self):
+        return {
+            "cycles": self.cycles,
+            "total_requests": self.total_requests,
+            "total_registers": self.total_registers,
+            "total_errors": self.total_errors,
+            "last_cycle": self.last_cycle,
+            "stages": {name: timer.as_dict() for name, timer in self.stages.items()},
+            "startup_s": self.milestones,
+            "profile": self.last_profile,
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.as_dict(), indent=indent)
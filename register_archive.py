@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Compact long-term archive of raw register words.
+
+Records are the same {(bank, address): raw_list or None} snapshots the
+poller publishes to shared memory (see modbus_poller.py --archive), one per
+polling cycle. They are stored in chunks of up to `keyframe_interval`
+records. Each chunk is self-contained and column oriented:
+
+  timestamps  first in milliseconds, then zigzag varint deltas
+  status      per register slot, run-length encoded (status, run) varints
+              (0 = no value, 1 = valid, 2 = read error)
+  words       per word, the first value as a varint (the keyframe), then
+              zigzag varint deltas; a word without a valid value repeats
+              the previous one. A zero delta is followed by the number of
+              further zero deltas, so a word that did not change for the
+              whole chunk takes a few bytes
+
+The slot layout is the one shared_snapshot.py uses for the register map,
+stored in the file header, so archives can be read without the map. Closing
+the writer appends an index of chunk start times; a reader bisects it to
+seek by time and then decodes a single chunk. Archives without an index
+(e.g. after a crash) are indexed by skipping from chunk header to chunk
+header. Reopening an archive for writing appends to it.
+
+  register_archive.py info FILE
+  register_archive.py dump FILE [--from TIME] [--to TIME] [--register REF ...]
+"""
+import argparse
+import bisect
+import csv
+import os
+import struct
+import sys
+import time
+from datetime import datetime
+
+from register_map import load_register_map
+from register_utils import load_definitions
+from shared_snapshot import SnapshotLayout, STATUS_EMPTY, STATUS_ERROR, STATUS_VALID
+
+MAGIC = b"SLXA"
+FORMAT_VERSION = 1
+DEFAULT_KEYFRAME_INTERVAL = 300     # records per chunk: 5 minutes at 1 Hz
+
+_BANKS = ("holding", "input")
+_HEADER = struct.Struct("<4sH8sII")            # magic, version, fingerprint, slot count, keyframe interval
+_SLOT = struct.Struct("<BHH")                  # bank, address, length
+_CHUNK = struct.Struct("<4sIddI")              # magic, records, first/last timestamp, payload bytes
+_CHUNK_MAGIC = b"CHNK"
+_INDEX_ENTRY = struct.Struct("<ddQI")          # first/last timestamp, offset, records
+_TRAILER = struct.Struct("<4sQI")              # magic, index offset, entries
+_TRAILER_MAGIC = b"SLXI"
+
+
+def _put_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _encode_deltas(out, column):
+    """First value as a varint, then zigzag varint deltas with zero runs."""
+    previous = column[0]
+    _put_varint(out, previous)
+    append = out.append
+    zeros = -1
+    for value in column[1:]:
+        delta = value - previous
+        previous = value
+        if delta == 0:
+            zeros += 1
+            continue
+        if zeros >= 0:
+            append(0)
+            _put_varint(out, zeros)
+            zeros = -1
+        value_zz = delta << 1 if delta > 0 else (-delta << 1) - 1
+        while value_zz > 0x7F:
+            append((value_zz & 0x7F) | 0x80)
+            value_zz >>= 7
+        append(value_zz)
+    if zeros >= 0:
+        append(0)
+        _put_varint(out, zeros)
+
+
+def _decode_deltas(buf, pos, count):
+    """Inverse of _encode_deltas; returns (values, new position)."""
+    first, pos = _read_varint(buf, pos)
+    values = [first]
+    append = values.append
+    current = first
+    while len(values) < count:
+        byte = buf[pos]
+        pos += 1
+        if byte < 0x80:
+            raw = byte
+        else:
+            raw = byte & 0x7F
+            shift = 7
+            while True:
+                byte = buf[pos]
+                pos += 1
+                raw |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+        if raw:
+            current += (raw >> 1) if not raw & 1 else -((raw + 1) >> 1)
+            append(current)
+        else:
+            run, pos = _read_varint(buf, pos)
+            values.extend([current] * (run + 1))
+    return values, pos
+
+
+def _encode_runs(out, column):
+    """Run-length encoding as (value, run length) varint pairs."""
+    value = column[0]
+    run = 0
+    for item in column:
+        if item == value:
+            run += 1
+            continue
+        _put_varint(out, value)
+        _put_varint(out, run)
+        value, run = item, 1
+    _put_varint(out, value)
+    _put_varint(out, run)
+
+
+def _decode_runs(buf, pos, count):
+    values = []
+    while len(values) < count:
+        value, pos = _read_varint(buf, pos)
+        run, pos = _read_varint(buf, pos)
+        values.extend([value] * run)
+    return values, pos
+
+
+class ArchiveLayout:
+    """Register slots of an archive: (bank, address) keys, lengths and word offsets."""
+
+    def __init__(self, keys, lengths, fingerprint):
+        self.keys = list(keys)
+        self.slot_length = list(lengths)
+        self.slot_index = {key: index for index, key in enumerate(self.keys)}
+        self.slot_offset = []
+        offset = 0
+        for length in self.slot_length:
+            self.slot_offset.append(offset)
+            offset += length
+        self.slot_count = len(self.keys)
+        self.word_count = offset
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_register_map(cls, register_map):
+        layout = SnapshotLayout(register_map)
+        return cls(layout.keys, layout.slot_length, layout.fingerprint)
+
+
+class ArchiveRecord:
+    """One archived snapshot."""
+
+    __slots__ = ("layout", "timestamp", "status", "words")
+
+    def __init__(self, layout, timestamp, status, words):
+        self.layout = layout
+        self.timestamp = timestamp
+        self.status = status
+        self.words = words
+
+    def get(self, bank, address):
+        """Raw words of the register at (bank, address), or None if not valid."""
+        index = self.layout.slot_index.get((bank, address))
+        if index is None or self.status[index] != STATUS_VALID:
+            return None
+        offset = self.layout.slot_offset[index]
+        return self.words[offset:offset + self.layout.slot_length[index]]
+
+    def values(self):
+        """{(bank, address): raw_list or None} for every slot that was recorded."""
+        layout = self.layout
+        result = {}
+        for index, key in enumerate(layout.keys):
+            status = self.status[index]
+            if status == STATUS_VALID:
+                offset = layout.slot_offset[index]
+                result[key] = self.words[offset:offset + layout.slot_length[index]]
+            elif status == STATUS_ERROR:
+                result[key] = None
+        return result
+
+
+def _read_header(f):
+    data = f.read(_HEADER.size)
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a register archive (file too short)")
+    magic, version, fingerprint, slot_count, keyframe_interval = _HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Not a register archive")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported register archive version {version}")
+    keys, lengths = [], []
+    slots = f.read(_SLOT.size * slot_count)
+    for bank, address, length in _SLOT.iter_unpack(slots):
+        keys.append((_BANKS[bank], address))
+        lengths.append(length)
+    return ArchiveLayout(keys, lengths, fingerprint), keyframe_interval
+
+
+def _read_index(f, data_start):
+    """
+    Chunk index as a list of (first timestamp, last timestamp, offset,
+    records) plus the offset where chunk data ends.
+    """
+    size = f.seek(0, os.SEEK_END)
+    if size >= data_start + _TRAILER.size:
+        f.seek(size - _TRAILER.size)
+        magic, offset, entries = _TRAILER.unpack(f.read(_TRAILER.size))
+        if magic == _TRAILER_MAGIC and offset + entries * _INDEX_ENTRY.size + _TRAILER.size == size:
+            f.seek(offset)
+            return list(_INDEX_ENTRY.iter_unpack(f.read(entries * _INDEX_ENTRY.size))), offset
+    # No index: walk the chunk headers.
+    index = []
+    offset = data_start
+    while offset + _CHUNK.size <= size:
+        f.seek(offset)
+        magic, records, first, last, length = _CHUNK.unpack(f.read(_CHUNK.size))
+        if magic != _CHUNK_MAGIC or offset + _CHUNK.size + length > size:
+            break       # torn chunk at the end
+        index.append((first, last, offset, records))
+        offset += _CHUNK.size + length
+    return index, offset
+
+
+class ArchiveWriter:
+    """
+    Appends snapshots to an archive file. append() buffers records and
+    writes a chunk every `keyframe_interval` records; close() writes the
+    last partial chunk and the index.
+    """
+
+    def __init__(self, path, register_map=None, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        self.path = path
+        self.layout = ArchiveLayout.from_register_map(register_map or load_register_map())
+        self.keyframe_interval = keyframe_interval
+        self.index = []
+        self.records = 0
+        self._timestamps = []
+        self._status = []
+        self._words = []
+        self._last_words = [0] * self.layout.word_count
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.f = open(path, "r+b")
+            layout, self.keyframe_interval = _read_header(self.f)
+            if layout.fingerprint != self.layout.fingerprint:
+                self.f.close()
+                raise ValueError(f"{path} was written for a different register map")
+            self.index, end = _read_index(self.f, self.f.tell())
+            self.records = sum(entry[3] for entry in self.index)
+            self.f.seek(end)
+            self.f.truncate()
+        else:
+            self.f = open(path, "w+b")
+            layout = self.layout
+            self.f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, layout.fingerprint, layout.slot_count,
+                                      keyframe_interval))
+            for (bank, address), length in zip(layout.keys, layout.slot_length):
+                self.f.write(_SLOT.pack(_BANKS.index(bank), address, length))
+
+    def append(self, values, timestamp=None):
+        """Add one snapshot: values is {(bank, address): raw_list or None}."""
+        layout = self.layout
+        status = [STATUS_EMPTY] * layout.slot_count
+        words = self._last_words[:]
+        slot_index = layout.slot_index
+        for key, raw_list in values.items():
+            index = slot_index.get(key)
+            if index is None:
+                continue
+            if raw_list is None:
+                status[index] = STATUS_ERROR
+                continue
+            offset = layout.slot_offset[index]
+            count = min(len(raw_list), layout.slot_length[index])
+            words[offset:offset + count] = raw_list[:count]
+            status[index] = STATUS_VALID
+        self._timestamps.append(time.time() if timestamp is None else timestamp)
+        self._status.append(status)
+        self._words.append(words)
+        self._last_words = words
+        self.records += 1
+        if len(self._timestamps) >= self.keyframe_interval:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records as one chunk."""
+        if not self._timestamps:
+            return
+        payload = bytearray()
+        timestamps = self._timestamps
+        _encode_deltas(payload, [round(t * 1000) for t in timestamps])
+        for column in zip(*self._status):
+            _encode_runs(payload, column)
+        for column in zip(*self._words):
+            _encode_deltas(payload, column)
+        offset = self.f.tell()
+        self.f.write(_CHUNK.pack(_CHUNK_MAGIC, len(timestamps), timestamps[0], timestamps[-1], len(payload)))
+        self.f.write(payload)
+        self.f.flush()
+        self.index.append((timestamps[0], timestamps[-1], offset, len(timestamps)))
+        self._timestamps = []
+        self._status = []
+        self._words = []
+
+    def close(self):
+        self.flush()
+        offset = self.f.tell()
+        for entry in self.index:
+            self.f.write(_INDEX_ENTRY.pack(*entry))
+        self.f.write(_TRAILER.pack(_TRAILER_MAGIC, offset, len(self.index)))
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArchiveReader:
+    """Random access by time and streaming decode of an archive file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, "rb")
+        self.layout, self.keyframe_interval = _read_header(self.f)
+        self.index, _ = _read_index(self.f, self.f.tell())
+        self._starts = [entry[0] for entry in self.index]
+
+    def __len__(self):
+        return sum(entry[3] for entry in self.index)
+
+    @property
+    def start_time(self):
+        return self.index[0][0] if self.index else None
+
+    @property
+    def end_time(self):
+        return self.index[-1][1] if self.index else None
+
+    def _decode_chunk(self, entry):
+        _, _, offset, records = entry
+        self.f.seek(offset)
+        magic, records, _, _, length = _CHUNK.unpack(self.f.read(_CHUNK.size))
+        buf = self.f.read(length)
+        timestamps, pos = _decode_deltas(buf, 0, records)
+        status_columns = []
+        for _ in range(self.layout.slot_count):
+            column, pos = _decode_runs(buf, pos, records)
+            status_columns.append(column)
+        word_columns = []
+        for _ in range(self.layout.word_count):
+            column, pos = _decode_deltas(buf, pos, records)
+            word_columns.append(column)
+        return ([t / 1000.0 for t in timestamps],
+                list(zip(*status_columns)) if status_columns else [()] * records,
+                list(zip(*word_columns)) if word_columns else [()] * records)
+
+    def records(self, start=None, end=None):
+        """
+        Yield ArchiveRecords with start <= timestamp <= end in time order,
+        decoding one chunk at a time. The first chunk is found by bisection.
+        """
+        first = 0
+        if start is not None:
+            first = max(0, bisect.bisect_right(self._starts, start) - 1)
+        layout = self.layout
+        for entry in self.index[first:]:
+            if end is not None and entry[0] > end:
+                return
+            if start is not None and entry[1] < start:
+                continue
+            timestamps, status_rows, word_rows = self._decode_chunk(entry)
+            for timestamp, status, words in zip(timestamps, status_rows, word_rows):
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp > end:
+                    return
+                yield ArchiveRecord(layout, timestamp, status, list(words))
+
+    def seek(self, timestamp):
+        """The first record at or after timestamp, or None."""
+        return next(self.records(start=timestamp), None)
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def render_records(reader, register_map=None, start=None, end=None, registers=None):
+    """
+    Stream archived values through the register definitions' render_register.
+    Yields (timestamp, table name, register, display string) for every valid
+    value; `registers` optionally limits output to [(table name, register)].
+    """
+    register_map = register_map or load_register_map()
+    defs = load_definitions(register_map)
+    if registers is None:
+        registers = [(name, reg) for name, d in defs.items() for reg in d.table.registers]
+    selected = [(name, reg, defs[name], (defs[name].table.function, reg["address"])) for name, reg in registers]
+    for record in reader.records(start, end):
+        for name, reg, d, key in selected:
+            raw_list = record.get(*key)
+            if raw_list is not None:
+                yield record.timestamp, name, reg, d.render_register(reg, raw_list[:reg["length"]])
+
+
+def _parse_time(text):
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def _resolve_registers(register_map, refs):
+    selected = []
+    for ref in refs:
+        table_name, _, name = ref.rpartition(":")
+        tables = [register_map.tables[table_name]] if table_name else register_map.tables.values()
+        for table in tables:
+            reg = table.lookup(int(name, 0)) if name.lower().startswith("0x") else table.lookup(name)
+            if reg is not None:
+                selected.append((table.name, reg))
+                break
+        else:
+            raise SystemExit(f"Unknown register: {ref}")
+    return selected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect a raw register archive.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Show archive size, time range and chunk count")
+    info.add_argument("file")
+    dump = sub.add_parser("dump", help="Print rendered values as CSV")
+    dump.add_argument("file")
+    dump.add_argument("--from", dest="start", type=_parse_time, default=None,
+                      help="Start time (epoch seconds or ISO 8601)")
+    dump.add_argument("--to", dest="end", type=_parse_time, default=None,
+                      help="End time (epoch seconds or ISO 8601)")
+    dump.add_argument("--register", action="append", default=[], metavar="REF",
+                      help="Register description or 0x address, optionally table:REF (repeatable)")
+    dump.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    args = parser.parse_args(argv)
+
+    with ArchiveReader(args.file) as reader:
+        if args.command == "info":
+            layout = reader.layout
+            print(f"{args.file}: {os.path.getsize(args.file)} bytes, {len(reader)} records in "
+                  f"{len(reader.index)} chunks, {layout.slot_count} registers / {layout.word_count} words")
+            if reader.index:
+                print(f"  {datetime.fromtimestamp(reader.start_time).isoformat()} .. "
+                      f"{datetime.fromtimestamp(reader.end_time).isoformat()}")
+            return 0
+        register_map = load_register_map(args.register_map)
+        if reader.layout.fingerprint != ArchiveLayout.from_register_map(register_map).fingerprint:
+            print("warning: archive was written for a different register map", file=sys.stderr)
+        registers = _resolve_registers(register_map, args.register) if args.register else None
+        writer = csv.writer(sys.stdout)
+        writer.writerow(("timestamp", "table", "address", "description", "value"))
+        for timestamp, name, reg, text in render_records(reader, register_map, args.start, args.end, registers):
+            writer.writerow((datetime.fromtimestamp(timestamp).isoformat(), name, f"0x{reg['address']:04X}",
+                             reg["description"], text))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,500 @@
+# register_map.py
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+from value_decoders import EnumDecoder, FlagsDecoder
+
+REGISTER_MAP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "register_maps")
+DEFAULT_REGISTER_MAP = os.path.join(REGISTER_MAP_DIR, "solax_x_hybrid_g3.json")
+
+# Compiled indexes are cached next to the source file, keyed by its mtime and
+# size and those of its plan file.
+CACHE_DIR_NAME = "__cache__"
+INDEX_FORMAT_VERSION = 8
+
+# Modbus allows 125 registers per read; stay below that for the WiFi dongle.
+MAX_BLOCK_REGISTERS = 100
+
+# For optimize_plan(): a request costs as much bus time as reading this many
+# registers. Modbus TCP through the WiFi/LAN dongle is dominated by the
+# per-request round trip, and an RTU request at 9600 baud costs about as
+# much as 25 registers of payload plus the turnaround.
+DEFAULT_REQUEST_COST = 50.0
+
+# One Modbus read request covering `count` registers from `start`, and the
+# register definitions whose values are sliced out of the response.
+ReadBlock = namedtuple("ReadBlock", "start count registers")
+
+
+# Precomputed read plans (register_map_lint.py plan --write) live next to the
+# map file as <map>.plan.json and are used only while the map is unchanged.
+PLAN_SUFFIX = ".plan.json"
+
+logger = logging.getLogger("register_map")
+
+# {Description}, {0x00C4} or {Other derived name} references inside a
+# derived-metric expression (see derived_metrics.py)
+_REF_PATTERN = re.compile(r"\{([^{}]+)\}")
+
+# Reserved words ("REV", "REV (0x0019)", "Rev(0x021A)"): defined, but carry no data
+_RESERVED = re.compile(r"(?i)^(rev|reserved)\b")
+
+
+def is_reserved(reg):
+    return bool(_RESERVED.match(reg["description"]))
+
+
+def read_units(registers, groups):
+    """
+    Collapse registers into units that must be read in one request: the
+    members of each group plus everything lying inside the group's span.
+    Yields (start, end, registers) sorted by start.
+    """
+    group_of = {}
+    spans = []
+    for addresses in groups:
+        wanted = set(addresses)
+        members = [reg for reg in registers if reg["address"] in wanted]
+        if members:
+            for reg in members:
+                group_of.setdefault(reg["address"], len(spans))
+            spans.append((min(r["address"] for r in members), max(r["address"] + r["length"] for r in members)))
+    units = []
+    for reg in sorted(registers, key=lambda r: r["address"]):
+        start = reg["address"]
+        end = start + reg["length"]
+        if reg["address"] in group_of:
+            start, end = spans[group_of[reg["address"]]]
+            start = min(start, reg["address"])
+            end = max(end, reg["address"] + reg["length"])
+        units.append((start, end, reg))
+    units.sort(key=lambda u: (u[0], u[2]["address"]))
+    merged = []
+    for start, end, reg in units:
+        if merged and start < merged[-1][1]:
+            last = merged[-1]
+            last[1] = max(last[1], end)
+            last[2].append(reg)
+        else:
+            merged.append([start, end, [reg]])
+    for start, end, members in merged:
+        members.sort(key=lambda r: r["address"])
+        yield start, end, members
+
+
+def plan_reads(registers, max_block=MAX_BLOCK_REGISTERS, max_gap=0, groups=()):
+    """
+    Merge register definitions into as few block reads as possible.
+    Registers are never split across blocks; neighbours are merged when the
+    hole between them is at most `max_gap` registers and the block stays
+    within `max_block` registers. `groups` lists tuples of start addresses
+    that must come from the same request (e.g. LSB/MSB halves of a counter)
+    so their values are always sampled together.
+    """
+    blocks = []
+    members = []
+    start = end = 0
+    for unit_start, unit_end, unit_members in read_units(registers, groups):
+        if unit_end - unit_start > max_block:
+            raise ValueError(f"Register group at 0x{unit_start:04X} spans {unit_end - unit_start} registers, "
+                             f"more than one read of {max_block}")
+        if members and unit_start - end <= max_gap and max(end, unit_end) - start <= max_block:
+            members.extend(unit_members)
+            end = max(end, unit_end)
+            continue
+        if members:
+            blocks.append(ReadBlock(start, end - start, tuple(members)))
+        start, end, members = unit_start, unit_end, list(unit_members)
+    if members:
+        blocks.append(ReadBlock(start, end - start, tuple(members)))
+    return blocks
+
+
+def optimize_plan(registers, required, groups=(), max_block=MAX_BLOCK_REGISTERS, max_gap=0,
+                  request_cost=DEFAULT_REQUEST_COST, word_cost=1.0):
+    """
+    Cheapest set of block reads covering the `required` registers, by
+    dynamic programming over them in address order, where a plan costs
+        requests * request_cost + registers read * word_cost
+    Groups stay in one request. A block never exceeds `max_block` registers
+    nor bridges more than `max_gap` addresses that no definition in
+    `registers` covers (the inverter rejects reads of those); other defined
+    registers are read in between where that saves a request. Each block
+    lists every register of `registers` inside it.
+    """
+    units = [(start, end) for start, end, _ in read_units(required, groups)]
+    if not units:
+        return []
+    defined = {reg["address"] + offset for reg in registers for offset in range(reg["length"])}
+
+    # Longest run of undefined addresses between unit k-1 and unit k
+    undefined_before = [0]
+    for (_, prev_end), (start, _) in zip(units, units[1:]):
+        run = longest = 0
+        for word in range(prev_end, start):
+            run = run + 1 if word not in defined else 0
+            longest = max(longest, run)
+        undefined_before.append(longest)
+
+    # best[i]: (cost, wasted words) of reading units[:i]; first[i]: first unit of the last block
+    best = [(0.0, 0)] + [None] * len(units)
+    first = [0] * (len(units) + 1)
+    required_words = [end - start for start, end in units]
+    for i in range(1, len(units) + 1):
+        end = units[i - 1][1]
+        wanted = 0
+        for j in range(i - 1, -1, -1):
+            start = units[j][0]
+            if end - start > max_block:
+                break
+            wanted += required_words[j]
+            cost = best[j][0] + request_cost + (end - start) * word_cost
+            candidate = (cost, best[j][1] + (end - start) - wanted)
+            if best[i] is None or candidate < best[i]:
+                best[i] = candidate
+                first[i] = j
+            if undefined_before[j] > max_gap:
+                break
+        if best[i] is None:
+            raise ValueError(f"Registers at 0x{units[i - 1][0]:04X} do not fit in one read of {max_block}")
+
+    spans = []
+    i = len(units)
+    while i > 0:
+        j = first[i]
+        spans.append((units[j][0], units[i - 1][1] - units[j][0]))
+        i = j
+    spans.reverse()
+    return blocks_from_spans(registers, spans)
+
+
+def restrict_plan(read_plan, keep):
+    """
+    Filter an existing read plan down to the registers for which keep(reg) is
+    true, shrinking each block to the span of what is left. Blocks never grow
+    or split, so the number of requests can only go down.
+    """
+    blocks = []
+    for block in read_plan:
+        members = tuple(reg for reg in block.registers if keep(reg))
+        if not members:
+            continue
+        start = min(reg["address"] for reg in members)
+        end = max(reg["address"] + reg["length"] for reg in members)
+        blocks.append(ReadBlock(start, end - start, members))
+    return blocks
+
+
+def blocks_from_spans(registers, spans):
+    """
+    Build a read plan from (start, count) spans: each block gets the
+    registers lying entirely inside its span. Raises ValueError if a span
+    cuts through a register.
+    """
+    ordered = sorted(registers, key=lambda r: r["address"])
+    blocks = []
+    for start, count in spans:
+        end = start + count
+        members = []
+        for reg in ordered:
+            reg_end = reg["address"] + reg["length"]
+            if reg["address"] >= end or reg_end <= start:
+                continue
+            if reg["address"] < start or reg_end > end:
+                raise ValueError(f"Block 0x{start:04X}+{count} splits register 0x{reg['address']:04X}")
+            members.append(reg)
+        blocks.append(ReadBlock(start, count, tuple(members)))
+    return blocks
+
+
+def plan_path(source_path):
+    return os.path.splitext(source_path)[0] + PLAN_SUFFIX
+
+
+def _load_plan_spans(source_path, digest):
+    """{table name: [(start, count)]} from the map's plan file, or None if absent or stale."""
+    path = plan_path(source_path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring read plan %s: %s", path, e)
+        return None
+    if data.get("source_sha256") != digest:
+        logger.warning("Ignoring read plan %s: the register map changed since it was computed "
+                       "(rerun register_map_lint.py plan --write)", path)
+        return None
+    return {name: [(int(start, 0), count) for start, count in spans] for name, spans in data["tables"].items()}
+
+
+def split_block(block, words):
+    """Yield (register, raw_list) for every register covered by a block read."""
+    start = block.start
+    for reg in block.registers:
+        offset = reg["address"] - start
+        yield reg, words[offset:offset + reg["length"]]
+
+
+def read_block(client, function, start, count):
+    """Issue one Modbus read for a block using the table's function code."""
+    if function == "holding":
+        return client.read_holding_registers(address=start, count=count)
+    return client.read_input_registers(address=start, count=count)
+
+
+class RegisterTable:
+    """
+    Compiled view of one register table (holding, input, self-test, parallel):
+      - registers:  definitions in display order
+      - addresses:  sorted start addresses (array of uint16)
+      - by_address: start address -> definition (first one wins on duplicates)
+      - by_name:    description -> definition (first one wins on duplicates)
+      - read_plan:  list of ReadBlock, from the map's plan file if there is
+                    a current one, else computed with plan_reads()
+      - derived:    derived-metric definitions (see derived_metrics.py)
+      - decoders:   enum/flags decoders by name; a register refers to one with
+                    its "decoder" key (set from "enum"/"flags" in the source)
+      - groups:     (name, start addresses) of registers that are always read
+                    in one request, so their values come from the same moment
+      - statistics: registers to keep rolling statistics for (see streaming_stats.py)
+      - units:      block layout of a parallel system's per-unit registers
+                    (see parallel_system.py), or None
+    Registers may carry a "requires" list of capability tags (e.g. "x3",
+    "meter2"); subset() returns the table pruned to a set of capabilities.
+    """
+
+    def __init__(self, name, function, registers, read_plan=None, derived=(), decoders=None, groups=(),
+                 statistics=(), units=None):
+        self.name = name
+        self.function = function
+        self.registers = registers
+        self.derived = list(derived)
+        self.decoders = decoders if decoders is not None else {}
+        self.groups = list(groups)
+        self.statistics = list(statistics)
+        self.units = units
+        self.addresses = array("H", sorted(reg["address"] for reg in registers))
+        self.by_address = {}
+        self.by_name = {}
+        for reg in registers:
+            self.by_address.setdefault(reg["address"], reg)
+            self.by_name.setdefault(reg["description"], reg)
+        if read_plan is None:
+            read_plan = plan_reads(registers, groups=[addresses for _, addresses in self.groups])
+        self.read_plan = read_plan
+        self._subsets = {}
+
+    def lookup(self, key):
+        """Find a register by start address (int) or description (str)."""
+        if isinstance(key, int):
+            return self.by_address.get(key)
+        return self.by_name.get(key)
+
+    def subset(self, capabilities):
+        """
+        Return a table holding only the registers whose "requires" tags are all
+        in `capabilities`. Its read plan is derived from this table's plan so
+        pruned registers never split a block. None keeps every register.
+        """
+        if capabilities is None:
+            return self
+        key = frozenset(capabilities)
+        table = self._subsets.get(key)
+        if table is None:
+            def keep(reg):
+                return key.issuperset(reg.get("requires", ()))
+            registers = [reg for reg in self.registers if keep(reg)]
+            table = self._subsets[key] = RegisterTable(self.name, self.function, registers,
+                                                       restrict_plan(self.read_plan, keep), self.derived,
+                                                       self.decoders, self.groups, self.statistics,
+                                                       self.units)
+        return table
+
+    def registers_in_range(self, first, last):
+        """Return the definitions whose start address lies in [first, last]."""
+        lo = bisect_left(self.addresses, first)
+        hi = bisect_left(self.addresses, last + 1)
+        wanted = set(self.addresses[lo:hi])
+        return [reg for reg in self.registers if reg["address"] in wanted]
+
+
+class RegisterMap:
+    """All register tables for one inverter model/firmware."""
+
+    def __init__(self, source_path, model, firmware, tables, profiles=None):
+        self.source_path = source_path
+        self.model = model
+        self.firmware = firmware
+        self.tables = tables
+        self.profiles = profiles or {}
+
+    def table(self, name):
+        return self.tables[name]
+
+
+def _compile_register(entry, decoders):
+    reg = dict(entry)
+    reg["address"] = int(entry["address"], 0) if isinstance(entry["address"], str) else entry["address"]
+    reg.setdefault("length", 1)
+    decoder = reg.pop("enum", None) or reg.pop("flags", None)
+    bit_offset = reg.pop("bit_offset", 0)
+    if decoder is not None:
+        if decoder not in decoders:
+            raise ValueError(f"0x{reg['address']:04X} {reg['description']}: unknown decoder {decoder!r}")
+        if isinstance(decoders[decoder], FlagsDecoder):
+            # One decoder per register size and bit offset, sharing the bit names
+            width = 16 * reg["length"]
+            if width != 16 or bit_offset:
+                variant = f"{decoder}@{bit_offset}:{width}"
+                if variant not in decoders:
+                    decoders[variant] = decoders[decoder].variant(width, bit_offset)
+                decoder = variant
+        reg["decoder"] = decoder
+    return reg
+
+
+def _compile_groups(table, registers):
+    """
+    Groups of registers to read in one request:
+      - explicit "groups" entries: {"name": ..., "registers": [description or "0x...."]}
+      - LSB/MSB halves, paired by description ("X.LSB"/"X.MSB", "X LSB"/"X MSB")
+      - the register inputs of each derived metric
+    """
+    by_name = {}
+    for reg in registers:
+        by_name.setdefault(reg["description"], reg["address"])
+
+    def resolve(ref):
+        if ref.lower().startswith("0x"):
+            return int(ref, 0)
+        return by_name.get(ref)
+
+    groups = []
+    for entry in table.get("groups", ()):
+        addresses = [resolve(ref) for ref in entry["registers"]]
+        if None in addresses:
+            missing = entry["registers"][addresses.index(None)]
+            raise ValueError(f"Group {entry['name']!r}: unknown register {missing!r}")
+        groups.append((entry["name"], tuple(addresses)))
+
+    for description, address in by_name.items():
+        for sep in (".", " "):
+            if description.endswith(sep + "LSB"):
+                stem = description[:-3]
+                if stem + "MSB" in by_name:
+                    groups.append((stem.rstrip(". "), (address, by_name[stem + "MSB"])))
+
+    derived = {entry["name"]: entry for entry in table.get("derived", ())}
+
+    def derived_inputs(entry, seen=()):
+        for ref in _REF_PATTERN.findall(entry["expression"]):
+            ref = ref.strip()
+            if ref in derived and ref not in seen:
+                yield from derived_inputs(derived[ref], seen + (ref,))
+            else:
+                address = resolve(ref)
+                if address is not None:
+                    yield address
+
+    for name, entry in derived.items():
+        addresses = tuple(sorted(set(derived_inputs(entry))))
+        if len(addresses) > 1:
+            groups.append((name, addresses))
+    return groups
+
+
+def compile_register_map(source_path):
+    """Parse a declarative register map file and build all indexes."""
+    with open(source_path, "rb") as f:
+        source = f.read()
+    data = json.loads(source)
+    plans = _load_plan_spans(source_path, hashlib.sha256(source).hexdigest()) or {}
+    decoders = {}
+    for name, values in data.get("enums", {}).items():
+        decoders[name] = EnumDecoder(name, values)
+    for name, bits in data.get("flags", {}).items():
+        decoders[name] = FlagsDecoder(name, bits)
+    tables = {}
+    for name, table in data["tables"].items():
+        registers = [_compile_register(entry, decoders) for entry in table["registers"]]
+        read_plan = None
+        if name in plans:
+            try:
+                read_plan = blocks_from_spans(registers, plans[name])
+            except ValueError as e:
+                logger.warning("Ignoring read plan for %s: %s", name, e)
+        tables[name] = RegisterTable(name, table.get("function", "input"), registers, read_plan,
+                                     derived=table.get("derived", ()), decoders=decoders,
+                                     groups=_compile_groups(table, registers),
+                                     statistics=table.get("statistics", ()),
+                                     units=table.get("units"))
+    return RegisterMap(source_path, data.get("model", ""), data.get("firmware", ""), tables,
+                       data.get("profiles"))
+
+
+def _cache_path(source_path):
+    directory, filename = os.path.split(os.path.abspath(source_path))
+    return os.path.join(directory, CACHE_DIR_NAME, os.path.splitext(filename)[0] + ".idx")
+
+
+def _cache_key(source_path):
+    st = os.stat(source_path)
+    try:
+        plan_st = os.stat(plan_path(source_path))
+        plan_key = (plan_st.st_mtime_ns, plan_st.st_size)
+    except OSError:
+        plan_key = None
+    return (INDEX_FORMAT_VERSION, st.st_mtime_ns, st.st_size, plan_key)
+
+
+def _load_cached(source_path, key):
+    try:
+        with open(_cache_path(source_path), "rb") as f:
+            cached_key, register_map = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    return register_map if cached_key == key else None
+
+
+def _store_cached(source_path, key, register_map):
+    path = _cache_path(source_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, register_map), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only install just recompiles on every start.
+        pass
+
+
+_loaded_maps = {}
+
+
+def load_register_map(source_path=None):
+    """
+    Return the compiled register map for `source_path` (default: the bundled
+    Solax G3 map). The compiled index is shared per process and cached on disk,
+    so recompilation only happens when the source file changes.
+    """
+    source_path = os.path.abspath(source_path or DEFAULT_REGISTER_MAP)
+    key = _cache_key(source_path)
+    loaded = _loaded_maps.get(source_path)
+    if loaded is not None and loaded[0] == key:
+        return loaded[1]
+    register_map = _load_cached(source_path, key)
+    if register_map is None:
+        register_map = compile_register_map(source_path)
+        _store_cached(source_path, key, register_map)
+    _loaded_maps[source_path] = (key, register_map)
+    return register_map
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Register map linter and offline read-plan optimizer.
+
+  register_map_lint.py check [--register-map FILE]
+  register_map_lint.py plan [--max-block 100] [--max-gap 0] [--request-cost 20] [--write]
+
+check validates every table of a register map: duplicate addresses,
+overlapping registers, LSB/MSB halves that are unpaired or not adjacent,
+reserved ("REV") entries whose described range differs from their
+address/length, undefined addresses inside a table, duplicate descriptions,
+and the read plan in use (groups split over requests, registers not read,
+blocks over the size limit). It exits with status 1 if there are errors.
+
+plan computes for each table the read plan with the lowest cost
+
+    requests * request_cost + registers read * word_cost
+
+by dynamic programming over the registers in address order. Groups
+(LSB/MSB halves, explicit and derived-metric groups) stay in one request,
+a block never exceeds --max-block registers nor bridges more than
+--max-gap undefined addresses (the inverter rejects reads of undefined
+addresses), and reserved registers are read only where that is cheaper
+than another request (--read-reserved makes them required). It reports
+requests per cycle and wasted registers against the current plan; with
+--write the plan is stored next to the map as <map>.plan.json, which
+load_register_map() uses from then on instead of computing one, as long as
+the map file is unchanged.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from register_map import (DEFAULT_REGISTER_MAP, DEFAULT_REQUEST_COST, MAX_BLOCK_REGISTERS, is_reserved,
+                          load_register_map, optimize_plan, plan_path)
+
+ERROR = "error"
+WARNING = "warning"
+INFO = "info"
+
+Finding = namedtuple("Finding", "severity table address code message")
+
+_RANGE = re.compile(r"0x([0-9A-Fa-f]+)(?:\s*~\s*0x([0-9A-Fa-f]+))?")
+_HALF = re.compile(r"^(.*?)[. ](LSB|MSB)$")
+
+
+def _hex(address):
+    return f"0x{address:04X}"
+
+
+def lint_registers(table, max_block=MAX_BLOCK_REGISTERS):
+    """Findings about the register definitions of one table."""
+    findings = []
+
+    def add(severity, address, code, message):
+        findings.append(Finding(severity, table.name, address, code, message))
+
+    registers = sorted(table.registers, key=lambda r: r["address"])
+    first_at = {}
+    names = {}
+    end = None
+    end_reg = None
+    for reg in registers:
+        address = reg["address"]
+        length = reg["length"]
+        description = reg["description"]
+        if address in first_at:
+            add(ERROR, address, "duplicate-address",
+                f"{description!r} has the same address as {first_at[address]['description']!r}")
+        elif end is not None and address < end:
+            add(ERROR, address, "overlap",
+                f"{description!r} overlaps {end_reg['description']!r} "
+                f"({_hex(end_reg['address'])}..{_hex(end - 1)})")
+        elif end is not None and address > end:
+            add(INFO, end, "gap", f"{address - end} undefined register(s) {_hex(end)}..{_hex(address - 1)}")
+        first_at.setdefault(address, reg)
+        if end is None or address + length > end:
+            end = address + length
+            end_reg = reg
+        if length > max_block:
+            add(ERROR, address, "too-long", f"{description!r} is {length} registers, more than one read")
+
+        if is_reserved(reg):
+            match = _RANGE.search(description)
+            if match:
+                first = int(match.group(1), 16)
+                last = int(match.group(2), 16) if match.group(2) else first
+                if first != address or last - first + 1 != length:
+                    add(WARNING, address, "reserved-range",
+                        f"{description!r} describes {_hex(first)}..{_hex(last)} but covers "
+                        f"{_hex(address)}..{_hex(address + length - 1)}")
+        elif description in names:
+            add(WARNING, address, "duplicate-name",
+                f"{description!r} is also at {_hex(names[description]['address'])}; "
+                f"lookups by name resolve to the first")
+        else:
+            names[description] = reg
+
+    # 32-bit values split into LSB/MSB registers (Solax puts the LSB first)
+    for description, reg in names.items():
+        match = _HALF.match(description)
+        if not match:
+            continue
+        stem, half = match.groups()
+        other = next((names[stem + sep + ("MSB" if half == "LSB" else "LSB")] for sep in (".", " ")
+                      if stem + sep + ("MSB" if half == "LSB" else "LSB") in names), None)
+        if other is None:
+            add(WARNING, reg["address"], "unpaired-half", f"{description!r} has no matching "
+                f"{'MSB' if half == 'LSB' else 'LSB'} register")
+        elif half == "LSB" and other["address"] != reg["address"] + reg["length"]:
+            add(WARNING, reg["address"], "split-pair",
+                f"{stem} LSB at {_hex(reg['address'])} and MSB at {_hex(other['address'])} are not adjacent; "
+                f"both must come from one request spanning "
+                f"{abs(other['address'] - reg['address']) + 1} registers")
+    return findings
+
+
+def lint_plan(table, read_plan=None, max_block=MAX_BLOCK_REGISTERS):
+    """Findings about a read plan (default: the table's own) for one table."""
+    read_plan = table.read_plan if read_plan is None else read_plan
+    findings = []
+
+    def add(severity, address, code, message):
+        findings.append(Finding(severity, table.name, address, code, message))
+
+    defined = _defined_words(table.registers)
+    block_of = {}
+    for index, block in enumerate(read_plan):
+        if block.count > max_block:
+            add(ERROR, block.start, "block-too-long", f"block of {block.count} registers, limit {max_block}")
+        undefined = sum(1 for word in range(block.start, block.start + block.count) if word not in defined)
+        if undefined:
+            add(WARNING, block.start, "reads-undefined",
+                f"block {_hex(block.start)}+{block.count} reads {undefined} undefined register(s)")
+        for reg in block.registers:
+            block_of.setdefault(reg["address"], index)
+    for reg in table.registers:
+        if reg["address"] not in block_of and not is_reserved(reg):
+            add(ERROR, reg["address"], "not-read", f"{reg['description']!r} is not in any block")
+    for name, addresses in table.groups:
+        blocks = {block_of.get(address) for address in addresses}
+        if len(blocks) > 1:
+            add(ERROR, min(addresses), "group-split", f"group {name!r} is read in {len(blocks)} requests")
+    return findings
+
+
+def _defined_words(registers):
+    return {reg["address"] + offset for reg in registers for offset in range(reg["length"])}
+
+
+def optimize_table_plan(table, max_block=MAX_BLOCK_REGISTERS, max_gap=0, request_cost=DEFAULT_REQUEST_COST,
+                        word_cost=1.0, read_reserved=False):
+    """Cheapest read plan for a table (see the module docstring); reserved registers are optional."""
+    required = [reg for reg in table.registers if read_reserved or not is_reserved(reg)]
+    return optimize_plan(table.registers, required, [addresses for _, addresses in table.groups],
+                         max_block, max_gap, request_cost, word_cost)
+
+
+def plan_summary(table, read_plan, read_reserved=False):
+    """(requests, registers read, wasted registers) of a plan; reserved and undefined words count as waste."""
+    useful = set()
+    for block in read_plan:
+        for reg in block.registers:
+            if read_reserved or not is_reserved(reg):
+                useful.update(range(reg["address"], reg["address"] + reg["length"]))
+    words = sum(block.count for block in read_plan)
+    return len(read_plan), words, words - len(useful)
+
+
+def print_findings(findings):
+    for finding in findings:
+        print(f"{finding.severity:8}{finding.table:10}{_hex(finding.address):8}{finding.code:20}{finding.message}")
+    counts = {severity: sum(1 for f in findings if f.severity == severity) for severity in (ERROR, WARNING, INFO)}
+    print(f"{counts[ERROR]} error(s), {counts[WARNING]} warning(s), {counts[INFO]} note(s)")
+    return counts[ERROR]
+
+
+def cmd_check(args):
+    register_map = load_register_map(args.register_map)
+    findings = []
+    for table in register_map.tables.values():
+        findings.extend(lint_registers(table, args.max_block))
+        findings.extend(lint_plan(table, max_block=args.max_block))
+    return 1 if print_findings(findings) else 0
+
+
+def cmd_plan(args):
+    source_path = os.path.abspath(args.register_map or DEFAULT_REGISTER_MAP)
+    register_map = load_register_map(source_path)
+    plans = {}
+    findings = []
+    print(f"cost = requests * {args.request_cost:g} + registers read * {args.word_cost:g}, "
+          f"max block {args.max_block}, max gap {args.max_gap}")
+    print(f"{'table':10}{'current req':>12}{'read':>6}{'waste':>7}{'optimal req':>13}{'read':>6}{'waste':>7}")
+    totals = [0] * 6
+    for name, table in register_map.tables.items():
+        plan = optimize_table_plan(table, args.max_block, args.max_gap, args.request_cost, args.word_cost,
+                             args.read_reserved)
+        findings.extend(lint_plan(table, plan, args.max_block))
+        plans[name] = plan
+        row = plan_summary(table, table.read_plan, args.read_reserved) + plan_summary(table, plan, args.read_reserved)
+        totals = [a + b for a, b in zip(totals, row)]
+        print(f"{name:10}{row[0]:>12}{row[1]:>6}{row[2]:>7}{row[3]:>13}{row[4]:>6}{row[5]:>7}")
+    print(f"{'per cycle':10}{totals[0]:>12}{totals[1]:>6}{totals[2]:>7}{totals[3]:>13}{totals[4]:>6}{totals[5]:>7}")
+    if findings:
+        print_findings(findings)
+        if any(f.severity == ERROR for f in findings):
+            return 1
+
+    if args.write or args.output:
+        with open(source_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        data = {
+            "register_map": os.path.basename(source_path),
+            "source_sha256": digest,
+            "max_block": args.max_block,
+            "max_gap": args.max_gap,
+            "request_cost": args.request_cost,
+            "word_cost": args.word_cost,
+            "read_reserved": args.read_reserved,
+        }
+        # One line per table keeps the file readable and its diffs small.
+        tables = ",\n".join(f"    {json.dumps(name)}: "
+                            f"{json.dumps([[_hex(block.start), block.count] for block in plan])}"
+                            for name, plan in plans.items())
+        path = args.output or plan_path(source_path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, indent=2)[:-2] + ',\n  "tables": {\n' + tables + "\n  }\n}\n")
+        print(f"Read plan written to {path}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Validate register maps and optimize their read plans.")
+    parser.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    parser.add_argument("--max-block", type=int, default=MAX_BLOCK_REGISTERS, help="Registers per read request")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("check", help="Report problems in the register map and its read plan")
+
+    plan = sub.add_parser("plan", help="Compute the cheapest read plan")
+    plan.add_argument("--max-gap", type=int, default=0,
+                      help="Undefined registers a read may bridge (the inverter rejects them: keep 0)")
+    plan.add_argument("--request-cost", type=float, default=DEFAULT_REQUEST_COST,
+                      help="Cost of one request, in registers read")
+    plan.add_argument("--word-cost", type=float, default=1.0, help="Cost of reading one register")
+    plan.add_argument("--read-reserved", action="store_true", help="Also require the reserved (REV) registers")
+    plan.add_argument("--write", action="store_true", help="Store the plan as <map>.plan.json next to the map")
+    plan.add_argument("--output", default=None, metavar="FILE", help="Store the plan in FILE instead")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "check":
+        return cmd_check(args)
+    return cmd_plan(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# register_search.py
+import operator
+import re
+
+_COMPARISON = re.compile(r"^value(>=|<=|!=|==|=|>|<)(-?\d+(?:\.\d*)?)$", re.IGNORECASE)
+_ADDRESS = re.compile(r"^(?:addr(?:ess)?:)?(0x[0-9a-f]+)(?:-(0x[0-9a-f]+))?$", re.IGNORECASE)
+_DECIMAL_ADDRESS = re.compile(r"^addr(?:ess)?:(\d+)(?:-(\d+))?$", re.IGNORECASE)
+_OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+              "=": operator.eq, "==": operator.eq, "!=": operator.ne}
+
+
+def _number(text):
+    return int(text, 16) if text.lower().startswith("0x") else int(text)
+
+
+class SearchQuery:
+    """
+    Filter text, as space-separated terms that must all match:
+
+      text          description contains it (case-insensitive); a bare
+                    decimal number also matches a register at that address
+      0x0046        the register covering that address (also addr:0x0046,
+                    addr:70); 0x0040-0x0050 or addr:64-80 for a range
+      unit:W        unit is W (case-insensitive); several unit: terms
+                    match any of those units
+      value>1000    current numeric value compares (>, >=, <, <=, =, !=)
+    """
+
+    __slots__ = ("text", "words", "units", "addresses", "comparisons")
+
+    def __init__(self, text):
+        self.text = text
+        self.words = []
+        self.units = set()
+        self.addresses = []         # (first, last) inclusive
+        self.comparisons = []       # (operator, operand)
+        for term in text.split():
+            lower = term.lower()
+            match = _COMPARISON.match(term)
+            if match:
+                self.comparisons.append((_OPERATORS[match.group(1)], float(match.group(2))))
+                continue
+            if lower.startswith("unit:"):
+                self.units.add(lower[5:])
+                continue
+            match = _ADDRESS.match(term) or _DECIMAL_ADDRESS.match(term)
+            if match:
+                first, last = match.groups()
+                self.addresses.append((_number(first), _number(last) if last else None))
+                continue
+            self.words.append(lower)
+
+    def __bool__(self):
+        return bool(self.words or self.units or self.addresses or self.comparisons)
+
+    @property
+    def needs_values(self):
+        """True if the result depends on current values, so it must be re-evaluated on new data."""
+        return bool(self.comparisons)
+
+
+class RegisterIndex:
+    """
+    Search index of one table, built once: per row (registers, then derived
+    metrics) the lower-cased description and unit and the address span,
+    plus rows by unit. match() runs a SearchQuery over it.
+    """
+
+    def __init__(self, table, derived=()):
+        self.entries = []       # (key, description, unit, start, end); key = address or derived metric name
+        for reg in table.registers:
+            self.entries.append((reg["address"], reg["description"].lower(), reg.get("unit", "").lower(),
+                                 reg["address"], reg["address"] + reg["length"]))
+        for metric in derived:
+            self.entries.append((metric.name, metric.name.lower(), metric.unit.lower(), None, None))
+        self.by_unit = {}
+        for entry in self.entries:
+            self.by_unit.setdefault(entry[2], []).append(entry)
+
+    def match(self, query, value_of=None):
+        """
+        Keys of the matching rows, in row order. value_of(key) returns the
+        current numeric value of a row (or None) for value comparisons.
+        """
+        if not query:
+            return [entry[0] for entry in self.entries]
+        if len(query.units) == 1:
+            candidates = self.by_unit.get(next(iter(query.units)), ())
+        elif query.units:
+            candidates = [entry for entry in self.entries if entry[2] in query.units]
+        else:
+            candidates = self.entries
+        keys = []
+        for key, description, unit, start, end in candidates:
+            if query.addresses and (start is None or not all(
+                    start <= first < end if last is None else first <= start <= last
+                    for first, last in query.addresses)):
+                continue
+            if not all(word in description or (word.isdigit() and start is not None and start <= int(word) < end)
+                       for word in query.words):
+                continue
+            if query.comparisons:
+                value = value_of(key) if value_of is not None else None
+                if value is None or not all(compare(value, operand) for compare, operand in query.comparisons):
+                    continue
+            keys.append(key)
+        return keys
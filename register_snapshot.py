@@ -0,0 +1,97 @@
+# register_snapshot.py
+import time
+
+from register_map import read_block, split_block
+
+# Requests in a row that raise (timeout, lost connection) before the rest of
+# a pass is given up rather than waiting for each block to time out.
+MAX_TRANSPORT_FAILURES = 2
+
+
+class RegisterSnapshot:
+    """
+    The values of one register table from one acquisition pass.
+
+    Every register comes from exactly one block read of the table's plan, and
+    the plan keeps register groups (LSB/MSB halves, voltage/current/power
+    sets, derived-metric inputs) inside one block, so values that belong
+    together are always sampled by the same request. The snapshot is only
+    handed to consumers once complete, stamped with the time acquisition
+    started.
+      - items:    (register, raw_list or None) in read order; None = read failed
+      - values:   start address -> raw_list or None
+    """
+
+    __slots__ = ("table", "sequence", "timestamp", "duration", "items", "values", "errors")
+
+    def __init__(self, table, sequence, timestamp, duration, items, errors):
+        self.table = table
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.duration = duration
+        self.items = items
+        self.values = {reg["address"]: raw_list for reg, raw_list in items}
+        self.errors = errors
+
+    def get(self, address):
+        return self.values.get(address)
+
+
+def acquire_snapshot(client, table, sequence=0, on_request=None, read_plan=None, quarantine=None):
+    """
+    Read every block of `read_plan` (default: `table.read_plan`) and return a
+    RegisterSnapshot. on_request(block, seconds, error) is called after each
+    request, e.g. for performance counters.
+
+    With an AddressQuarantine, quarantined registers are left out of the
+    plan (and come back as failed reads) and failing blocks are bisected so
+    one bad register does not cost the whole block. A request that raises
+    only fails its own block; after MAX_TRANSPORT_FAILURES in a row the rest
+    of the pass is given up, and if nothing could be read the last exception
+    is raised.
+    """
+    perf_counter = time.perf_counter
+    timestamp = time.time()
+    start = perf_counter()
+    items = []
+    errors = 0
+    read_plan = table.read_plan if read_plan is None else read_plan
+    if quarantine is not None:
+        groups = [addresses for _, addresses in table.groups]
+        read_plan, skipped = quarantine.apply(table.function, read_plan, groups)
+        items.extend((reg, None) for reg in skipped)
+    read_any = False
+    failures = 0
+    exception = None
+    for block in read_plan:
+        if failures >= MAX_TRANSPORT_FAILURES:
+            errors += 1
+            items.extend((reg, None) for reg in block.registers)
+            continue
+        t0 = perf_counter()
+        try:
+            if quarantine is not None:
+                block_items = quarantine.read(client, table.function, block, on_request, groups)
+                error = any(raw_list is None for _, raw_list in block_items)
+            else:
+                resp = read_block(client, table.function, block.start, block.count)
+                error = resp.isError()
+                if on_request is not None:
+                    on_request(block, perf_counter() - t0, error)
+                block_items = [(reg, None) for reg in block.registers] if error else split_block(block, resp.registers)
+        except Exception as e:
+            if on_request is not None:
+                on_request(block, perf_counter() - t0, True)
+            exception = e
+            failures += 1
+            errors += 1
+            items.extend((reg, None) for reg in block.registers)
+            continue
+        failures = 0
+        read_any = True
+        if error:
+            errors += 1
+        items.extend(block_items)
+    if exception is not None and not read_any:
+        raise exception
+    return RegisterSnapshot(table.name, sequence, timestamp, perf_counter() - start, items, errors)
@@ -1,4 +1,5 @@
 # register_utils.py
+from register_map import load_register_map
 
 def registers_to_ascii(raw_list):
     """Convert a list of 16-bit registers to an ASCII string."""
@@ -10,6 +11,24 @@ def convert_raw_to_float(raw_val, scale, signed):
         raw_val -= 0x10000
     return raw_val * scale
 
+def registers_to_int(raw_list, signed):
+    """Combine a 32-bit register pair (low word first, as Solax sends it) into an integer."""
+    value = raw_list[0] | (raw_list[1] << 16)
+    if signed and (value & 0x80000000):
+        value -= 0x100000000
+    return value
+
+def decode_numeric(reg, raw_list):
+    """Return the scaled numeric value of a 16- or 32-bit register, or None for text blocks."""
+    length = reg["length"]
+    if length > 2:
+        return None
+    scale = reg.get("scale", 1.0)
+    signed = reg.get("signed", False)
+    if length == 2:
+        return registers_to_int(raw_list, signed) * scale
+    return convert_raw_to_float(raw_list[0], scale, signed)
+
 def format_display_str(value, scale, unit):
     """Format the numeric value with appropriate precision and optional unit."""
     if scale == 1.0:
@@ -25,11 +44,29 @@ def format_display_str(value, scale, unit):
 class RegisterDefinitionsBase:
     """
     Base class to provide common register rendering logic.
+    Subclasses set table_name to pick their table from the compiled register
+    map (see register_map.py); the map is loaded once per process.
     The render_register method handles:
+      - Enum and bit-flag registers (precomputed lookup tables, see value_decoders.py)
       - Multi-register values (as ASCII)
       - Single registers (scaled, signed, and formatted)
     """
+    table_name = None
+
+    def __init__(self, register_map=None):
+        if register_map is None:
+            register_map = load_register_map()
+        self.table = register_map.table(self.table_name)
+        self._registers = self.table.registers
+
+    def get_registers(self):
+        """Return the list of register definitions."""
+        return self._registers
+
     def render_register(self, reg, raw_list):
+        decoder = reg.get("decoder")
+        if decoder is not None:
+            return self.table.decoders[decoder].render(raw_list)
         if reg["length"] > 2:
             return registers_to_ascii(raw_list)
         raw_val = raw_list[0]
@@ -38,3 +75,19 @@ class RegisterDefinitionsBase:
         signed = reg.get("signed", False)
         value = convert_raw_to_float(raw_val, scale, signed)
         return format_display_str(value, scale, unit)
+
+def load_definitions(register_map=None):
+    """Return {table name: definitions object} for the tables present in the register map."""
+    # Imported here: the definition modules import this one.
+    from HoldingRegisterDefinitions import HoldingRegisterDefinitions
+    from InputRegisterDefinitions import InputRegisterDefinitions
+    from SelfTestInputRegisterDefinitions import SelfTestInputRegisterDefinitions
+    from ParallelInputRegisterDefinitions import ParallelInputRegisterDefinitions
+    if register_map is None:
+        register_map = load_register_map()
+    definitions = {}
+    for cls in (HoldingRegisterDefinitions, InputRegisterDefinitions,
+                SelfTestInputRegisterDefinitions, ParallelInputRegisterDefinitions):
+        if cls.table_name in register_map.tables:
+            definitions[cls.table_name] = cls(register_map)
+    return definitions
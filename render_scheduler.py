@@ -0,0 +1,112 @@
+# render_scheduler.py
+import time
+import tkinter as tk
+from collections import OrderedDict
+
+# One display frame, and the share of it row updates may use.
+FRAME_MS = 16
+BUDGET_MS = 8
+
+
+class RenderScheduler:
+    """
+    Coalesces Treeview row updates and applies them in frames.
+
+    update() only records the latest values/tags for a row; rows updated
+    several times before the next frame are written once. Each frame applies
+    pending rows in arrival order until `budget_ms` is used up and leaves the
+    rest for the next frame, so the event loop gets back control every
+    `frame_ms` however many rows changed. Rows whose values and tags equal
+    what is already displayed are dropped without touching Tk.
+    """
+
+    def __init__(self, master, frame_ms=FRAME_MS, budget_ms=BUDGET_MS, stats=None, stage=None):
+        self.master = master
+        self.frame_ms = frame_ms
+        self.budget = budget_ms / 1000.0
+        self.stats = stats
+        self.stage = stage
+        self._pending = OrderedDict()   # (tree, row_id) -> [values, tags]
+        self._shown = {}                # (tree, row_id) -> (values, tags) last applied
+        self._scheduled = None
+        self._last_frame = 0.0
+        self.frames = 0
+        self.applied = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def update(self, tree, row_id, values=None, tags=None):
+        """Queue new values and/or tags for a row; None leaves that part unchanged."""
+        key = (tree, row_id)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [values, tags]
+        else:
+            self.coalesced += 1
+            if values is not None:
+                pending[0] = values
+            if tags is not None:
+                pending[1] = tags
+        if self._scheduled is None:
+            delay = self._last_frame + self.frame_ms / 1000.0 - time.perf_counter()
+            self._scheduled = self.master.after(max(0, int(delay * 1000)), self._frame)
+
+    def discard(self, tree):
+        """Forget pending and displayed state for a tree whose rows were deleted."""
+        for key in [key for key in self._pending if key[0] is tree]:
+            del self._pending[key]
+        for key in [key for key in self._shown if key[0] is tree]:
+            del self._shown[key]
+
+    def flush(self):
+        """Apply everything pending now, ignoring the budget."""
+        if self._scheduled is not None:
+            self.master.after_cancel(self._scheduled)
+            self._scheduled = None
+        self._apply(None)
+
+    def _frame(self):
+        self._scheduled = None
+        self._apply(self.budget)
+        if self._pending:
+            self._scheduled = self.master.after(self.frame_ms, self._frame)
+
+    def _apply(self, budget):
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        deadline = start + budget if budget is not None else None
+        pending = self._pending
+        shown = self._shown
+        count = 0
+        while pending:
+            key, (values, tags) = pending.popitem(last=False)
+            old_values, old_tags = shown.get(key, (None, None))
+            if values is None:
+                values = old_values
+            if tags is None:
+                tags = old_tags
+            if values == old_values and tags == old_tags:
+                continue
+            tree, row_id = key
+            options = {}
+            if values != old_values:
+                options["values"] = values
+            if tags != old_tags:
+                options["tags"] = tags
+            try:
+                tree.item(row_id, **options)
+            except tk.TclError:
+                shown.pop(key, None)    # Row deleted meanwhile
+                continue
+            shown[key] = (values, tags)
+            count += 1
+            # Checking the clock every few rows keeps the overhead negligible.
+            if deadline is not None and not count & 15 and perf_counter() >= deadline:
+                break
+        self._last_frame = perf_counter()
+        self.frames += 1
+        self.applied += count
+        if self.stats is not None and self.stage is not None:
+            self.stats.add_sample(self.stage, self._last_frame - start)
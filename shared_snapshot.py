@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Register snapshots in shared memory.
+
+An acquisition process (modbus_poller.py) publishes every polling cycle into
+a multiprocessing.shared_memory segment; the GUI and exporters attach to it
+and only ever read, so a slow consumer can never delay sampling.
+
+Layout (little endian), derived from the register map alone so that every
+process computes the same offsets:
+
+  header   magic "SLXS", version, layout fingerprint, slot count, word count,
+           sequence counter, acquisition timestamp, cycle time, error count
+  status   one byte per slot: 0 = no value yet, 1 = valid, 2 = read error
+  words    one slot per register (bank, address) of `length` uint16 words
+
+The sequence counter is a seqlock: the writer makes it odd before touching
+the segment and even again afterwards. A reader copies the segment and
+retries if the counter was odd or moved while it was copying.
+
+  shared_snapshot.py NAME         print the current snapshot as JSON
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from register_map import load_register_map
+from register_utils import decode_numeric
+
+MAGIC = b"SLXS"
+LAYOUT_VERSION = 1
+
+_HEADER = struct.Struct("<4sH8sIIQddI")
+_SEQUENCE_OFFSET = struct.calcsize("<4sH8sII")
+_SEQUENCE = struct.Struct("<Q")
+_PUBLISH = struct.Struct("<QddI")       # sequence, timestamp, cycle_ms, errors
+
+# Where POSIX shared memory segments appear as files (Linux)
+_SHM_DIR = "/dev/shm"
+
+STATUS_EMPTY = 0
+STATUS_VALID = 1
+STATUS_ERROR = 2
+
+
+class SnapshotLayout:
+    """
+    Slot assignment for one register map. Both banks (holding and input) get
+    one slot per distinct register start address; tables sharing a bank share
+    slots, since they are the same Modbus registers.
+    """
+
+    def __init__(self, register_map):
+        slots = {}
+        for table in register_map.tables.values():
+            bank = table.function
+            for reg in table.registers:
+                key = (bank, reg["address"])
+                slots[key] = max(slots.get(key, 0), reg["length"])
+        self.keys = sorted(slots)
+        self.slot_index = {}
+        self.slot_offset = []       # first word of each slot
+        self.slot_length = []
+        self.word_slot = {"holding": {}, "input": {}}   # (bank) -> word address -> (slot, word offset)
+        offset = 0
+        for index, key in enumerate(self.keys):
+            bank, address = key
+            length = slots[key]
+            self.slot_index[key] = index
+            self.slot_offset.append(offset)
+            self.slot_length.append(length)
+            for i in range(length):
+                self.word_slot[bank].setdefault(address + i, (index, offset + i))
+            offset += length
+        self.slot_count = len(self.keys)
+        self.word_count = offset
+        digest = hashlib.sha1(repr([(k, slots[k]) for k in self.keys]).encode("ascii"))
+        self.fingerprint = digest.digest()[:8]
+        self.status_offset = _HEADER.size
+        self.words_offset = self.status_offset + self.slot_count
+        self.words_offset += self.words_offset & 1   # word aligned
+        self.size = self.words_offset + 2 * self.word_count
+
+
+class SharedSnapshotWriter:
+    """Owns the segment; publish() is called once per acquisition cycle."""
+
+    def __init__(self, name, register_map=None):
+        self.layout = SnapshotLayout(register_map or load_register_map())
+        layout = self.layout
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=layout.size)
+        self.sequence = 0
+        _HEADER.pack_into(self.shm.buf, 0, MAGIC, LAYOUT_VERSION, layout.fingerprint,
+                          layout.slot_count, layout.word_count, 0, 0.0, 0.0, 0)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, values, timestamp=None, cycle_ms=0.0, errors=0):
+        """
+        Write one snapshot: values is {(bank, address): raw_list or None}
+        (None marks a failed read). Slots not mentioned keep their old value.
+        The whole update happens inside one seqlock write section.
+        """
+        layout = self.layout
+        buf = self.shm.buf
+        slot_index = layout.slot_index
+        words_offset = layout.words_offset
+        status_offset = layout.status_offset
+        self.sequence += 1
+        _SEQUENCE.pack_into(buf, _SEQUENCE_OFFSET, self.sequence)      # odd: write in progress
+        for key, raw_list in values.items():
+            index = slot_index.get(key)
+            if index is None:
+                continue
+            if raw_list is None:
+                buf[status_offset + index] = STATUS_ERROR
+                continue
+            count = min(len(raw_list), layout.slot_length[index])
+            struct.pack_into(f"<{count}H", buf, words_offset + 2 * layout.slot_offset[index], *raw_list[:count])
+            buf[status_offset + index] = STATUS_VALID
+        self.sequence += 1
+        _PUBLISH.pack_into(buf, _SEQUENCE_OFFSET, self.sequence,
+                           time.time() if timestamp is None else timestamp, cycle_ms, errors)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _attach_readonly(name):
+    """
+    Map an existing segment read-only. Where POSIX shared memory lives in
+    /dev/shm (Linux) the file is opened and mapped directly: SharedMemory
+    would map it writable and register it with this process's resource
+    tracker, which unlinks it from under the writer when the process exits.
+    Elsewhere SharedMemory is used without tracking. Returns (handle,
+    buffer); handle.close() releases the mapping.
+    """
+    if os.name == "posix" and os.path.isdir(_SHM_DIR):
+        fd = os.open(os.path.join(_SHM_DIR, name), os.O_RDONLY)
+        try:
+            mapping = mmap.mmap(fd, os.fstat(fd).st_size, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        return mapping, memoryview(mapping)
+    if os.name != "posix":
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, shm.buf
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:           # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister("/" + name, "shared_memory")
+    return shm, shm.buf
+
+
+class Snapshot:
+    """One consistent copy of the segment."""
+
+    __slots__ = ("layout", "sequence", "timestamp", "cycle_ms", "errors", "status", "words")
+
+    def __init__(self, layout, sequence, timestamp, cycle_ms, errors, status, words):
+        self.layout = layout
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.cycle_ms = cycle_ms
+        self.errors = errors
+        self.status = status
+        self.words = words
+
+    def get(self, bank, address):
+        """Raw words of the register at (bank, address), or None if not valid."""
+        index = self.layout.slot_index.get((bank, address))
+        if index is None or self.status[index] != STATUS_VALID:
+            return None
+        offset = self.layout.slot_offset[index]
+        return list(self.words[offset:offset + self.layout.slot_length[index]])
+
+    def read(self, bank, address, count):
+        """
+        Words for a block read, or None if any register in it failed to read.
+        Addresses between defined registers, and registers the poller never
+        published (pruned by its model profile), read as 0 like bridged holes.
+        """
+        word_slot = self.layout.word_slot[bank]
+        status = self.status
+        words = self.words
+        result = []
+        for word_address in range(address, address + count):
+            slot = word_slot.get(word_address)
+            if slot is None or status[slot[0]] == STATUS_EMPTY:
+                result.append(0)
+            elif status[slot[0]] == STATUS_ERROR:
+                return None
+            else:
+                result.append(words[slot[1]])
+        return result
+
+
+class SharedSnapshotReader:
+    """Read-only view of a segment published by SharedSnapshotWriter."""
+
+    def __init__(self, name, register_map=None):
+        self.layout = SnapshotLayout(register_map or load_register_map())
+        self.name = name
+        self._handle, self.buf = _attach_readonly(name)
+        magic, version, fingerprint = _HEADER.unpack_from(self.buf, 0)[:3]
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self.close()
+            raise ValueError(f"{name} is not a register snapshot segment")
+        if fingerprint != self.layout.fingerprint:
+            self.close()
+            raise ValueError(f"{name} was written with a different register map")
+
+    def sequence(self):
+        return _SEQUENCE.unpack_from(self.buf, _SEQUENCE_OFFSET)[0]
+
+    def read(self, retries=100):
+        """Return a consistent Snapshot, or None if nothing was published yet."""
+        layout = self.layout
+        buf = self.buf
+        for _ in range(retries):
+            before = _SEQUENCE.unpack_from(buf, _SEQUENCE_OFFSET)[0]
+            if before & 1:
+                time.sleep(0.0005)
+                continue
+            if before == 0:
+                return None
+            sequence, timestamp, cycle_ms, errors = _PUBLISH.unpack_from(buf, _SEQUENCE_OFFSET)
+            status = bytes(buf[layout.status_offset:layout.status_offset + layout.slot_count])
+            words = struct.unpack_from(f"<{layout.word_count}H", buf, layout.words_offset)
+            if _SEQUENCE.unpack_from(buf, _SEQUENCE_OFFSET)[0] == before:
+                return Snapshot(layout, sequence, timestamp, cycle_ms, errors, status, words)
+        raise TimeoutError(f"No consistent snapshot in {self.name} after {retries} attempts")
+
+    def wait(self, timeout=10.0, after=0):
+        """Block until a snapshot newer than sequence `after` is published."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            sequence = self.sequence()
+            if sequence > after and not sequence & 1:
+                return self.read()
+            time.sleep(0.05)
+        raise TimeoutError(f"No snapshot published in {self.name} within {timeout:.0f} s")
+
+    def close(self):
+        if self.buf is not None:
+            self.buf.release()
+            self.buf = None
+            self._handle.close()
+
+
+class _SnapshotResponse:
+    __slots__ = ("registers",)
+
+    def __init__(self, registers):
+        self.registers = registers
+
+    def isError(self):
+        return self.registers is None
+
+    def __str__(self):
+        return "Exception Response: no valid value in snapshot" if self.registers is None else "OK"
+
+
+class SnapshotClient:
+    """
+    Serves read_*_registers() from the latest shared snapshot, so code written
+    against a pymodbus client (the GUI's fetch path, model detection) works
+    unchanged on top of an acquisition process. refresh() takes a new
+    snapshot; all reads in between see the same moment.
+    """
+
+    def __init__(self, reader, description=None):
+        self.reader = reader
+        self.description = description or f"shared memory {reader.name}"
+        self.snapshot = None
+        self._refreshed = None      # sequence taken by the last refresh()
+
+    def connect(self):
+        return True
+
+    def close(self):
+        self.reader.close()
+
+    def refresh(self):
+        """Take the latest snapshot; returns True if it is newer than at the previous refresh()."""
+        snapshot = self.reader.read()
+        if snapshot is None or snapshot.sequence == self._refreshed:
+            return False
+        self.snapshot = snapshot
+        self._refreshed = snapshot.sequence
+        return True
+
+    def _read(self, bank, address, count):
+        if self.snapshot is None:
+            self.snapshot = self.reader.read()
+        if self.snapshot is None:
+            return _SnapshotResponse(None)
+        return _SnapshotResponse(self.snapshot.read(bank, address, count))
+
+    def read_holding_registers(self, address, count=1, **kwargs):
+        return self._read("holding", address, count)
+
+    def read_input_registers(self, address, count=1, **kwargs):
+        return self._read("input", address, count)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dump the current shared-memory register snapshot as JSON.")
+    parser.add_argument("name", help="Shared memory segment name (modbus_poller.py --name)")
+    parser.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    args = parser.parse_args(argv)
+    register_map = load_register_map(args.register_map)
+    reader = SharedSnapshotReader(args.name, register_map)
+    try:
+        snapshot = reader.read()
+    finally:
+        reader.close()
+    if snapshot is None:
+        sys.exit(f"Nothing published in {args.name} yet")
+    tables = {}
+    for name, table in register_map.tables.items():
+        values = tables[name] = {}
+        for reg in table.registers:
+            raw_list = snapshot.get(table.function, reg["address"])
+            if raw_list is not None:
+                value = decode_numeric(reg, raw_list)
+                values[reg["description"]] = value if value is not None else raw_list
+    print(json.dumps({"sequence": snapshot.sequence, "timestamp": snapshot.timestamp,
+                      "cycle_ms": snapshot.cycle_ms, "errors": snapshot.errors, "tables": tables}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
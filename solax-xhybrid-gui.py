@@ -1,15 +1,46 @@
 #!/usr/bin/env python3
 import argparse
+import importlib
+import logging
+import os
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
-
-from pymodbus.client import ModbusTcpClient
-from pymodbus.exceptions import ModbusException
-
-from HoldingRegisterDefinitions import HoldingRegisterDefinitions
-from InputRegisterDefinitions import InputRegisterDefinitions
-from SelfTestInputRegisterDefinitions import SelfTestInputRegisterDefinitions
-from ParallelInputRegisterDefinitions import ParallelInputRegisterDefinitions
+from tkinter import ttk, messagebox, filedialog
+
+# Only what the window needs to come up is imported here. pymodbus is
+# imported by modbus_transport on the first connect, the register definition
+# modules when a tab is first shown, and optional features (alarms, web
+# dashboard, acquisition process) when they are enabled.
+from register_map import load_register_map
+from register_snapshot import acquire_snapshot
+from derived_metrics import DerivedMetricsEngine
+from adaptive_polling import AdaptivePollScheduler
+from streaming_stats import DEFAULT_WINDOWS, StreamingStatsEngine
+from register_utils import decode_numeric
+from model_profile import FULL_PROFILE, detect_capabilities, detect_profile, profile_for_model
+from perf_stats import PerfStats, STAGE_MODBUS, STAGE_DECODE, STAGE_TREE, STAGE_LOOP_LAG, STAGE_WATCH
+from modbus_transport import DEFAULT_BAUDRATE, DEFAULT_UNIT, connect_client
+from render_scheduler import RenderScheduler
+from parallel_system import ParallelSystemLayout, matrix_rows, read_parallel_system
+from watch_list import DEFAULT_WATCH_INTERVAL, WatchList
+from address_quarantine import AddressQuarantine
+from register_search import RegisterIndex, SearchQuery
+
+# How often the Tk event loop is probed for lag (milliseconds).
+LOOP_LAG_PROBE_MS = 250
+
+# A shared snapshot older than this many poll intervals (and at least
+# STALE_AFTER_MIN seconds) is reported as stale in the status bar.
+STALE_AFTER_INTERVALS = 3
+STALE_AFTER_MIN = 10.0
+
+# Register definitions class per table; each lives in a module of the same name.
+DEFINITION_CLASSES = {
+    "holding": "HoldingRegisterDefinitions",
+    "input": "InputRegisterDefinitions",
+    "selftest": "SelfTestInputRegisterDefinitions",
+    "parallel": "ParallelInputRegisterDefinitions",
+}
 
 # RowTooltip for showing raw & hex data on hover
 class RowTooltip:
@@ -55,14 +86,56 @@ class RowTooltip:
         self.tip_window = None
 
 
+class RegisterTab:
+    """
+    One notebook tab. Its Treeview is created the first time the tab is
+    shown, and its rows are inserted on the first show after a connect; until
+    then the tab's table is still polled (alarms, statistics, dashboard) but
+    nothing is rendered.
+    """
+
+    def __init__(self, name, title, frame, columns=("address", "desc", "value"), widths=(120, 300, 150)):
+        self.name = name
+        self.title = title
+        self.frame = frame
+        self.columns = columns
+        self.widths = widths
+        self.tree = None
+        self.tooltip = None
+        self.populated = False
+        self.rowids = {}            # address (matrix: row label) -> row id
+        self.derived_rowids = {}    # derived metric name -> row id
+        self.prev_values = {}       # address -> last numeric value, for colouring
+        self.row_order = []         # (address or derived metric name, row id) in insertion order
+        self.hidden = set()         # row ids detached by the search filter
+
+
 class ModbusGUI:
-    def __init__(self, master, default_ip="192.168.0.100", default_port="502", update_interval=10):
+    def __init__(self, master, default_ip="192.168.0.100", default_port="502", update_interval=10,
+                 register_map_path=None, model="auto", alarm_rules_path=None,
+                 serial_port="", baudrate=DEFAULT_BAUDRATE, unit=DEFAULT_UNIT,
+                 attach_name=None, spawn_poller=False, adaptive_max=0, web_listen=None,
+                 watch=(), watch_interval=DEFAULT_WATCH_INTERVAL):
         self.master = master
         self.master.title("Solax X1/X3 Hybrid Inverter Modbus GUI")
 
         self.update_interval = update_interval
-        self.invalid_parallel_registers = set()
         self.client = None  # Persistent connection
+        # Acquisition in a separate process: attach to its shared-memory
+        # snapshot (attach_name) or start one for the connection settings.
+        self.register_map_path = register_map_path
+        self.attach_name = attach_name
+        self.spawn_poller = spawn_poller
+        self.poller = None
+        # Adaptive polling: registers that stay unchanged are read less often,
+        # down to once every adaptive_max seconds (0 = read everything each cycle).
+        self.adaptive_max = adaptive_max
+        self.poll_schedulers = {}
+        # Registers the inverter refuses are isolated and re-probed now and then
+        self.quarantine = AddressQuarantine()
+        self.model_choice = model  # "auto", "all" or a model name from the register map
+        self.profile = FULL_PROFILE
+        self.stats = PerfStats()
 
         # Connection frame
         connection_frame = ttk.LabelFrame(master, text="Connection Settings")
@@ -85,57 +158,260 @@ class ModbusGUI:
 
         ttk.Button(connection_frame, text="Connect", command=self.on_connect)\
             .grid(row=0, column=6, padx=5, pady=5, sticky="e")
-
-        # Notebook for tabs
+        ttk.Button(connection_frame, text="Profile Cycle", command=self.on_profile_cycle)\
+            .grid(row=0, column=7, padx=5, pady=5, sticky="e")
+        ttk.Button(connection_frame, text="Export Stats", command=self.on_export_stats)\
+            .grid(row=0, column=8, padx=5, pady=5, sticky="e")
+
+        # Modbus RTU: a serial port overrides IP/port.
+        ttk.Label(connection_frame, text="Serial:").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        self.serial_entry = ttk.Entry(connection_frame, width=15)
+        self.serial_entry.insert(0, serial_port or "")
+        self.serial_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        ttk.Label(connection_frame, text="Baud:").grid(row=1, column=2, padx=5, pady=5, sticky="e")
+        self.baud_entry = ttk.Entry(connection_frame, width=6)
+        self.baud_entry.insert(0, str(baudrate))
+        self.baud_entry.grid(row=1, column=3, padx=5, pady=5)
+
+        ttk.Label(connection_frame, text="Unit:").grid(row=1, column=4, padx=5, pady=5, sticky="e")
+        self.unit_entry = ttk.Entry(connection_frame, width=5)
+        self.unit_entry.insert(0, str(unit))
+        self.unit_entry.grid(row=1, column=5, padx=5, pady=5)
+
+        # Search filters the register tabs as you type (see register_search.py)
+        ttk.Label(connection_frame, text="Search:").grid(row=1, column=6, padx=5, pady=5, sticky="e")
+        self.search_var = tk.StringVar()
+        self.search_entry = ttk.Entry(connection_frame, width=30, textvariable=self.search_var)
+        self.search_entry.grid(row=1, column=7, columnspan=2, padx=5, pady=5, sticky="ew")
+        self.search_entry.bind("<Escape>", lambda event: self.search_var.set(""))
+        self.search_var.trace_add("write", self.on_search_changed)
+        self.search_query = SearchQuery("")
+        self.search_job = None
+
+        # Watch panel: registers pinned from any tab, read by their own
+        # high-rate lane. Hidden while nothing is pinned.
+        self.watch_frame = ttk.LabelFrame(master, text="Watch")
+        self.watch_frame.grid(row=1, column=0, padx=10, pady=(0, 5), sticky="ew")
+        self.watch_tree = self.create_register_table(self.watch_frame, ("table", "address", "desc", "value"),
+                                                     (80, 120, 300, 150))
+        self.watch_tree.configure(height=6)
+        self.watch_tree.bind("<Button-3>", self.on_watch_menu)
+        self.watch_rowids = {}          # (table name, address) -> row id
+        self.watch_prev_values = {}     # table name -> {address: last numeric value}
+        self.watch_menu = tk.Menu(master, tearoff=0)
+
+        # Notebook for tabs. Each tab's Treeview is built when it is first shown.
         self.notebook = ttk.Notebook(master)
-        self.notebook.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
-
-        self.holding_tab = self.create_tab("Holding Registers")
-        self.input_tab = self.create_tab("Input Registers")
-        self.selftest_tab = self.create_tab("Self Test Registers")
-        self.parallel_tab = self.create_tab("Parallel Registers")
-
-        # Create treeviews in each tab
-        self.tree = self.create_register_table(self.holding_tab)
-        self.tooltip = RowTooltip(self.tree)
-
-        self.tree_input = self.create_register_table(self.input_tab)
-        self.tooltip_input = RowTooltip(self.tree_input)
-
-        self.tree_test = self.create_register_table(self.selftest_tab)
-        self.tooltip_test = RowTooltip(self.tree_test)
-
-        self.tree_parallel = self.create_register_table(self.parallel_tab)
-        self.tooltip_parallel = RowTooltip(self.tree_parallel)
+        self.notebook.grid(row=2, column=0, padx=10, pady=10, sticky="nsew")
+
+        self.tabs = {}
+        self.holding_tab = self.create_tab("holding", "Holding Registers")
+        # Input registers get rolling-statistics columns, one per window
+        stats_columns = tuple(window[0] for window in DEFAULT_WINDOWS)
+        self.input_tab = self.create_tab("input", "Input Registers",
+                                         ("address", "desc", "value") + stats_columns,
+                                         (120, 300, 150) + (260,) * len(stats_columns))
+        self.selftest_tab = self.create_tab("selftest", "Self Test Registers")
+        self.parallel_tab = self.create_tab("parallel", "Parallel Registers")
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        # Row updates are coalesced and applied in frames with a time budget.
+        self.renderer = RenderScheduler(master, stats=self.stats, stage=STAGE_TREE)
+
+        # Status bar with performance counters for the last refresh cycle
+        self.status_var = tk.StringVar(value=self.stats.status_text())
+        ttk.Label(master, textvariable=self.status_var, anchor="w", relief="sunken")\
+            .grid(row=3, column=0, padx=10, pady=(0, 5), sticky="ew")
 
         master.columnconfigure(0, weight=1)
-        master.rowconfigure(1, weight=1)
-
-        # Register definitions
-        self.holding_defs = HoldingRegisterDefinitions()
-        self.holding_registers = self.holding_defs.get_registers()
-
-        self.input_defs = InputRegisterDefinitions()
-        self.input_registers = self.input_defs.get_registers()
-
-        self.selftest_defs = SelfTestInputRegisterDefinitions()
-        self.selftest_registers = self.selftest_defs.get_registers()
-
-        self.parallel_defs = ParallelInputRegisterDefinitions()
-        self.parallel_registers = self.parallel_defs.get_registers()
+        master.rowconfigure(2, weight=1)
+
+        # Register tables, compiled once from the declarative register map.
+        # Definitions objects (rendering) are created per table on first use.
+        self.register_map = load_register_map(register_map_path)
+        self.definitions = {}
+
+        # Parallel system as a matrix: one row per unit, one column per metric,
+        # read as the aggregate block plus one block per slave.
+        self.parallel_layout = ParallelSystemLayout.from_table(self.register_map.table("parallel"))
+        self.last_parallel_reading = None
+
+        # Web dashboard fed from this poll loop, so viewers add no Modbus traffic
+        self.dashboard = None
+        if web_listen:
+            from web_dashboard import DashboardServer, DashboardState
+            self.dashboard = DashboardState({name: self.get_definitions(name) for name in DEFINITION_CLASSES})
+            DashboardServer(self.dashboard, web_listen).start()
+
+        # Pinned registers, read every watch_interval seconds between (and
+        # during) the full-table cycles as a minimal set of merged blocks.
+        self.watch = WatchList({})
+        self.watch_interval = watch_interval
+        self.watch_job = None
+        self.watch_due = 0.0
+        self.watch_polling = False
+        self.watch_status = ""
+
+        # Tables actually polled and displayed, pruned to the detected model
+        self.apply_profile(FULL_PROFILE)
+
+        # Alarm rules are matched against the full tables once, indexed by address
+        self.alarm_engine = None
+        self.alarm_watched = {}
+        if alarm_rules_path:
+            from alarm_rules import AlarmEngine, load_rules
+            rules, notifiers = load_rules(alarm_rules_path)
+            self.alarm_engine = AlarmEngine(rules, self.register_map.tables, notifiers)
+            self.alarm_watched = self.alarm_engine.watched
+
+        # Latest complete snapshot per table (see register_snapshot.py)
+        self.snapshot_sequence = 0
+        self.last_snapshots = {}
+        # Last raw value per table and address, for search value comparisons:
+        # registers an adaptive schedule skipped keep theirs between reads.
+        self.last_values = {}
+        self.first_value_shown = False
+
+        for ref in watch:
+            key = self.watch.resolve(ref)
+            if key is None:
+                logging.getLogger(__name__).warning("--watch: no register %r in the register map", ref)
+            else:
+                self.watch.pin(*key)
+        self.rebuild_watch_rows()
 
-        # Dictionaries to track row IDs and previous numeric values
-        self.prev_numeric_values = {}
-        self.prev_numeric_values_input = {}
-        self.prev_numeric_values_test = {}
-        self.prev_numeric_values_parallel = {}
+        self._lag_probe_due = time.perf_counter() + LOOP_LAG_PROBE_MS / 1000.0
+        self.master.after(LOOP_LAG_PROBE_MS, self.probe_loop_lag)
+        self.master.after_idle(self.stats.mark, "window")
 
-    def create_tab(self, title):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text=title)
+    def create_tab(self, name, title, columns=("address", "desc", "value"), widths=(120, 300, 150)):
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=title)
+        tab = self.tabs[name] = RegisterTab(name, title, frame, columns, widths)
         return tab
 
-    def create_register_table(self, parent, columns=("address", "desc", "value"), widths=(120, 300, 150)):
+    def current_tab(self):
+        selected = str(self.notebook.select())
+        for tab in self.tabs.values():
+            if str(tab.frame) == selected:
+                return tab
+        return None
+
+    def on_tab_changed(self, event=None):
+        tab = self.current_tab()
+        if tab is not None:
+            self.show_tab(tab)
+
+    def show_tab(self, tab):
+        """Build the tab's Treeview on first show, and fill it once connected."""
+        if tab.tree is None:
+            self.build_tab(tab)
+        if tab.populated or self.client is None:
+            return
+        tab.populated = True
+        if tab.name == "parallel":
+            # Matrix rows depend on the number of slaves and come with the first reading.
+            if self.last_parallel_reading is not None:
+                self.render_parallel(self.last_parallel_reading)
+            return
+        tree = tab.tree
+        for reg in self.tables[tab.name].registers:
+            row_id = tab.rowids[reg["address"]] = tree.insert(
+                "", "end", values=(f"0x{reg['address']:04X}", reg["description"], ""))
+            tab.row_order.append((reg["address"], row_id))
+        engine = self.derived_engines.get(tab.name)
+        if engine is not None:
+            for metric in engine.metrics:
+                value = metric.render() if metric.value is not None else ""
+                row_id = tab.derived_rowids[metric.name] = tree.insert("", "end", values=("derived", metric.name, value))
+                tab.row_order.append((metric.name, row_id))
+        snapshot = self.last_snapshots.get(tab.name)
+        if snapshot is not None:
+            self.render_snapshot(snapshot, tab)
+        if self.search_query:
+            self.filter_tab(tab)
+
+    def build_tab(self, tab):
+        if tab.name == "parallel":
+            metrics = self.parallel_layout.metrics if self.parallel_layout is not None else ()
+            tab.tree = self.create_register_table(tab.frame, ("unit",) + tuple(f"m{i}" for i in range(len(metrics))),
+                                                  (90,) + (110,) * len(metrics), xscroll=True)
+            for i, metric in enumerate(metrics):
+                tab.tree.heading(f"m{i}", text=metric.name)
+        else:
+            tab.tree = self.create_register_table(tab.frame, tab.columns, tab.widths)
+            tab.tree.bind("<Button-3>", lambda event, tab=tab: self.on_tab_menu(event, tab))
+        tab.tooltip = RowTooltip(tab.tree)
+
+    def reset_tab(self, tab):
+        """Forget a tab's rows; they are inserted again when it is next shown."""
+        if tab.tree is not None:
+            self.renderer.discard(tab.tree)
+            tab.tree.delete(*tab.tree.get_children())
+            tab.tooltip.row_tooltip_data.clear()
+        tab.populated = False
+        tab.rowids = {}
+        tab.derived_rowids = {}
+        tab.prev_values = {}
+        tab.row_order = []
+        tab.hidden = set()
+
+    def on_search_changed(self, *args):
+        # Coalesce keystrokes: filter once the event loop is idle.
+        if self.search_job is None:
+            self.search_job = self.master.after_idle(self.apply_search)
+
+    def apply_search(self):
+        self.search_job = None
+        self.search_query = SearchQuery(self.search_var.get())
+        for name in self.search_indexes:
+            self.filter_tab(self.tabs[name])
+
+    def search_value(self, name, key):
+        """Current numeric value of a row for value comparisons: a register address or derived metric name."""
+        if isinstance(key, str):
+            metric = next((m for m in self.derived_engines[name].metrics if m.name == key), None)
+            return metric.value if metric is not None else None
+        raw_list = self.last_values.get(name, {}).get(key)
+        if raw_list is None:
+            return None
+        return decode_numeric(self.tables[name].lookup(key), raw_list)
+
+    def filter_tab(self, tab):
+        """
+        Show only the rows matching the search, by detaching the others and
+        moving matches back to their place; rows are never re-created. The
+        match count goes into the tab title.
+        """
+        query = self.search_query
+        keys = self.search_indexes[tab.name].match(query, lambda key: self.search_value(tab.name, key))
+        self.notebook.tab(tab.frame, text=f"{tab.title} ({len(keys)})" if query else tab.title)
+        if not tab.populated:
+            return
+        tree = tab.tree
+        shown = set(keys)
+        index = 0
+        for key, row_id in tab.row_order:
+            if key in shown:
+                if row_id in tab.hidden:
+                    tree.move(row_id, "", index)
+                    tab.hidden.discard(row_id)
+                index += 1
+            elif row_id not in tab.hidden:
+                tree.detach(row_id)
+                tab.hidden.add(row_id)
+
+    def get_definitions(self, name):
+        defs = self.definitions.get(name)
+        if defs is None:
+            class_name = DEFINITION_CLASSES[name]
+            cls = getattr(importlib.import_module(class_name), class_name)
+            defs = self.definitions[name] = cls(self.register_map)
+        return defs
+
+    def create_register_table(self, parent, columns=("address", "desc", "value"), widths=(120, 300, 150),
+                              xscroll=False):
         frame = ttk.Frame(parent)
         frame.pack(fill="both", expand=True)
         tree = ttk.Treeview(frame, columns=columns, show="headings")
@@ -144,26 +420,116 @@ class ModbusGUI:
             anchor = "e" if col == "address" else "w"
             stretch = False if col in ("address", "value") else True
             tree.column(col, width=width, anchor=anchor, stretch=stretch)
+        tree.tag_configure('bg_green', background='LightGreen')
+        tree.tag_configure('bg_red', background='LightSalmon')
+        tree.tag_configure('white_bg', background='white')
         tree.grid(row=0, column=0, sticky="nsew")
         vsb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
         tree.configure(yscrollcommand=vsb.set)
         vsb.grid(row=0, column=1, sticky="ns")
+        if xscroll:
+            hsb = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
+            tree.configure(xscrollcommand=hsb.set)
+            hsb.grid(row=1, column=0, sticky="ew")
         frame.columnconfigure(0, weight=1)
         frame.rowconfigure(0, weight=1)
         return tree
 
+    def apply_profile(self, profile):
+        """Restrict polling and display to the registers valid for a model profile."""
+        self.profile = profile
+        caps = profile.capabilities
+        self.tables = {name: self.register_map.table(name).subset(caps) for name in DEFINITION_CLASSES}
+
+        # Derived metrics shown as extra rows at the bottom of each tab
+        self.derived_engines = {name: DerivedMetricsEngine(self.tables[name])
+                                for name in ("holding", "input", "selftest")}
+
+        # Search index per register tab, over its registers and derived metrics
+        self.search_indexes = {name: RegisterIndex(self.tables[name], engine.metrics)
+                               for name, engine in self.derived_engines.items()}
+
+        # Rolling min/max/mean/stddev/percentiles shown as extra columns
+        self.register_stats = {"input": StreamingStatsEngine(self.tables["input"])}
+
+        # The parallel system is shown as a matrix; its registers are not pinnable.
+        self.watch.set_tables({name: self.tables[name] for name in ("holding", "input", "selftest")})
+
+    def create_poll_schedulers(self):
+        """One adaptive poll scheduler per block-read table, if enabled."""
+        self.poll_schedulers = {}
+        interval = max(1, self.update_interval)
+        # Shared-memory snapshots cost nothing to read, so never skip there.
+        if self.adaptive_max < 2 * interval or self.attach_name or self.spawn_poller:
+            return
+        max_tier = 1
+        while max_tier * 2 * interval <= self.adaptive_max:
+            max_tier *= 2
+        for name in ("holding", "input", "selftest"):
+            self.poll_schedulers[name] = AdaptivePollScheduler(self.tables[name], max_tier,
+                                                               pinned=self.scheduler_pins(name))
+
+    def scheduler_pins(self, name):
+        """
+        Addresses a table's poll scheduler reads every cycle: alarm inputs, and
+        watched registers when there is no watch lane to read them.
+        """
+        pins = set(self.alarm_watched.get(name, ()))
+        if self.watch_interval <= 0:
+            pins.update(address for table_name, address in self.watch.pinned if table_name == name)
+        return pins
+
+    def select_profile(self, client):
+        if self.model_choice == "all":
+            return FULL_PROFILE
+        if self.model_choice == "auto":
+            return detect_profile(client, self.register_map)
+        # A forced model still auto-detects optional hardware such as Meter2.
+        return profile_for_model(self.register_map, self.model_choice,
+                                 detect_capabilities(client, self.register_map))
+
     def get_modbus_client(self):
         # Return the existing connection if available.
         if self.client is not None:
             return self.client
-        ip = self.ip_entry.get()
-        port = int(self.port_entry.get())
-        self.client = ModbusTcpClient(host=ip, port=port)
-        if not self.client.connect():
-            self.client = None
-            raise ConnectionError(f"Could not connect to {ip}:{port}")
+        if self.attach_name or self.spawn_poller:
+            self.client = self.attach_acquisition()
+            return self.client
+        self.client = connect_client(host=self.ip_entry.get(), port=int(self.port_entry.get()),
+                                     serial_port=self.serial_entry.get().strip() or None,
+                                     baudrate=int(self.baud_entry.get()), unit=int(self.unit_entry.get()))
         return self.client
 
+    def attach_acquisition(self):
+        from shared_snapshot import SharedSnapshotReader, SnapshotClient
+        name = self.attach_name
+        if name is None:
+            name = f"solax-gui-{os.getpid()}"
+            client_kwargs = {"host": self.ip_entry.get(), "port": int(self.port_entry.get()),
+                             "serial_port": self.serial_entry.get().strip() or None,
+                             "baudrate": int(self.baud_entry.get()), "unit": int(self.unit_entry.get())}
+            from modbus_poller import start_poller_process
+            self.poller = start_poller_process(name, client_kwargs, self.register_map_path, self.model_choice,
+                                               max(1, self.update_interval))
+            deadline = time.monotonic() + 15.0
+            while True:
+                try:
+                    reader = SharedSnapshotReader(name, self.register_map)
+                    break
+                except (FileNotFoundError, ValueError):     # not created, or header not written yet
+                    if not self.poller[0].is_alive() or time.monotonic() > deadline:
+                        self.poller = None
+                        raise ConnectionError("Acquisition process failed to start")
+                    time.sleep(0.05)
+        else:
+            reader = SharedSnapshotReader(name, self.register_map)
+        try:
+            reader.wait(timeout=30.0)
+        except TimeoutError:
+            reader.close()
+            raise ConnectionError(f"No data from acquisition process ({name})")
+        return SnapshotClient(reader)
+
     def format_raw_list(self, raw_list):
         if len(raw_list) == 1:
             raw_str = str(raw_list[0])
@@ -190,91 +556,292 @@ class ModbusGUI:
             prev_values[reg["address"]] = None
         return color_tag
 
-    def set_row_bg(self, tree_widget, row_id, color_tag):
-        tree_widget.tag_configure('bg_green', background='LightGreen')
-        tree_widget.tag_configure('bg_red', background='LightSalmon')
-        tree_widget.tag_configure('white_bg', background='white')
-        tree_widget.item(row_id, tags=(color_tag,))
+    def probe_loop_lag(self):
+        # A timer that fires late means the event loop was busy elsewhere.
+        now = time.perf_counter()
+        self.stats.add_sample(STAGE_LOOP_LAG, max(0.0, now - self._lag_probe_due))
+        self._lag_probe_due = now + LOOP_LAG_PROBE_MS / 1000.0
+        self.master.after(LOOP_LAG_PROBE_MS, self.probe_loop_lag)
+
+    def on_profile_cycle(self):
+        self.stats.arm_profile()
+        self.status_var.set("Profiling next refresh cycle...")
+
+    def on_export_stats(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")],
+                                            initialfile="modbus-gui-stats.json")
+        if not path:
+            return
+        try:
+            with open(path, "w") as f:
+                f.write(self.stats.to_json())
+        except OSError as e:
+            messagebox.showerror("Export Error", str(e))
+
+    def on_block_read(self, block, seconds, error):
+        self.stats.add_sample(STAGE_MODBUS, seconds)
+        self.stats.count_request(block.count, error=error)
+        # A full cycle blocks the event loop for many requests: slot the
+        # watch lane in between them so pinned values stay live.
+        self.poll_watch_if_due(repaint=True)
+
+    def on_watch_read(self, block, seconds, error):
+        self.stats.add_sample(STAGE_WATCH, seconds)
+
+    def on_tab_menu(self, event, tab):
+        row_id = tab.tree.identify_row(event.y)
+        address = next((address for address, rid in tab.rowids.items() if rid == row_id), None)
+        if not row_id or address is None:
+            return      # Derived-metric rows are not registers
+        key = (tab.name, address)
+        self.watch_menu.delete(0, "end")
+        if key in self.watch:
+            self.watch_menu.add_command(label="Unpin from watch list", command=lambda: self.set_pinned(key, False))
+        else:
+            self.watch_menu.add_command(label="Pin to watch list", command=lambda: self.set_pinned(key, True))
+        self.watch_menu.tk_popup(event.x_root, event.y_root)
+
+    def on_watch_menu(self, event):
+        row_id = self.watch_tree.identify_row(event.y)
+        key = next((key for key, rid in self.watch_rowids.items() if rid == row_id), None)
+        if not row_id or key is None:
+            return
+        self.watch_menu.delete(0, "end")
+        self.watch_menu.add_command(label="Unpin", command=lambda: self.set_pinned(key, False))
+        self.watch_menu.add_command(label="Unpin all", command=self.unpin_all)
+        self.watch_menu.tk_popup(event.x_root, event.y_root)
+
+    def set_pinned(self, key, pinned):
+        changed = self.watch.pin(*key) if pinned else self.watch.unpin(*key)
+        if changed:
+            scheduler = self.poll_schedulers.get(key[0])
+            if scheduler is not None:
+                scheduler.set_pinned(self.scheduler_pins(key[0]))
+            self.rebuild_watch_rows()
+            self.start_watch_lane()
+
+    def unpin_all(self):
+        for key in list(self.watch.pinned):
+            self.watch.unpin(*key)
+        for name, scheduler in self.poll_schedulers.items():
+            scheduler.set_pinned(self.scheduler_pins(name))
+        self.rebuild_watch_rows()
+
+    def rebuild_watch_rows(self):
+        """One watch-panel row per pinned register, in pin order; the panel is hidden when empty."""
+        tree = self.watch_tree
+        tree.delete(*tree.get_children())
+        self.watch_rowids = {}
+        self.watch_prev_values = {}
+        for name, reg in self.watch.registers():
+            self.watch_rowids[(name, reg["address"])] = tree.insert(
+                "", "end", values=(name, f"0x{reg['address']:04X}", reg["description"], ""))
+            # A register left out of the last snapshot (adaptive schedule) keeps a blank value.
+            snapshot = self.last_snapshots.get(name)
+            if snapshot is not None and reg["address"] in snapshot.values:
+                self.render_watch_value(name, reg, snapshot.values[reg["address"]])
+        if self.watch_rowids:
+            self.watch_frame.grid()
+        else:
+            self.watch_frame.grid_remove()
 
-    def fetch_and_update(self, reg_list, tree, address_to_rowid, prev_values, defs_obj, read_func):
+    def render_watch_value(self, name, reg, raw_list):
+        row_id = self.watch_rowids.get((name, reg["address"]))
+        if row_id is None:
+            return
+        if raw_list is None:
+            disp_str = "Error reading"
+            color_tag = "white_bg"
+        else:
+            disp_str = self.get_definitions(name).render_register(reg, raw_list)
+            color_tag = self.determine_color(reg, disp_str, self.watch_prev_values.setdefault(name, {}))
+        # A handful of rows: applied directly rather than through the renderer.
+        self.watch_tree.item(row_id, values=(name, f"0x{reg['address']:04X}", reg["description"], disp_str),
+                             tags=(color_tag,))
+
+    def start_watch_lane(self):
+        """Run the watch lane on its own timer, unless snapshots come from an acquisition process."""
+        if self.watch_job is not None or self.client is None or not self.watch or self.watch_interval <= 0:
+            return
+        if self.attach_name or self.spawn_poller:
+            return      # Pinned rows are then updated from the shared snapshots
+        self.watch_job = self.master.after(int(self.watch_interval * 1000), self.periodic_watch)
+
+    def stop_watch_lane(self):
+        if self.watch_job is not None:
+            self.master.after_cancel(self.watch_job)
+            self.watch_job = None
+
+    def periodic_watch(self):
+        self.watch_job = None
+        self.poll_watch_if_due()
+        self.start_watch_lane()
+
+    def poll_watch_if_due(self, repaint=False):
+        if (self.watch_polling or not self.watch or self.client is None or self.watch_interval <= 0
+                or self.attach_name or self.spawn_poller):
+            return
+        now = time.perf_counter()
+        if now < self.watch_due:
+            return
+        self.watch_due = now + self.watch_interval
+        self.watch_polling = True
+        try:
+            t0 = time.perf_counter()
+            _, values = self.watch.poll(self.client, self.on_watch_read)
+            elapsed = time.perf_counter() - t0
+        except Exception as e:
+            # The next full cycle reports connection problems; keep the lane quiet.
+            self.watch_status = f"watch error: {e}"
+            return
+        finally:
+            self.watch_polling = False
+        for name, reg, raw_list in values:
+            self.render_watch_value(name, reg, raw_list)
+        self.watch_status = (f"watch {len(self.watch)} registers in {self.watch.requests()} req, "
+                             f"{elapsed * 1000:.0f} ms")
+        if repaint:
+            self.watch_tree.update_idletasks()
+
+    def fetch_and_update(self, tab):
+        # Acquire the whole table first (one request per block of the read
+        # plan), then hand the complete snapshot to the display, derived
+        # metrics and alarms, so none of them mixes values from two passes.
+        table = self.tables[tab.name]
         try:
             client = self.get_modbus_client()
-            for reg in reg_list:
-                row_id = address_to_rowid[reg["address"]]
-                resp = read_func(client, reg["address"], reg["length"])
-                if resp.isError():
-                    raw_str, hex_str = "Error", "Error"
-                    disp_str = "Error reading"
-                    color_tag = "white_bg"
-                else:
-                    raw_list = resp.registers
-                    raw_str, hex_str = self.format_raw_list(raw_list)
-                    disp_str = defs_obj.render_register(reg, raw_list)
-                    color_tag = self.determine_color(reg, disp_str, prev_values)
-                tree.item(row_id, values=(f"0x{reg['address']:04X}", reg["description"], disp_str))
-                self.set_row_bg(tree, row_id, color_tag)
-                if tree == self.tree:
-                    self.tooltip.set_row_data(row_id, raw_str, hex_str)
-                elif tree == self.tree_input:
-                    self.tooltip_input.set_row_data(row_id, raw_str, hex_str)
-                elif tree == self.tree_test:
-                    self.tooltip_test.set_row_data(row_id, raw_str, hex_str)
+            self.snapshot_sequence += 1
+            scheduler = self.poll_schedulers.get(table.name)
+            read_plan = scheduler.plan() if scheduler is not None else None
+            # The acquisition process keeps its own quarantine.
+            quarantine = None if self.attach_name or self.spawn_poller else self.quarantine
+            snapshot = acquire_snapshot(client, table, self.snapshot_sequence, self.on_block_read, read_plan,
+                                        quarantine)
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+        self.last_snapshots[table.name] = snapshot
+        self.publish_snapshot(snapshot, tab)
+        if self.dashboard is not None:
+            self.dashboard.update(table.name, snapshot.items)
+        if scheduler is not None:
+            for reg, raw_list in snapshot.items:
+                scheduler.observe(reg["address"], raw_list)
+            scheduler.advance()
+
+    def publish_snapshot(self, snapshot, tab):
+        """Feed a snapshot to statistics, derived metrics and alarms; render it if the tab is shown."""
+        engine = self.derived_engines[tab.name]
+        derived_inputs = engine.input_addresses
+        numeric_values = {}
+        alarm_inputs = self.alarm_watched.get(snapshot.table, ())
+        alarm_values = {}
+        stats_engine = self.register_stats.get(tab.name)
+        if stats_engine is not None:
+            stats_engine.update(snapshot.values, snapshot.timestamp)
+        last_values = self.last_values.setdefault(tab.name, {})
+        for reg, raw_list in snapshot.items:
+            address = reg["address"]
+            if raw_list is not None:
+                last_values[address] = raw_list
+            if address in derived_inputs:
+                numeric_values[address] = decode_numeric(reg, raw_list) if raw_list is not None else None
+            if raw_list is not None and address in alarm_inputs:
+                alarm_values[address] = raw_list
+        changed = engine.update(numeric_values)
+        if tab.populated:
+            self.render_snapshot(snapshot, tab)
+            for metric in changed:
+                row_id = tab.derived_rowids.get(metric.name)
+                if row_id is not None:
+                    self.renderer.update(tab.tree, row_id, values=("derived", metric.name, metric.render()))
+        if self.search_query.needs_values:
+            self.filter_tab(tab)
+        if alarm_values:
+            self.alarm_engine.process(snapshot.table, alarm_values, snapshot.timestamp)
+        if self.watch and self.watch_job is None:
+            # No watch lane (acquisition process): pinned rows follow the snapshots.
+            # Registers the adaptive schedule skipped this cycle keep their value.
+            for name, reg in self.watch.registers():
+                if name == snapshot.table and reg["address"] in snapshot.values:
+                    self.render_watch_value(name, reg, snapshot.values[reg["address"]])
+
+    def render_snapshot(self, snapshot, tab):
+        stats = self.stats
+        perf_counter = time.perf_counter
+        tree = tab.tree
+        tooltip = tab.tooltip
+        address_to_rowid = tab.rowids
+        prev_values = tab.prev_values
+        defs_obj = self.get_definitions(tab.name)
+        stats_engine = self.register_stats.get(tab.name)
+        stats_addresses = stats_engine.addresses if stats_engine is not None else ()
+        for reg, raw_list in snapshot.items:
+            row_id = address_to_rowid[reg["address"]]
+            if raw_list is None:
+                raw_str, hex_str = "Error", "Error"
+                disp_str = "Error reading"
+                color_tag = "white_bg"
+            else:
+                t1 = perf_counter()
+                raw_str, hex_str = self.format_raw_list(raw_list)
+                disp_str = defs_obj.render_register(reg, raw_list)
+                stats.add_sample(STAGE_DECODE, perf_counter() - t1)
+                color_tag = self.determine_color(reg, disp_str, prev_values)
+            values = (f"0x{reg['address']:04X}", reg["description"], disp_str)
+            if reg["address"] in stats_addresses:
+                values += stats_engine.columns(reg["address"], snapshot.timestamp)
+            self.renderer.update(tree, row_id, values=values, tags=(color_tag,))
+            tooltip.set_row_data(row_id, raw_str, hex_str)
 
     def fetch_holding_data(self):
-        self.fetch_and_update(
-            self.holding_registers,
-            self.tree,
-            self.address_to_rowid,
-            self.prev_numeric_values,
-            self.holding_defs,
-            lambda client, addr, count: client.read_holding_registers(address=addr, count=count)
-        )
+        self.fetch_and_update(self.holding_tab)
 
     def fetch_data_input(self):
-        self.fetch_and_update(
-            self.input_registers,
-            self.tree_input,
-            self.address_to_rowid_input,
-            self.prev_numeric_values_input,
-            self.input_defs,
-            lambda client, addr, count: client.read_input_registers(address=addr, count=count)
-        )
+        self.fetch_and_update(self.input_tab)
 
     def fetch_data_selftest(self):
-        self.fetch_and_update(
-            self.selftest_registers,
-            self.tree_test,
-            self.address_to_rowid_test,
-            self.prev_numeric_values_test,
-            self.selftest_defs,
-            lambda client, addr, count: client.read_input_registers(address=addr, count=count)
-        )
+        self.fetch_and_update(self.selftest_tab)
 
     def fetch_data_parallel(self):
+        if self.parallel_layout is None:
+            return
         try:
             client = self.get_modbus_client()
-            for reg in self.parallel_registers:
-                address = reg["address"]
-                row_id = self.address_to_rowid_parallel[address]
-                if address in self.invalid_parallel_registers:
-                    self.tree_parallel.item(row_id, values=(f"0x{address:04X}", reg["description"], "Invalid (skipped)"))
-                    continue
-                resp = client.read_input_registers(address=address, count=reg["length"])
-                if resp.isError():
-                    self.invalid_parallel_registers.add(address)
-                    self.tree_parallel.item(row_id, values=(f"0x{address:04X}", reg["description"], "Invalid (unreadable)"))
-                    continue
-                raw_list = resp.registers
-                raw_str, hex_str = self.format_raw_list(raw_list)
-                disp_str = self.parallel_defs.render_register(reg, raw_list)
-                color_tag = self.determine_color(reg, disp_str, self.prev_numeric_values_parallel)
-                self.tree_parallel.item(row_id, values=(f"0x{address:04X}", reg["description"], disp_str))
-                self.set_row_bg(self.tree_parallel, row_id, color_tag)
-                self.tooltip_parallel.set_row_data(row_id, raw_str, hex_str)
+            reading = read_parallel_system(client, self.parallel_layout, self.on_block_read)
         except Exception:
-            pass
+            return      # Not a parallel system
+        self.last_parallel_reading = reading
+        if self.parallel_tab.populated:
+            self.render_parallel(reading)
+        if self.dashboard is not None:
+            self.dashboard.update("parallel", reading.items)
+        alarm_inputs = self.alarm_watched.get("parallel", ())
+        alarm_values = {reg["address"]: raw_list for reg, raw_list in reading.items
+                        if raw_list is not None and reg["address"] in alarm_inputs}
+        if alarm_values:
+            self.alarm_engine.process("parallel", alarm_values, reading.timestamp)
+
+    def render_parallel(self, reading):
+        tab = self.parallel_tab
+        tree = tab.tree
+        t0 = time.perf_counter()
+        rows = matrix_rows(reading)
+        labels = [label for label, _, _ in rows]
+        if labels != list(tab.rowids):
+            # The number of slaves changed (or first read): rebuild the rows.
+            self.renderer.discard(tree)
+            tree.delete(*tree.get_children())
+            tab.tooltip.row_tooltip_data.clear()
+            tab.rowids = {label: tree.insert("", "end", values=(label,)) for label in labels}
+        for label, cells, flagged in rows:
+            self.renderer.update(tree, tab.rowids[label], values=(label,) + tuple(cells),
+                                 tags=("bg_red" if flagged else "white_bg",))
+        for index, words in enumerate(reading.units):
+            if words is not None:
+                tab.tooltip.set_row_data(tab.rowids[f"Slave {index + 1}"], *self.format_raw_list(words))
+        self.stats.add_sample(STAGE_DECODE, time.perf_counter() - t0)
 
     def on_connect(self):
         try:
@@ -284,48 +851,37 @@ class ModbusGUI:
             return
         self.update_interval = new_interval
 
-        # Initialize treeviews and dictionaries.
-        self.address_to_rowid = {}
-        self.tree.delete(*self.tree.get_children())
-        self.tooltip.row_tooltip_data.clear()
-        for reg in self.holding_registers:
-            row_id = self.tree.insert("", "end", values=(f"0x{reg['address']:04X}", reg["description"], ""))
-            self.address_to_rowid[reg["address"]] = row_id
-            self.prev_numeric_values[reg["address"]] = None
-
-        self.address_to_rowid_input = {}
-        self.tree_input.delete(*self.tree_input.get_children())
-        self.tooltip_input.row_tooltip_data.clear()
-        for reg in self.input_registers:
-            row_id = self.tree_input.insert("", "end", values=(f"0x{reg['address']:04X}", reg["description"], ""))
-            self.address_to_rowid_input[reg["address"]] = row_id
-            self.prev_numeric_values_input[reg["address"]] = None
-
-        self.address_to_rowid_test = {}
-        self.tree_test.delete(*self.tree_test.get_children())
-        self.tooltip_test.row_tooltip_data.clear()
-        for reg in self.selftest_registers:
-            row_id = self.tree_test.insert("", "end", values=(f"0x{reg['address']:04X}", reg["description"], ""))
-            self.address_to_rowid_test[reg["address"]] = row_id
-            self.prev_numeric_values_test[reg["address"]] = None
-
-        self.address_to_rowid_parallel = {}
-        self.tree_parallel.delete(*self.tree_parallel.get_children())
-        self.tooltip_parallel.row_tooltip_data.clear()
-        for reg in self.parallel_registers:
-            row_id = self.tree_parallel.insert("", "end", values=(f"0x{reg['address']:04X}", reg["description"], ""))
-            self.address_to_rowid_parallel[reg["address"]] = row_id
-            self.prev_numeric_values_parallel[reg["address"]] = None
-
         try:
-            # Establish the persistent connection.
-            self.get_modbus_client()
+            # Establish the persistent connection and detect the model.
+            client = self.get_modbus_client()
+            self.apply_profile(self.select_profile(client))
+            self.create_poll_schedulers()
         except Exception as e:
             messagebox.showerror("Connection Error", str(e))
             return
+        self.stats.mark("connected")
+        self.quarantine.clear()
+        if self.dashboard is not None:
+            self.dashboard.set_tables(self.tables.values())
+        self.master.title(f"Solax X1/X3 Hybrid Inverter Modbus GUI - {self.profile.describe()}"
+                          f" ({self.client.description})")
+
+        # Only the visible tab gets its rows now; the others on first show.
+        self.stop_watch_lane()
+        self.rebuild_watch_rows()
+        self.last_snapshots = {}
+        self.last_values = {}
+        self.last_parallel_reading = None
+        self.first_value_shown = False
+        for tab in self.tabs.values():
+            self.reset_tab(tab)
+        self.on_tab_changed()
+        if self.search_query:
+            self.apply_search()     # match counts for the new tables
 
         # Initial fetch of all register sets.
         self.periodic_fetch_all()
+        self.start_watch_lane()
 
     def fetch_all_data(self):
         self.fetch_holding_data()
@@ -333,8 +889,54 @@ class ModbusGUI:
         self.fetch_data_selftest()
         self.fetch_data_parallel()
 
+    def acquisition_problem(self):
+        """Why the shared snapshots are not current (the poller process died or stopped publishing), or None."""
+        if self.poller is not None and not self.poller[0].is_alive():
+            return "acquisition stopped"
+        snapshot = self.client.snapshot
+        if snapshot is None:
+            return None
+        age = time.time() - snapshot.timestamp
+        if age > max(STALE_AFTER_MIN, STALE_AFTER_INTERVALS * self.update_interval):
+            return f"stale data ({age:.0f} s old)"
+        return None
+
     def periodic_fetch_all(self):
+        # With a separate acquisition process, render each published snapshot
+        # once; all tables of a cycle come from the same snapshot.
+        attached = self.attach_name or self.spawn_poller
+        if attached and not self.client.refresh():
+            problem = self.acquisition_problem()
+            if problem:
+                self.status_var.set(f"{self.stats.status_text()} | {problem}")
+            if self.update_interval > 0:
+                self.master.after(self.update_interval * 1000, self.periodic_fetch_all)
+            return
+        self.stats.begin_cycle()
         self.fetch_all_data()
+        self.stats.end_cycle()
+        if not self.first_value_shown:
+            # Paint the first values right away rather than in budgeted frames.
+            self.renderer.flush()
+            self.first_value_shown = True
+            self.stats.mark("first_value")
+        if self.dashboard is not None:
+            self.dashboard.publish()
+        status = self.stats.status_text()
+        if self.poll_schedulers:
+            due = [scheduler.summary() for scheduler in self.poll_schedulers.values()]
+            status += f" | next poll {sum(d for d, _ in due)}/{sum(n for _, n in due)} registers"
+        if self.alarm_engine is not None:
+            status += f" | active alarms {len(self.alarm_engine.active_alarms())}"
+        if self.quarantine:
+            status += f" | quarantined {len(self.quarantine)} registers"
+        if self.watch_status:
+            status += f" | {self.watch_status}"
+        if attached:
+            problem = self.acquisition_problem()
+            if problem:
+                status += f" | {problem}"
+        self.status_var.set(status)
         if self.update_interval > 0:
             self.master.after(self.update_interval * 1000, self.periodic_fetch_all)
 
@@ -342,6 +944,28 @@ def parse_args():
     parser = argparse.ArgumentParser(description="Solax X1/X3 Hybrid Inverter Modbus GUI.")
     parser.add_argument("--host", default="192.168.0.100", help="Inverter IP. Optionally specify as host:port")
     parser.add_argument("--interval", type=int, default=10, help="Update interval in seconds")
+    parser.add_argument("--model", default="auto",
+                        help="Inverter model profile: auto (detect on connect), all, or a model such as X1/X3")
+    parser.add_argument("--alarm-rules", default=None,
+                        help="JSON file with alarm rules (see alarm_rules.example.json)")
+    parser.add_argument("--register-map", default=None,
+                        help="Register map file for the inverter model/firmware (default: bundled Solax G3 map)")
+    parser.add_argument("--serial", default="", help="Use Modbus RTU on this serial port instead of TCP (e.g. /dev/ttyUSB0)")
+    parser.add_argument("--baud", type=int, default=DEFAULT_BAUDRATE, help="RTU baud rate")
+    parser.add_argument("--unit", type=int, default=DEFAULT_UNIT, help="Modbus unit (slave) id")
+    parser.add_argument("--poller", action="store_true",
+                        help="Poll in a separate acquisition process and display its shared-memory snapshots")
+    parser.add_argument("--attach", default=None, metavar="NAME",
+                        help="Display snapshots from a running modbus_poller.py --name NAME instead of polling")
+    parser.add_argument("--web", default=None, metavar="[ADDR:]PORT",
+                        help="Also serve a live web dashboard, e.g. --web 8080 or --web 0.0.0.0:8080")
+    parser.add_argument("--adaptive-max", type=int, default=0, metavar="SECONDS",
+                        help="Read registers that rarely change less often, at most every SECONDS (0 = off)")
+    parser.add_argument("--watch", default="", metavar="REGS",
+                        help="Comma-separated registers to pin to the watch panel, as descriptions or 0x "
+                             "addresses, optionally prefixed by table (e.g. input:0x0014,Temperature)")
+    parser.add_argument("--watch-interval", type=float, default=DEFAULT_WATCH_INTERVAL, metavar="SECONDS",
+                        help="Polling interval of the watch panel (0 = only with the full refresh)")
     args = parser.parse_args()
     if ':' in args.host:
         host, port_str = args.host.split(':', 1)
@@ -357,9 +981,15 @@ def parse_args():
 
 def main():
     args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
     root = tk.Tk()
     # Pass both host and port as default values for the GUI.
-    app = ModbusGUI(root, default_ip=args.host, default_port=str(args.port), update_interval=args.interval)
+    app = ModbusGUI(root, default_ip=args.host, default_port=str(args.port), update_interval=args.interval,
+                    register_map_path=args.register_map, model=args.model,
+                    alarm_rules_path=args.alarm_rules, serial_port=args.serial, baudrate=args.baud,
+                    unit=args.unit, attach_name=args.attach, spawn_poller=args.poller,
+                    adaptive_max=args.adaptive_max, web_listen=args.web,
+                    watch=[ref for ref in args.watch.split(",") if ref.strip()], watch_interval=args.watch_interval)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+# streaming_stats.py
+import math
+
+from register_utils import decode_numeric
+
+# Rolling windows: (label, length in seconds, number of ring buckets). A window
+# covers the last length-bucket..length seconds, moving one bucket at a time.
+DEFAULT_WINDOWS = (
+    ("1 min", 60, 12),
+    ("15 min", 15 * 60, 15),
+    ("1 day", 24 * 3600, 24),
+)
+
+
+class Welford:
+    """Running count/mean/variance/min/max (Welford), mergeable (Chan et al.)."""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other):
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class QuantileSketch:
+    """
+    Fixed-memory, mergeable quantile sketch: a histogram over the register's
+    own resolution (its scale), so quantiles start out exact. When more than
+    `max_bins` buckets are occupied, neighbouring buckets are paired up,
+    doubling the bucket width; the error stays within half a bucket width.
+    Merging first brings both sketches to the coarser width, then adds counts.
+    """
+
+    __slots__ = ("resolution", "max_bins", "level", "bins", "count")
+
+    def __init__(self, resolution=1.0, max_bins=256):
+        self.resolution = resolution
+        self.max_bins = max_bins
+        self.level = 0
+        self.bins = {}
+        self.count = 0
+
+    def _coarsen(self, level):
+        shift = level - self.level
+        bins = {}
+        for key, count in self.bins.items():
+            key >>= shift
+            bins[key] = bins.get(key, 0) + count
+        self.bins = bins
+        self.level = level
+
+    def add(self, x):
+        key = round(x / self.resolution) >> self.level
+        bins = self.bins
+        bins[key] = bins.get(key, 0) + 1
+        self.count += 1
+        if len(bins) > self.max_bins:
+            self._coarsen(self.level + 1)
+
+    def merge(self, other):
+        if other.level > self.level:
+            self._coarsen(other.level)
+        shift = self.level - other.level
+        bins = self.bins
+        for key, count in other.bins.items():
+            key >>= shift
+            bins[key] = bins.get(key, 0) + count
+        self.count += other.count
+        while len(bins) > self.max_bins:
+            self._coarsen(self.level + 1)
+            bins = self.bins
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        width = 1 << self.level
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return (key * width + (width - 1) / 2) * self.resolution
+        return None
+
+
+class _Bucket:
+    __slots__ = ("start", "moments", "sketch")
+
+    def __init__(self, start, resolution):
+        self.start = start
+        self.moments = Welford()
+        self.sketch = QuantileSketch(resolution)
+
+
+class RollingWindow:
+    """
+    Statistics over the last `length` seconds kept in a ring of `buckets`
+    sub-windows. A sample updates only the current bucket; a summary merges
+    the live buckets. Memory is fixed by the bucket count and sketch size.
+    """
+
+    def __init__(self, label, length, buckets, resolution=1.0):
+        self.label = label
+        self.resolution = resolution
+        self.length = length
+        self.width = length / buckets
+        self.ring = [None] * buckets
+
+    def _bucket(self, timestamp):
+        index = int(timestamp // self.width)
+        slot = index % len(self.ring)
+        bucket = self.ring[slot]
+        start = index * self.width
+        if bucket is None or bucket.start != start:
+            bucket = self.ring[slot] = _Bucket(start, self.resolution)
+        return bucket
+
+    def add(self, value, timestamp):
+        bucket = self._bucket(timestamp)
+        bucket.moments.add(value)
+        bucket.sketch.add(value)
+
+    def summary(self, now):
+        moments = Welford()
+        sketch = QuantileSketch(self.resolution)
+        oldest = now - self.length
+        for bucket in self.ring:
+            if bucket is not None and bucket.start + self.width > oldest:
+                moments.merge(bucket.moments)
+                sketch.merge(bucket.sketch)
+        return moments, sketch
+
+
+class StreamingStatsEngine:
+    """
+    Rolling statistics for the registers named in a table's "statistics"
+    list (descriptions or "0x...." addresses). update() is fed every
+    snapshot; columns() renders one summary per window for display.
+    """
+
+    def __init__(self, table, windows=DEFAULT_WINDOWS):
+        self.windows = windows
+        self.registers = {}
+        self._windows = {}
+        for ref in getattr(table, "statistics", ()):
+            reg = table.lookup(int(ref, 0)) if ref.lower().startswith("0x") else table.lookup(ref)
+            if reg is None or reg["length"] > 2:
+                continue
+            self.registers[reg["address"]] = reg
+            self._windows[reg["address"]] = [RollingWindow(*window, resolution=reg.get("scale", 1.0))
+                                             for window in windows]
+        self.addresses = frozenset(self.registers)
+        self.labels = tuple(window[0] for window in windows)
+
+    def update(self, values, timestamp):
+        """Feed raw values ({address: raw_list or None}) of one snapshot."""
+        for address in self.addresses:
+            raw_list = values.get(address)
+            if raw_list is None:
+                continue
+            value = decode_numeric(self.registers[address], raw_list)
+            if value is None:
+                continue
+            for window in self._windows[address]:
+                window.add(value, timestamp)
+
+    def summaries(self, address, now):
+        return [window.summary(now) for window in self._windows[address]]
+
+    def columns(self, address, now):
+        """One display string per window: mean ±stddev [min..max] p5/p95."""
+        reg = self.registers[address]
+        digits = max(0, -int(math.floor(math.log10(reg.get("scale", 1.0))))) if reg.get("scale", 1.0) < 1 else 0
+        texts = []
+        for moments, sketch in self.summaries(address, now):
+            if not moments.count:
+                texts.append("")
+                continue
+            fmt = f"{{:.{digits}f}}"
+            texts.append(f"{fmt.format(moments.mean)} ±{fmt.format(moments.stddev)} "
+                         f"[{fmt.format(moments.min)}..{fmt.format(moments.max)}] "
+                         f"p5 {fmt.format(sketch.quantile(0.05))} p95 {fmt.format(sketch.quantile(0.95))}")
+        return tuple(texts)
@@ -0,0 +1,69 @@
+import pytest
+
+from address_quarantine import AddressQuarantine
+from inverter_simulator import SimulatedInverter
+from register_map import load_register_map
+from register_snapshot import acquire_snapshot
+
+BATTERY = (0x0014, 0x0015, 0x0016)      # group "Battery": voltage, current, power
+
+
+@pytest.fixture
+def setup():
+    table = load_register_map().table("input")
+    simulator = SimulatedInverter(seed=1)
+    now = [0.0]
+    quarantine = AddressQuarantine(clock=lambda: now[0])
+    return table, simulator, quarantine, now
+
+
+def acquire(table, simulator, quarantine):
+    requests = []
+    snapshot = acquire_snapshot(simulator, table, quarantine=quarantine,
+                                on_request=lambda block, seconds, error: requests.append(block))
+    return snapshot, requests
+
+
+def assert_groups_whole(table, requests):
+    """Every request reads all members of a group that it reads any of."""
+    defined = {reg["address"] for reg in table.registers}
+    for _, addresses in table.groups:
+        members = set(addresses) & defined
+        for block in requests:
+            read = {reg["address"] for reg in block.registers} & members
+            assert not read or read == members, (block, addresses)
+
+
+def test_failing_group_member_quarantines_the_group(setup):
+    table, simulator, quarantine, now = setup
+    del simulator.input[0x0015]
+    snapshot, requests = acquire(table, simulator, quarantine)
+    assert_groups_whole(table, requests)
+    assert {address for _, address in quarantine.entries} == set(BATTERY)
+    assert all(snapshot.values[address] is None for address in BATTERY)
+    assert sum(raw_list is None for raw_list in snapshot.values.values()) == len(BATTERY)
+
+    # Next cycles leave the group out whole and keep the other groups in one request.
+    snapshot, requests = acquire(table, simulator, quarantine)
+    assert_groups_whole(table, requests)
+    assert not any(reg["address"] in BATTERY for block in requests for reg in block.registers)
+    assert sum(raw_list is None for raw_list in snapshot.values.values()) == len(BATTERY)
+
+
+def test_group_is_probed_and_released_as_a_whole(setup):
+    table, simulator, quarantine, now = setup
+    del simulator.input[0x0015]
+    acquire(table, simulator, quarantine)
+
+    now[0] = quarantine.reprobe_delay
+    _, requests = acquire(table, simulator, quarantine)
+    probes = [block for block in requests if block.start == BATTERY[0]]
+    assert [tuple(reg["address"] for reg in block.registers) for block in probes] == [BATTERY]
+    assert len(quarantine) == len(BATTERY)      # probe failed: still quarantined, with a longer delay
+
+    simulator.input[0x0015] = 0
+    now[0] = 10 * quarantine.reprobe_delay
+    snapshot, requests = acquire(table, simulator, quarantine)
+    assert_groups_whole(table, requests)
+    assert len(quarantine) == 0
+    assert all(snapshot.values[address] is not None for address in BATTERY)
@@ -0,0 +1,38 @@
+import pytest
+
+from derived_metrics import DerivedMetric, DerivedMetricsEngine
+from register_map import load_register_map
+
+
+def compiled(expression):
+    metric = DerivedMetric({"name": "test", "expression": expression})
+    metric.compile()
+    return metric
+
+
+def test_expressions_of_the_register_map_compile():
+    register_map = load_register_map()
+    for table in register_map.tables.values():
+        engine = DerivedMetricsEngine(table)
+        assert len(engine.metrics) == len(table.derived)
+
+
+def test_arithmetic_on_references():
+    metric = compiled("max({Powerdc1(Hybrid)} + {Powerdc2(Hybrid)}, 0) / 2 if {0x00C4} else -1")
+    assert metric.refs == ["Powerdc1(Hybrid)", "Powerdc2(Hybrid)", "0x00C4"]
+    assert metric.func(300, 100, 1) == 200
+    assert metric.func(300, 100, 0) == -1
+
+
+@pytest.mark.parametrize("expression", [
+    "9 ** 9 ** 9",
+    "{a} ** 2",
+    "'x' * 10 ** 12",
+    "'x' * 1000000000000",
+    "__import__('os')",
+    "{a}.real",
+    "open",
+])
+def test_unsafe_or_unbounded_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        compiled(expression)
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from energy_rollups import CounterTracker, EnergyRollups, _hour_slices, query_rollups
+from register_map import load_register_map
+
+FEEDIN_TODAY = ("input", 0x0098)       # feedin_energy_today, 32-bit, 0.01 kWh
+
+
+def at(hour, minute=0, day=1):
+    return datetime(2024, 6, day, hour, minute).timestamp()
+
+
+def words(raw):
+    return [raw & 0xFFFF, raw >> 16]
+
+
+def tracker():
+    return CounterTracker("feedin_energy_today", FEEDIN_TODAY, {"length": 2, "scale": 0.01})
+
+
+def feed(counter, readings):
+    """Total raw increment over `readings`, taken one minute apart."""
+    total = 0
+    for i, raw in enumerate(readings):
+        increment, since = counter.update(raw, at(12, i))
+        if since is not None:
+            total += increment
+    return total
+
+
+def test_midnight_reset_counts_the_new_day_from_zero():
+    counter = tracker()
+    counter.update(1500, at(23, 58))
+    counter.update(1510, at(23, 59))
+    # 00:00 the "today" counter restarts; the drop is only believed once confirmed
+    assert counter.update(3, at(0, 0, day=2)) == (0, at(23, 59))
+    assert counter.update(8, at(0, 1, day=2)) == (8, at(23, 59))
+    assert counter.update(12, at(0, 2, day=2)) == (4, at(0, 1, day=2))
+
+
+def test_32_bit_counter_wraps_around():
+    counter = tracker()
+    top = (1 << 32) - 0x100
+    assert feed(counter, [top - 0x10, top, 0x10, 0x20]) == 0x10 + 0x100 + 0x20
+
+
+def test_single_bad_low_read_is_not_a_reset():
+    counter = tracker()
+    assert feed(counter, [1000, 1004, 5, 1010, 1012]) == 12
+    assert counter.pending is None
+
+
+def test_repeated_low_reads_after_a_drop_are_a_reset():
+    counter = tracker()
+    assert feed(counter, [1000, 5, 5]) == 5
+
+
+def test_old_or_repeated_readings_are_ignored():
+    counter = tracker()
+    counter.update(1000, at(12))
+    counter.update(1010, at(13))
+    assert counter.update(1005, at(12, 30)) == (0, None)
+    assert counter.update(1010, at(13)) == (0, None)
+    assert counter.raw == 1010 and counter.pending is None
+
+
+def test_hour_slices_cover_an_interval_in_proportion():
+    slices = list(_hour_slices(at(13, 30), at(16, 0)))
+    assert [hour.hour for hour, _ in slices] == [13, 14, 15]
+    assert [share for _, share in slices] == pytest.approx([0.2, 0.4, 0.4])
+
+
+def test_increment_spanning_hours_is_spread_over_them(tmp_path):
+    with EnergyRollups(str(tmp_path / "energy.sqlite"), load_register_map(), ["feedin_energy_today"],
+                       commit_interval=float("inf")) as rollups:
+        rollups.update({FEEDIN_TODAY: words(1000)}, at(13, 30))
+        rollups.update({FEEDIN_TODAY: words(1250)}, at(16, 0))      # 2.5 kWh over 2.5 hours
+        rollups.commit()
+        hours = query_rollups(rollups.db, "hour", "2024-06-01")
+        assert {bucket: values["feedin_energy_today"] for bucket, values in hours.items()} == pytest.approx(
+            {"2024-06-01T13": 0.5, "2024-06-01T14": 1.0, "2024-06-01T15": 1.0})
+        assert query_rollups(rollups.db, "day")["2024-06-01"]["feedin_energy_today"] == pytest.approx(2.5)
+
+
+def test_reimporting_the_same_readings_adds_nothing(tmp_path):
+    path = str(tmp_path / "energy.sqlite")
+    readings = [(at(10, minute), words(raw)) for minute, raw in ((0, 100), (20, 140), (40, 190))]
+    for _ in range(2):
+        with EnergyRollups(path, load_register_map(), ["feedin_energy_today"]) as rollups:
+            for timestamp, raw_list in readings:
+                rollups.update({FEEDIN_TODAY: raw_list}, timestamp)
+    with EnergyRollups(path, load_register_map(), ["feedin_energy_today"]) as rollups:
+        assert query_rollups(rollups.db, "day")["2024-06-01"]["feedin_energy_today"] == pytest.approx(0.9)
@@ -0,0 +1,63 @@
+import pytest
+
+from export_control import EXPORT_LIMIT_ADDR, ExportController, PIControlLaw
+from inverter_simulator import SimulatedInverter
+from register_map import load_register_map
+
+
+@pytest.fixture(scope="module")
+def register_map():
+    return load_register_map()
+
+
+def test_pi_law_ignores_errors_inside_deadband():
+    law = PIControlLaw(target=0.0, deadband=50.0)
+    assert law.update(40.0, 1200.0, 1.0) == 1200.0
+
+
+def test_pi_law_is_proportional_to_error_changes_and_integrates_the_error():
+    law = PIControlLaw(target=0.0, kp=0.5, ki=1.0, deadband=0.0)
+    # A constant error only moves the output by ki * error * dt per update ...
+    assert law.update(200.0, 1000.0, 0.5) == 900.0
+    assert law.update(200.0, 900.0, 0.5) == 800.0
+    # ... and a change of the error adds kp times the change once.
+    assert law.update(100.0, 800.0, 0.5) == 800.0 + 0.5 * 100.0 - 1.0 * 100.0 * 0.5
+    assert law.update(100.0, 800.0, 0.5) == 750.0
+
+
+def test_pi_law_leaves_a_limit_as_soon_as_the_error_changes_sign():
+    law = PIControlLaw(target=0.0, kp=0.5, ki=1.0, out_min=0.0, out_max=10000.0)
+    output = 0.0
+    for _ in range(20):
+        output = law.update(2000.0, output, 1.0)
+    assert output == 0.0
+    assert law.update(-300.0, output, 1.0) > 0.0
+
+
+def run_loop(register_map, target, steps, dt=0.5):
+    simulator = SimulatedInverter(register_map, seed=3)
+    law = PIControlLaw(target=target, deadband=50.0)
+    controller = ExportController(simulator, law, period=dt, register_map=register_map, min_write_interval=0.0)
+    samples = []
+    for _ in range(steps):
+        samples.append(controller.step(dt))
+        simulator.step(dt)
+    return simulator, controller, samples
+
+
+def test_export_limit_drives_feedin_to_target(register_map):
+    simulator, controller, samples = run_loop(register_map, target=0.0, steps=60)
+    assert samples[0].feedin_power == pytest.approx(700.0, abs=100.0)
+    # The limit comes down from 10000 W in steps of at most max_step ...
+    outputs = [sample.output for sample in samples]
+    assert all(abs(b - a) <= controller.max_step for a, b in zip([10000.0] + outputs, outputs))
+    # ... until the inverter curtails export to within the deadband of the target.
+    assert all(abs(sample.feedin_power) <= 50.0 for sample in samples[-10:])
+    assert simulator.holding[EXPORT_LIMIT_ADDR] == samples[-1].output <= 50.0
+    assert controller.stats.to_json()
+
+
+def test_export_limit_settles_on_a_positive_target_without_undershoot(register_map):
+    _, _, samples = run_loop(register_map, target=300.0, steps=60)
+    assert all(abs(sample.feedin_power - 300.0) <= 50.0 for sample in samples[-10:])
+    assert min(sample.output for sample in samples) >= 250.0
@@ -0,0 +1,98 @@
+import pytest
+
+from holding_config import plan_writes, restore_snapshot, take_snapshot
+from inverter_simulator import SimulatedInverter, SimulatedResponse
+from register_map import load_register_map
+
+VPV_START, TIME_START, VPV_HIGH_STOP = 0x0015, 0x0016, 0x0017
+SAFETY_TYPE, REV, GRID_AVG_PROTECT = 0x001D, 0x001E, 0x001F      # REV is read-only
+
+
+@pytest.fixture
+def table():
+    return load_register_map().table("holding")
+
+
+@pytest.fixture
+def simulator():
+    return SimulatedInverter(seed=1)
+
+
+def changed(live, changes):
+    """Copy of a snapshot with the first word of each {address: delta} register moved by delta."""
+    target = {address: list(words) for address, words in live.items()}
+    for address, delta in changes.items():
+        target[address] = [(target[address][0] + delta) & 0xFFFF] + target[address][1:]
+    return target
+
+
+def test_writes_bridge_unchanged_writable_registers(table, simulator):
+    live = take_snapshot(simulator, table)
+    target = changed(live, {0x0015: 1, 0x0017: 1})
+    assert plan_writes(table, live, target) == [
+        (VPV_START, target[VPV_START] + live[TIME_START] + target[VPV_HIGH_STOP])]
+    assert plan_writes(table, live, target, max_gap=0) == [
+        (VPV_START, target[VPV_START]), (VPV_HIGH_STOP, target[VPV_HIGH_STOP])]
+
+
+def test_bridge_is_limited_to_max_gap(table, simulator):
+    live = take_snapshot(simulator, table)
+    target = changed(live, {0x001F: 1, 0x0028: 1})      # eight unchanged registers in between
+    assert [start for start, _ in plan_writes(table, live, target)] == [0x1F]
+    target = changed(live, {0x001F: 1, 0x0029: 1})      # nine
+    assert [start for start, _ in plan_writes(table, live, target)] == [0x1F, 0x29]
+
+
+def test_readonly_registers_are_never_written_or_bridged(table, simulator):
+    live = take_snapshot(simulator, table)
+    target = changed(live, {0x001D: 1, 0x001F: 1})
+    target[REV] = [0x1234]          # not in the read plan, so not in `live` either
+    assert plan_writes(table, live, target) == [
+        (SAFETY_TYPE, target[SAFETY_TYPE]), (GRID_AVG_PROTECT, target[GRID_AVG_PROTECT])]
+    writes, failures = restore_snapshot(simulator, table, target)
+    assert failures == [] and len(writes) == 2
+    assert simulator.holding[REV] != 0x1234
+    assert simulator.holding[SAFETY_TYPE] == target[SAFETY_TYPE][0]
+
+
+def test_unknown_addresses_and_wrong_lengths_are_ignored(table, simulator):
+    live = take_snapshot(simulator, table)
+    target = changed(live, {0x0015: 1})
+    target[0x0FFF] = [1]
+    target[TIME_START] = [1, 2]
+    assert plan_writes(table, live, target) == [(VPV_START, target[VPV_START])]
+
+
+def test_restore_makes_the_inverter_match_and_is_idempotent(table, simulator):
+    live = take_snapshot(simulator, table)
+    target = changed(live, {0x0015: 3, 0x0017: 1, 0x001F: 2, 0x008C: 5})
+    writes, failures = restore_snapshot(simulator, table, target, dry_run=True)
+    assert len(writes) == 3 and take_snapshot(simulator, table) == live
+    writes, failures = restore_snapshot(simulator, table, target)
+    assert len(writes) == 3 and failures == []
+    assert take_snapshot(simulator, table) == target
+    assert restore_snapshot(simulator, table, target) == ([], [])
+
+
+class ClampingInverter(SimulatedInverter):
+    """Clamps VpvStart to 1000 and rejects writes that touch GridAvgProtect."""
+
+    def write_registers(self, address, values, **kwargs):
+        if address <= GRID_AVG_PROTECT < address + len(values):
+            return SimulatedResponse(error="Exception Response: IllegalValue")
+        response = super().write_registers(address, values, **kwargs)
+        if address <= VPV_START < address + len(values):
+            self.holding[VPV_START] = min(self.holding[VPV_START], 1000)
+        return response
+
+
+def test_restore_reports_write_errors_and_read_back_mismatches(table):
+    simulator = ClampingInverter(seed=1)
+    live = take_snapshot(simulator, table)
+    target = changed(live, {0x001F: 1})
+    target[VPV_START] = [2000]
+    writes, failures = restore_snapshot(simulator, table, target)
+    assert [start for start, _ in writes] == [VPV_START, GRID_AVG_PROTECT]
+    assert [start for start, _ in failures] == [VPV_START, GRID_AVG_PROTECT]
+    assert failures[0][1].startswith("read-back mismatch: wrote [2000], read [1000]")
+    assert failures[1][1].startswith("write failed: ")
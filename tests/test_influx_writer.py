@@ -0,0 +1,42 @@
+import pytest
+
+from influx_writer import LineProtocolEncoder
+from inverter_simulator import SimulatedInverter
+from modbus_poller import Poller
+from register_map import load_register_map
+
+
+@pytest.fixture(scope="module")
+def lines():
+    register_map = load_register_map()
+    values, _ = Poller(SimulatedInverter(register_map, seed=1), register_map).poll()
+    return LineProtocolEncoder(register_map).encode(values, 1717243200.0)
+
+
+def series_key(line):
+    # measurement and tags: everything before the first unescaped space
+    i = 0
+    while line[i] != " " or line[i - 1] == "\\":
+        i += 1
+    return line[:i]
+
+
+def test_every_series_key_of_a_cycle_is_unique(lines):
+    keys = [series_key(line) for line in lines]
+    assert len(keys) > 500
+    assert len(set(keys)) == len(keys)
+
+
+def test_repeated_descriptions_are_told_apart_by_address(lines):
+    keys = [series_key(line) for line in lines]
+    temperature = [key for key in keys if key.startswith("solax,table=input,register=TemperatureBat,")]
+    assert sorted(temperature) == ["solax,table=input,register=TemperatureBat,address=0x0018,unit=°C",
+                                   "solax,table=input,register=TemperatureBat,address=0x00C6,unit=°C"]
+
+
+def test_reserved_words_are_not_written(lines):
+    assert not [line for line in lines if ",register=REV" in line or ",register=Rev" in line]
+
+
+def test_derived_metrics_are_written(lines):
+    assert any(line.startswith("solax,table=input,register=PV\\ Power\\ Total,unit=W value=") for line in lines)
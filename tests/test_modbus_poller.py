@@ -0,0 +1,71 @@
+import os
+import threading
+
+import pytest
+
+import modbus_poller
+from inverter_simulator import FEEDIN_POWER_ADDR, SimulatedInverter
+from register_map import load_register_map
+from shared_snapshot import STATUS_ERROR, STATUS_VALID, SharedSnapshotReader
+
+
+class DroppingInverter(SimulatedInverter):
+    """Simulator whose connection drops: every request raises while `down` is set."""
+
+    def __init__(self, register_map):
+        super().__init__(register_map, seed=1)
+        self.down = threading.Event()
+        self.connects = 0
+
+    def _read(self, bank, address, count):
+        if self.down.is_set():
+            raise ConnectionResetError("Connection reset by peer")
+        return super()._read(bank, address, count)
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs POSIX shared memory")
+def test_poller_reconnects_after_transport_failure(monkeypatch):
+    register_map = load_register_map()
+    simulator = DroppingInverter(register_map)
+
+    def connect_client(**kwargs):
+        simulator.connects += 1
+        if simulator.down.is_set():
+            raise ConnectionError("Could not connect to simulated inverter")
+        return simulator
+
+    monkeypatch.setattr(modbus_poller, "connect_client", connect_client)
+    monkeypatch.setattr(modbus_poller, "RECONNECT_MIN", 0.01)
+    monkeypatch.setattr(modbus_poller, "RECONNECT_MAX", 0.02)
+    name = f"slx-test-{os.getpid()}"
+    stop_event = threading.Event()
+    thread = threading.Thread(target=modbus_poller.run_poller, args=(name, {}, None, "all", 0.01, stop_event))
+    thread.start()
+    try:
+        reader = None
+        while reader is None and thread.is_alive():
+            try:
+                reader = SharedSnapshotReader(name, register_map)
+            except (FileNotFoundError, ValueError):     # not created, or header not written yet
+                stop_event.wait(0.01)
+        snapshot = reader.wait(timeout=5.0)
+        index = reader.layout.slot_index[("input", FEEDIN_POWER_ADDR)]
+        assert snapshot.status[index] == STATUS_VALID
+
+        simulator.down.set()
+        while snapshot.status[index] != STATUS_ERROR:
+            snapshot = reader.wait(timeout=5.0, after=snapshot.sequence)
+        assert snapshot.errors > 0
+        while simulator.connects < 3:
+            stop_event.wait(0.01)
+
+        simulator.down.clear()
+        while snapshot.status[index] != STATUS_VALID:
+            snapshot = reader.wait(timeout=5.0, after=snapshot.sequence)
+        assert thread.is_alive()
+        assert snapshot.get("input", FEEDIN_POWER_ADDR) is not None
+        reader.close()
+    finally:
+        stop_event.set()
+        thread.join(5.0)
+    assert not thread.is_alive()
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+from inverter_simulator import EXPORT_LIMIT_ADDR, FEEDIN_POWER_ADDR, SimulatedInverter, open_pty_slave
+from modbus_transport import UnitClient, connect_client, unit_keyword
+from register_map import load_register_map, read_block, split_block
+from register_utils import decode_numeric
+
+
+class SlaveKeywordInverter(SimulatedInverter):
+    """Simulator with the request signature of pymodbus before 3.10, recording the unit ids."""
+
+    def __init__(self, register_map):
+        super().__init__(register_map, seed=1)
+        self.units = []
+
+    def read_input_registers(self, address, count=1, slave=0, **kwargs):
+        self.units.append(("slave", slave))
+        return super().read_input_registers(address, count)
+
+    def read_holding_registers(self, address, count=1, slave=0, **kwargs):
+        self.units.append(("slave", slave))
+        return super().read_holding_registers(address, count)
+
+
+class DeviceIdInverter(SimulatedInverter):
+    """Simulator with the request signature of pymodbus 3.10 and later."""
+
+    def __init__(self, register_map):
+        super().__init__(register_map, seed=1)
+        self.units = []
+
+    def read_input_registers(self, address, count=1, device_id=1, no_response_expected=False):
+        self.units.append(("device_id", device_id))
+        return super().read_input_registers(address, count)
+
+    def read_holding_registers(self, address, count=1, device_id=1, no_response_expected=False):
+        self.units.append(("device_id", device_id))
+        return super().read_holding_registers(address, count)
+
+
+@pytest.fixture(scope="module")
+def register_map():
+    return load_register_map()
+
+
+def feedin_block(table):
+    return next(block for block in table.read_plan if block.start <= FEEDIN_POWER_ADDR < block.start + block.count)
+
+
+def read_feedin(client, register_map):
+    table = register_map.table("input")
+    block = feedin_block(table)
+    resp = read_block(client, table.function, block.start, block.count)
+    assert not resp.isError()
+    assert len(resp.registers) == block.count
+    return {reg["address"]: decode_numeric(reg, raw_list)
+            for reg, raw_list in split_block(block, resp.registers)}[FEEDIN_POWER_ADDR]
+
+
+@pytest.mark.parametrize("inverter, keyword", [(SlaveKeywordInverter, "slave"), (DeviceIdInverter, "device_id")])
+def test_unit_client_reads_block_from_simulator(register_map, inverter, keyword):
+    simulator = inverter(register_map)
+    client = UnitClient(simulator, unit=7)
+    assert unit_keyword(simulator) == keyword
+    assert read_feedin(client, register_map) == 700.0      # 4000 W PV - 800 W load - 2500 W charging
+    assert simulator.units == [(keyword, 7)]
+
+
+def test_unit_client_spaces_requests_by_frame_gap(register_map):
+    client = UnitClient(SimulatedInverter(register_map, seed=1), frame_gap=0.02)
+    client.read_holding_registers(address=0x0000, count=7)
+    first = client._last_io
+    client.read_holding_registers(address=0x0000, count=7)
+    assert client._last_io - first >= 0.02
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs a pseudo-terminal")
+def test_create_client_reads_block_over_rtu(register_map):
+    pytest.importorskip("pymodbus")
+    pytest.importorskip("serial")
+    simulator = SimulatedInverter(register_map, seed=1)
+    slave, path = open_pty_slave(simulator, unit=3)
+    try:
+        client = connect_client(serial_port=path, baudrate=115200, unit=3)
+        try:
+            assert read_feedin(client, register_map) == 700.0
+            assert client.read_holding_registers(address=EXPORT_LIMIT_ADDR, count=1).registers == [10000]
+        finally:
+            client.close()
+    finally:
+        slave.stop()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to count open descriptors")
+def test_stopping_the_pty_slave_closes_both_ends():
+    before = set(os.listdir("/proc/self/fd"))
+    for _ in range(3):
+        slave, _ = open_pty_slave(SimulatedInverter(seed=1))
+        fds = (slave.fd, slave.slave_fd)
+        slave.stop()
+        slave.stop()
+        for fd in fds:
+            with pytest.raises(OSError):
+                os.fstat(fd)
+    assert set(os.listdir("/proc/self/fd")) <= before
@@ -0,0 +1,109 @@
+import os
+import random
+
+import pytest
+
+from register_archive import ArchiveLayout, ArchiveReader, ArchiveWriter
+from register_map import load_register_map
+
+T0 = 1717243200.0       # 2024-06-01 12:00 UTC
+INTERVAL = 10
+
+
+@pytest.fixture(scope="module")
+def register_map():
+    return load_register_map()
+
+
+def make_records(register_map, count, seed=1):
+    """
+    Snapshots with mostly slow-moving words, some read errors, a few
+    registers that are not polled at all and words that wrap between 0xFFFF
+    and 0 in both directions.
+    """
+    rng = random.Random(seed)
+    layout = ArchiveLayout.from_register_map(register_map)
+    keys = list(zip(layout.keys, layout.slot_length))
+    current = {key: [rng.randrange(0x10000) for _ in range(length)] for key, length in keys}
+    unpolled = {key for key, _ in keys[::7]}
+    records = []
+    for i in range(count):
+        values = {}
+        for key, length in keys:
+            words = current[key]
+            if rng.random() < 0.1:
+                words[0] = (words[0] + rng.randint(-3, 3)) % 0x10000
+            if i % 50 == 25:
+                words[-1] = 0xFFFF if words[-1] < 0x8000 else 0x0000      # wrap-around delta
+            if key in unpolled:
+                continue
+            values[key] = None if rng.random() < 0.02 else list(words)
+        records.append((T0 + i * INTERVAL, values))
+    return records
+
+
+def write(path, register_map, records, keyframe_interval=40, close=True):
+    writer = ArchiveWriter(path, register_map, keyframe_interval=keyframe_interval)
+    for timestamp, values in records:
+        writer.append(values, timestamp)
+    if close:
+        writer.close()
+    else:
+        writer.flush()
+        writer.f.close()
+    return writer
+
+
+def read_back(path, start=None, end=None):
+    with ArchiveReader(path) as reader:
+        return [(record.timestamp, record.values()) for record in reader.records(start, end)]
+
+
+def test_round_trip_is_exact(tmp_path, register_map):
+    path = str(tmp_path / "a.slxa")
+    records = make_records(register_map, 130)
+    write(path, register_map, records)
+    assert read_back(path) == records
+    with ArchiveReader(path) as reader:
+        assert len(reader) == 130
+        assert len(reader.index) == 4
+        assert (reader.start_time, reader.end_time) == (records[0][0], records[-1][0])
+
+
+def test_seek_and_ranges_use_the_chunk_index(tmp_path, register_map):
+    path = str(tmp_path / "a.slxa")
+    records = make_records(register_map, 130)
+    write(path, register_map, records)
+    with ArchiveReader(path) as reader:
+        for i in (0, 39, 40, 41, 79, 80, 129):
+            record = reader.seek(records[i][0])
+            assert (record.timestamp, record.values()) == records[i]
+            between = reader.seek(records[i][0] - INTERVAL / 2)
+            assert between.timestamp == records[i][0]
+        assert reader.seek(records[-1][0] + 1) is None
+        assert reader.seek(records[0][0] - 3600).timestamp == records[0][0]
+    assert read_back(path, records[35][0], records[85][0]) == records[35:86]
+    assert read_back(path, records[40][0] - 1, records[40][0] + 1) == records[40:41]
+
+
+def test_truncated_tail_reads_the_complete_chunks(tmp_path, register_map):
+    path = str(tmp_path / "a.slxa")
+    records = make_records(register_map, 130)
+    write(path, register_map, records)
+    with ArchiveReader(path) as reader:
+        third_chunk = reader.index[2][2]
+    os.truncate(path, third_chunk + 20)     # no index trailer, torn third chunk
+    assert read_back(path) == records[:80]
+    assert read_back(path, records[50][0]) == records[50:80]
+
+    # Reopening for writing drops the torn chunk and appends after the last good one.
+    write(path, register_map, records[80:])
+    assert read_back(path) == records
+
+
+def test_archive_without_index_is_walked(tmp_path, register_map):
+    path = str(tmp_path / "a.slxa")
+    records = make_records(register_map, 100, seed=2)
+    write(path, register_map, records, close=False)
+    assert read_back(path) == records
+    assert read_back(path, records[60][0], records[70][0]) == records[60:71]
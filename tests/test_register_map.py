@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+from register_map import (DEFAULT_REQUEST_COST, MAX_BLOCK_REGISTERS, is_reserved, load_register_map, optimize_plan,
+                          plan_reads, read_units, restrict_plan)
+
+
+def reg(address, length=1):
+    return {"address": address, "length": length, "description": f"R{address:04X}"}
+
+
+def cost(read_plan):
+    return len(read_plan) * DEFAULT_REQUEST_COST + sum(block.count for block in read_plan)
+
+
+def spans(read_plan):
+    return [(block.start, block.count) for block in read_plan]
+
+
+def random_table(seed):
+    """Registers of 1 or 2 words with holes of up to 12 addresses, and LSB/MSB-style groups."""
+    rng = random.Random(seed)
+    registers = []
+    address = rng.randrange(20)
+    while address < 600:
+        length = rng.choice((1, 1, 1, 2))
+        registers.append(reg(address, length))
+        address += length + (rng.randrange(1, 13) if rng.random() < 0.3 else 0)
+    groups = []
+    for i in range(0, len(registers) - 2, 9):
+        members = registers[i:i + rng.randrange(2, 4)]
+        groups.append(tuple(r["address"] for r in members))
+    required = [r for r in registers if rng.random() < 0.6]
+    return registers, required, groups
+
+
+def check_plan(registers, required, groups, read_plan, max_gap, planned=None):
+    """
+    The plan reads every required register, keeps groups in one request and
+    bridges at most max_gap undefined addresses outside the group spans of
+    the registers it was `planned` for (default: `required`).
+    """
+    defined = {r["address"] + offset for r in registers for offset in range(r["length"])}
+    units = [(start, end) for start, end, _ in read_units(required if planned is None else planned, groups)]
+    block_of = {}
+    for index, block in enumerate(read_plan):
+        assert block.count <= MAX_BLOCK_REGISTERS
+        run = 0
+        for word in range(block.start, block.start + block.count):
+            inside_unit = any(start <= word < end for start, end in units)
+            run = run + 1 if word not in defined and not inside_unit else 0
+            assert run <= max_gap, (block, word)
+        for r in block.registers:
+            assert block.start <= r["address"] and r["address"] + r["length"] <= block.start + block.count
+            block_of.setdefault(r["address"], index)
+    assert {r["address"] for r in required} <= set(block_of)
+    wanted = {r["address"] for r in required}
+    for addresses in groups:
+        assert len({block_of[address] for address in addresses if address in wanted}) <= 1, addresses
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("max_gap", [0, 3, 10])
+def test_optimize_plan_on_random_tables(seed, max_gap):
+    registers, required, groups = random_table(seed)
+    read_plan = optimize_plan(registers, required, groups, max_gap=max_gap)
+    check_plan(registers, required, groups, read_plan, max_gap)
+    assert cost(read_plan) <= cost(plan_reads(required, max_gap=max_gap, groups=groups))
+
+
+def test_optimize_plan_reads_defined_registers_but_not_undefined_holes():
+    registers = [reg(0), reg(1), reg(2), reg(10)]
+    assert spans(optimize_plan(registers, [registers[0], registers[2]])) == [(0, 3)]
+    assert spans(optimize_plan(registers, [registers[0], registers[3]])) == [(0, 1), (10, 1)]
+    assert spans(optimize_plan(registers, [registers[0], registers[3]], max_gap=7)) == [(0, 11)]
+    assert spans(optimize_plan(registers, [registers[0], registers[3]], max_gap=6)) == [(0, 1), (10, 1)]
+
+
+def test_optimize_plan_does_not_split_a_group_at_the_block_limit():
+    registers = [reg(address) for address in range(0, 120)]
+    groups = [(98, 99, 100, 101)]
+    read_plan = optimize_plan(registers, registers, groups)
+    check_plan(registers, registers, groups, read_plan, 0)
+    assert len(read_plan) == 2 and read_plan[0].count == 98
+    with pytest.raises(ValueError):
+        optimize_plan(registers, registers, [(0, 110)])
+
+
+@pytest.mark.parametrize("name", ["holding", "input"])
+def test_optimize_plan_on_the_register_map(name):
+    table = load_register_map().table(name)
+    groups = [addresses for _, addresses in table.groups]
+    read_plan = optimize_plan(table.registers, table.registers, groups)
+    check_plan(table.registers, table.registers, groups, read_plan, 0)
+    assert cost(read_plan) <= cost(plan_reads(table.registers, groups=groups))
+    # The shipped plan (register_map_lint.py plan --write) leaves out reserved registers.
+    required = [r for r in table.registers if not is_reserved(r)]
+    check_plan(table.registers, required, groups, table.read_plan, 0)
+    assert cost(table.read_plan) <= cost(plan_reads(required, groups=groups))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_restrict_plan_only_shrinks_blocks(seed):
+    registers, required, groups = random_table(seed)
+    read_plan = optimize_plan(registers, registers, groups)
+    keep_addresses = {r["address"] for r in required}
+    for addresses in groups:            # keep groups whole, as capability tags do
+        if keep_addresses & set(addresses):
+            keep_addresses.update(addresses)
+    restricted = restrict_plan(read_plan, lambda r: r["address"] in keep_addresses)
+    assert len(restricted) <= len(read_plan)
+    assert sorted(r["address"] for block in restricted for r in block.registers) == sorted(keep_addresses)
+    for block in restricted:
+        source = next(b for b in read_plan if b.start <= block.start < b.start + b.count)
+        assert block.start + block.count <= source.start + source.count
+    kept = [r for r in registers if r["address"] in keep_addresses]
+    check_plan(registers, kept, groups, restricted, 0, planned=registers)
+
+
+def test_subset_plans_keep_groups_whole():
+    register_map = load_register_map()
+    for table in register_map.tables.values():
+        for capabilities in ([], ["x3"], ["meter2"], ["x3", "meter2"]):
+            subset = table.subset(capabilities)
+            assert len(subset.read_plan) <= len(table.read_plan)
+            groups = [addresses for _, addresses in table.groups]
+            required = [r for r in subset.registers if not is_reserved(r)]
+            check_plan(table.registers, required, groups, subset.read_plan, 0,
+                       planned=[r for r in table.registers if not is_reserved(r)])
+
+
+def test_meter2_phase_registers_need_a_three_phase_inverter():
+    table = load_register_map().table("input")
+    names = {reg["description"] for reg in table.subset(["x1", "meter2"]).registers}
+    assert "feedin_power_Meter2" in names
+    assert not any(name.startswith("FeedinPower_") and name.endswith("phase_Meter2") for name in names)
+    assert "FeedinPower_Rphase_Meter2" in {reg["description"] for reg in table.subset(["x3", "meter2"]).registers}
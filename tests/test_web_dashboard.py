@@ -0,0 +1,79 @@
+import json
+import threading
+
+import web_dashboard
+from inverter_simulator import SimulatedInverter
+from register_map import load_register_map
+from register_utils import load_definitions
+from web_dashboard import DashboardState, run_dashboard
+
+
+class DroppingInverter(SimulatedInverter):
+    """Simulator whose connection drops: every request raises while `down` is set."""
+
+    def __init__(self, register_map):
+        super().__init__(register_map, seed=1)
+        self.down = threading.Event()
+
+    def _read(self, bank, address, count):
+        if self.down.is_set():
+            raise ConnectionResetError("Connection reset by peer")
+        return super()._read(bank, address, count)
+
+
+def wait_for(state, predicate, timeout=5.0):
+    with state.condition:
+        assert state.condition.wait_for(lambda: predicate(state), timeout)
+
+
+def status_events(state):
+    return [json.loads(event.decode().rpartition("data: ")[2])["status"]
+            for _, event in state.history if b"event: status" in event]
+
+
+def test_dashboard_reports_lost_data_and_reconnects(monkeypatch):
+    monkeypatch.setattr(web_dashboard, "RECONNECT_MIN", 0.01)
+    monkeypatch.setattr(web_dashboard, "RECONNECT_MAX", 0.02)
+    register_map = load_register_map()
+    simulator = DroppingInverter(register_map)
+    connects = []
+
+    def connect():
+        connects.append(1)
+        if simulator.down.is_set():
+            raise ConnectionError("Could not connect to simulated inverter")
+        return simulator
+
+    state = DashboardState(load_definitions(register_map))
+    stop_event = threading.Event()
+    thread = threading.Thread(target=run_dashboard,
+                              args=(state, simulator, register_map, "all", 0.01, stop_event, connect))
+    thread.start()
+    try:
+        wait_for(state, lambda s: s.timestamp > 0)
+        simulator.down.set()
+        wait_for(state, lambda s: s.status is not None)
+        assert state.status.startswith("data stopped: ")
+        assert state.snapshot()["status"] == state.status
+        while len(connects) < 2:
+            stop_event.wait(0.01)
+        simulator.down.clear()
+        wait_for(state, lambda s: s.status is None)
+        assert thread.is_alive()
+        assert status_events(state) == ["data stopped: Connection reset by peer", None]
+    finally:
+        stop_event.set()
+        thread.join(5.0)
+    assert not thread.is_alive()
+
+
+def test_status_is_only_sent_when_it_changes():
+    state = DashboardState(load_definitions(load_register_map()))
+    sequence = state.sequence
+    state.set_status("stale data (12 s old)")
+    state.set_status("stale data (12 s old)")
+    state.set_status(None)
+    state.set_status(None)
+    assert state.sequence == sequence + 2
+    assert status_events(state) == ["stale data (12 s old)", None]
+
@@ -0,0 +1,71 @@
+# value_decoders.py
+
+
+class EnumDecoder:
+    """
+    Maps a register value to a name through a precomputed table, so rendering
+    is a single index operation. Declared in the register map as
+      "enums": {"run_mode": {"0": "Waiting", "1": "Checking", ...}}
+    """
+
+    def __init__(self, name, values, unknown="Unknown"):
+        self.name = name
+        self.unknown = unknown
+        mapping = {int(key, 0) if isinstance(key, str) else key: label for key, label in values.items()}
+        size = max(mapping) + 1 if mapping else 0
+        self.table = tuple(f"{value} => {mapping.get(value, unknown)}" for value in range(size))
+
+    def render(self, raw_list):
+        raw_val = raw_list[0]
+        if raw_val < len(self.table):
+            return self.table[raw_val]
+        return f"{raw_val} => {self.unknown}"
+
+
+class FlagsDecoder:
+    """
+    Renders a bit-field register as the names of its set bits. One 256-entry
+    table per byte holds the names of the bits set in every byte value, so a
+    16-bit register costs two lookups instead of a loop over all bits.
+    Declared in the register map as
+      "flags": {"bms_warning": {"0": "CellOverVoltage", ...}}
+    Bits without a name render as bitN.
+
+    `width` is the register's size in bits (words are combined LSB first)
+    and `offset` the number of the register's lowest bit in the flag set, so
+    the MSB word of a 32-bit set split over two registers uses offset 16.
+    variant() returns a decoder for another width/offset with the same names.
+    """
+
+    def __init__(self, name, bits, width=16, offset=0):
+        self.name = name
+        self.bits = {int(key, 0) if isinstance(key, str) else key: label for key, label in bits.items()}
+        self.width = width
+        self.offset = offset
+        self.byte_tables = []
+        for byte in range(width // 8):
+            table = []
+            for value in range(256):
+                table.append(tuple(self.bits.get(offset + byte * 8 + bit, f"bit{offset + byte * 8 + bit}")
+                                   for bit in range(8) if value & (1 << bit)))
+            self.byte_tables.append(tuple(table))
+
+    def variant(self, width, offset):
+        if width == self.width and offset == self.offset:
+            return self
+        return FlagsDecoder(self.name, self.bits, width, offset)
+
+    def render(self, raw_list):
+        raw_val = 0
+        for index, word in enumerate(raw_list):
+            raw_val |= word << (16 * index)
+        digits = 4 * len(raw_list)
+        if not raw_val:
+            return f"0x{0:0{digits}X} => none"
+        names = ()
+        value = raw_val
+        for table in self.byte_tables:
+            if value & 0xFF:
+                names += table[value & 0xFF]
+            value >>= 8
+        return f"0x{raw_val:0{digits}X} => {'|'.join(names)}"
@@ -0,0 +1,119 @@
+# watch_list.py
+import time
+
+from register_map import ReadBlock, optimize_plan, read_block, split_block
+
+# Interval of the high-rate lane that polls the watch list (seconds).
+DEFAULT_WATCH_INTERVAL = 0.5
+
+
+class WatchList:
+    """
+    Registers pinned for high-rate polling, as (table name, address) in pin
+    order.
+
+    plan() merges the pinned registers of each table into the cheapest set
+    of block reads (register_map.optimize_plan()), keeping LSB/MSB and other
+    groups together when all their members are pinned. Blocks may read
+    unpinned registers in between where that saves a request; only pinned
+    registers are returned by poll(). Plans are rebuilt when pins change.
+    """
+
+    def __init__(self, tables):
+        self.tables = dict(tables)      # table name -> RegisterTable
+        self.pinned = []
+        self._plans = None
+
+    def __len__(self):
+        return len(self.pinned)
+
+    def __contains__(self, key):
+        return key in self.pinned
+
+    def set_tables(self, tables):
+        """Switch to new (e.g. profile-restricted) tables; pins they no longer contain are dropped."""
+        self.tables = dict(tables)
+        self.pinned = [(name, address) for name, address in self.pinned
+                       if name in self.tables and self.tables[name].lookup(address) is not None]
+        self._plans = None
+
+    def resolve(self, ref):
+        """
+        (table name, address) for "table:register" or "register", where a
+        register is a description or a 0x address; without a table the first
+        table defining it wins. None if not found.
+        """
+        name, _, key = ref.rpartition(":")
+        key = key.strip()
+        key = int(key, 0) if key.lower().startswith("0x") else key
+        for table_name, table in self.tables.items():
+            if name and table_name != name:
+                continue
+            reg = table.lookup(key)
+            if reg is not None:
+                return table_name, reg["address"]
+        return None
+
+    def pin(self, table_name, address):
+        key = (table_name, address)
+        if key in self.pinned or table_name not in self.tables or self.tables[table_name].lookup(address) is None:
+            return False
+        self.pinned.append(key)
+        self._plans = None
+        return True
+
+    def unpin(self, table_name, address):
+        key = (table_name, address)
+        if key not in self.pinned:
+            return False
+        self.pinned.remove(key)
+        self._plans = None
+        return True
+
+    def registers(self):
+        """(table name, register definition) of every pinned register, in pin order."""
+        return [(name, self.tables[name].lookup(address)) for name, address in self.pinned]
+
+    def plan(self):
+        """{table name: [ReadBlock]} whose blocks list only pinned registers."""
+        if self._plans is None:
+            plans = {}
+            for name, table in self.tables.items():
+                wanted = {address for table_name, address in self.pinned if table_name == name}
+                if not wanted:
+                    continue
+                required = [reg for reg in table.registers if reg["address"] in wanted]
+                groups = [addresses for _, addresses in table.groups]
+                plans[name] = [ReadBlock(block.start, block.count,
+                                         tuple(reg for reg in block.registers if reg["address"] in wanted))
+                               for block in optimize_plan(table.registers, required, groups)]
+            self._plans = plans
+        return self._plans
+
+    def requests(self):
+        return sum(len(blocks) for blocks in self.plan().values())
+
+    def poll(self, client, on_request=None):
+        """
+        Read the watch plan once. Returns (timestamp, [(table name, register,
+        raw_list or None)]) in pin order; on_request(block, seconds, error) is
+        called after each request.
+        """
+        perf_counter = time.perf_counter
+        timestamp = time.time()
+        values = {}
+        for name, blocks in self.plan().items():
+            function = self.tables[name].function
+            for block in blocks:
+                t0 = perf_counter()
+                resp = read_block(client, function, block.start, block.count)
+                error = resp.isError()
+                if on_request is not None:
+                    on_request(block, perf_counter() - t0, error)
+                if error:
+                    for reg in block.registers:
+                        values[(name, reg["address"])] = None
+                    continue
+                for reg, raw_list in split_block(block, resp.registers):
+                    values[(name, reg["address"])] = raw_list
+        return timestamp, [(name, reg, values.get((name, reg["address"]))) for name, reg in self.registers()]
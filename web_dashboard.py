@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Web dashboard with server-sent delta streaming.
+
+Serves the four register categories (holding, input, self test, parallel)
+as a page that works on a phone, and an event stream (/events, SSE) that
+pushes only the rows changed since the viewer's last sequence number.
+
+There is one poll loop however many viewers are connected. Each cycle's
+changed rows are rendered and JSON-encoded once into a delta event; viewers
+are sent the same bytes. A short history of deltas lets a reconnecting
+browser (EventSource sends Last-Event-ID) catch up without a full reload;
+viewers too far behind get a complete snapshot instead.
+
+  web_dashboard.py --host 192.168.0.100 --listen 0.0.0.0:8080
+  web_dashboard.py --attach solax          # read from modbus_poller.py --name solax
+
+The GUI can serve the same dashboard from its own poll loop with --web.
+"""
+import argparse
+import functools
+import json
+import logging
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from modbus_poller import RECONNECT_MAX, RECONNECT_MIN, Poller, select_profile
+from modbus_transport import add_transport_args, client_kwargs_from_args, connect_client
+from register_map import load_register_map
+from register_utils import load_definitions
+from shared_snapshot import SharedSnapshotReader, SnapshotClient
+
+logger = logging.getLogger("dashboard")
+
+DEFAULT_LISTEN = "0.0.0.0:8080"
+HISTORY_EVENTS = 256        # deltas kept for reconnecting viewers
+KEEPALIVE_SECONDS = 15
+# Attached to an acquisition process, a snapshot older than this many
+# intervals (and at least STALE_AFTER_MIN seconds) is reported as stale.
+STALE_AFTER_INTERVALS = 3
+STALE_AFTER_MIN = 10.0
+
+TABLE_TITLES = {
+    "holding": "Holding Registers",
+    "input": "Input Registers",
+    "selftest": "Self Test Registers",
+    "parallel": "Parallel Registers",
+}
+
+
+class DashboardState:
+    """
+    Rendered rows of the polled tables plus the stream of changes.
+
+    The poll loop calls update() for each table it read and publish() once
+    per cycle. publish() turns the rows that changed into one pre-encoded
+    delta event and wakes the viewers. Row values are only re-rendered when
+    their raw words changed. set_status() tells the viewers that data has
+    stopped or gone stale (a "status" event), and that it flows again.
+    """
+
+    def __init__(self, definitions, history=HISTORY_EVENTS):
+        self.definitions = definitions
+        self.condition = threading.Condition()
+        self._started = f"{int(time.time()):x}"
+        self.generation = 0
+        self.epoch = f"{self._started}.0"
+        self.sequence = 0
+        self.tables = []            # (name, title, first row, row count)
+        self.rows = []              # [address, description, value]
+        self.row_index = {}         # (table name, address) -> row
+        self.history = deque(maxlen=history)   # (sequence, event bytes)
+        self.viewers = 0
+        self.timestamp = 0.0
+        self.status = None          # why the data is not current, or None
+        self._raw = {}
+        self._pending = {}
+
+    def set_tables(self, tables):
+        """(Re)build the rows for the given register tables, e.g. after a profile change."""
+        with self.condition:
+            self.tables = []
+            self.rows = []
+            self.row_index = {}
+            for table in tables:
+                first = len(self.rows)
+                for reg in table.registers:
+                    self.row_index[(table.name, reg["address"])] = len(self.rows)
+                    self.rows.append([f"0x{reg['address']:04X}", reg["description"], ""])
+                self.tables.append((table.name, TABLE_TITLES.get(table.name, table.name),
+                                    first, len(self.rows) - first))
+            self._raw = {}
+            self._pending = {}
+            self.history.clear()
+            self.generation += 1
+            self.epoch = f"{self._started}.{self.generation}"
+            self.sequence += 1
+            self.condition.notify_all()
+
+    def update(self, table_name, items):
+        """Render the values of one table read: items are (register, raw_list or None)."""
+        row_index = self.row_index
+        raw_seen = self._raw
+        pending = self._pending
+        render = self.definitions[table_name].render_register
+        for reg, raw_list in items:
+            row = row_index.get((table_name, reg["address"]))
+            if row is None:
+                continue
+            raw = tuple(raw_list) if raw_list is not None else None
+            if row in raw_seen and raw_seen[row] == raw:
+                continue
+            raw_seen[row] = raw
+            pending[row] = "Error reading" if raw is None else render(reg, raw_list)
+
+    def publish(self, timestamp=None):
+        """Apply the pending rows and send them to the viewers as one delta."""
+        if not self._pending:
+            return
+        changes = [[row, value] for row, value in self._pending.items()]
+        self._pending = {}
+        with self.condition:
+            for row, value in changes:
+                self.rows[row][2] = value
+            self.sequence += 1
+            self.timestamp = time.time() if timestamp is None else timestamp
+            data = json.dumps({"seq": self.sequence, "time": self.timestamp, "rows": changes},
+                              separators=(",", ":"))
+            self.history.append((self.sequence, self._event("delta", data)))
+            self.condition.notify_all()
+
+    def set_status(self, status):
+        """Send a status event if the status changed (None: data is current)."""
+        with self.condition:
+            if status == self.status:
+                return
+            self.status = status
+            self.sequence += 1
+            data = json.dumps({"seq": self.sequence, "status": status}, separators=(",", ":"))
+            self.history.append((self.sequence, self._event("status", data)))
+            self.condition.notify_all()
+
+    def _event(self, kind, data):
+        return f"id: {self.epoch}-{self.sequence}\nevent: {kind}\ndata: {data}\n\n".encode("utf-8")
+
+    def snapshot(self):
+        """The complete state as a dict (caller holds the condition or accepts a torn read)."""
+        return {
+            "seq": self.sequence,
+            "time": self.timestamp,
+            "status": self.status,
+            "tables": [{"name": name, "title": title, "rows": [[first + i] + self.rows[first + i]
+                                                               for i in range(count)]}
+                       for name, title, first, count in self.tables],
+        }
+
+    def events_since(self, epoch, sequence):
+        """
+        Events a viewer at (epoch, sequence) has not seen yet, and the
+        position it is at afterwards. Must be called with the condition held.
+        """
+        if epoch == self.epoch and sequence == self.sequence:
+            return [], epoch, sequence
+        if epoch == self.epoch and self.history and self.history[0][0] <= sequence + 1:
+            return [event for seq, event in self.history if seq > sequence], epoch, self.sequence
+        data = json.dumps(self.snapshot(), separators=(",", ":"))
+        return [self._event("snapshot", data)], self.epoch, self.sequence
+
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Solax Inverter</title>
+<style>
+body{font-family:sans-serif;margin:0;font-size:14px}
+header{position:sticky;top:0;background:#eee;padding:6px}
+nav button{margin:2px;padding:6px 10px}nav button.on{font-weight:bold}
+#status{float:right;color:#666}#status.problem{color:#c00;font-weight:bold}
+table{border-collapse:collapse;width:100%}
+td{padding:3px 6px;border-bottom:1px solid #ddd}td:first-child{text-align:right;color:#666}
+td:last-child{white-space:nowrap}tr.changed td:last-child{background:LightGreen}
+</style></head><body>
+<header><nav id="tabs"></nav><input id="filter" placeholder="Filter"><span id="status">connecting</span></header>
+<table><tbody id="rows"></tbody></table>
+<script>
+var tables=[], cells={}, current=null, problem=null;
+function show(name){
+  current=name; var body=document.getElementById("rows"), f=document.getElementById("filter").value.toLowerCase();
+  body.textContent="";
+  document.querySelectorAll("nav button").forEach(function(b){b.className=b.dataset.name==name?"on":"";});
+  tables.forEach(function(t){ if(t.name!=name) return;
+    t.rows.forEach(function(r){ if(f && (r[1]+" "+r[2]).toLowerCase().indexOf(f)<0) return;
+      var tr=document.createElement("tr"); tr.id="r"+r[0];
+      r.slice(1).forEach(function(v){var td=document.createElement("td"); td.textContent=v; tr.appendChild(td);});
+      body.appendChild(tr);});});
+}
+function status(text){var el=document.getElementById("status");
+  el.textContent=problem ? text+" | "+problem : text; el.className=problem ? "problem" : "";}
+var es=new EventSource("events");
+es.addEventListener("snapshot",function(e){
+  var s=JSON.parse(e.data); tables=s.tables; cells={}; problem=s.status;
+  var nav=document.getElementById("tabs"); nav.textContent="";
+  tables.forEach(function(t){ t.rows.forEach(function(r){cells[r[0]]=r;});
+    var b=document.createElement("button"); b.textContent=t.title; b.dataset.name=t.name;
+    b.onclick=function(){show(t.name);}; nav.appendChild(b);});
+  show(current && tables.some(function(t){return t.name==current;}) ? current : tables.length ? tables[0].name : null);
+  status("#"+s.seq);
+});
+es.addEventListener("delta",function(e){
+  var d=JSON.parse(e.data);
+  d.rows.forEach(function(c){ var r=cells[c[0]]; if(!r) return; r[3]=c[1];
+    var tr=document.getElementById("r"+c[0]); if(tr){tr.lastChild.textContent=c[1]; tr.className="changed";
+      setTimeout(function(){tr.className="";},800);}});
+  status("#"+d.seq+" "+new Date(d.time*1000).toLocaleTimeString());
+});
+es.addEventListener("status",function(e){
+  var s=JSON.parse(e.data); problem=s.status; status("#"+s.seq);
+});
+es.onerror=function(){status("reconnecting");};
+document.getElementById("filter").oninput=function(){show(current);};
+</script></body></html>
+"""
+
+
+class _DashboardHandler(BaseHTTPRequestHandler):
+    server_version = "SolaxDashboard/1"
+
+    def log_message(self, fmt, *args):
+        logger.debug("%s " + fmt, self.address_string(), *args)
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        state = self.server.state
+        if url.path in ("/", "/index.html"):
+            self._send(200, "text/html; charset=utf-8", DASHBOARD_HTML.encode("utf-8"))
+        elif url.path == "/api/state":
+            with state.condition:
+                body = json.dumps(state.snapshot()).encode("utf-8")
+            self._send(200, "application/json", body)
+        elif url.path == "/events":
+            last_id = self.headers.get("Last-Event-ID") or parse_qs(url.query).get("since", [""])[0]
+            self._stream(state, last_id)
+        else:
+            self._send(404, "text/plain", b"Not found\n")
+
+    def _stream(self, state, last_id):
+        epoch, _, sequence = last_id.rpartition("-")
+        try:
+            sequence = int(sequence)
+        except ValueError:
+            epoch, sequence = None, -1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        with state.condition:
+            state.viewers += 1
+        try:
+            while not self.server.closing:
+                with state.condition:
+                    state.condition.wait_for(
+                        lambda: state.epoch != epoch or state.sequence != sequence or self.server.closing,
+                        KEEPALIVE_SECONDS)
+                    events, epoch, sequence = state.events_since(epoch, sequence)
+                self.wfile.write(b"".join(events) if events else b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with state.condition:
+                state.viewers -= 1
+
+
+class DashboardServer:
+    """HTTP server for a DashboardState, serving from daemon threads."""
+
+    def __init__(self, state, listen=DEFAULT_LISTEN):
+        host, _, port = listen.rpartition(":")
+        self.state = state
+        self.httpd = ThreadingHTTPServer((host or "0.0.0.0", int(port)), _DashboardHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = state
+        self.httpd.closing = False
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="dashboard-http", daemon=True)
+        self.thread.start()
+        logger.info("Dashboard on http://%s:%d/", *self.address[:2])
+        return self
+
+    def close(self):
+        self.httpd.closing = True
+        with self.state.condition:
+            self.state.condition.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def run_dashboard(state, client, register_map, model="auto", interval=1.0, stop_event=None, connect=None):
+    """
+    Poll loop feeding the dashboard until stop_event is set.
+
+    A cycle that fails on the transport is reported to the viewers as a
+    status event. With `connect` (a function returning a new connected
+    client) the loop then reconnects, backing off from RECONNECT_MIN to
+    RECONNECT_MAX seconds like modbus_poller.run_poller(). Attached to an
+    acquisition process, a snapshot that stops being renewed is reported as
+    stale.
+    """
+    stop_event = stop_event or threading.Event()
+    first_client = client
+    poller = Poller(client, register_map, select_profile(client, register_map, model))
+    state.set_tables(poller.tables)
+    attached = isinstance(client, SnapshotClient)
+    next_tick = time.monotonic()
+    reconnect_delay = RECONNECT_MIN
+    try:
+        while not stop_event.is_set():
+            # Attached to an acquisition process: render each published cycle once.
+            if not attached or client.refresh():
+                timestamp = client.snapshot.timestamp if attached else time.time()
+                try:
+                    values, _ = poller.poll()
+                except Exception as e:
+                    logger.warning("Polling %s failed (%s)", client.description, e)
+                    state.set_status(f"data stopped: {e}")
+                    if connect is not None:
+                        client.close()
+                        client = None
+                        while client is None and not stop_event.wait(reconnect_delay):
+                            reconnect_delay = min(RECONNECT_MAX, reconnect_delay * 2)
+                            try:
+                                client = connect()
+                            except OSError as e:
+                                logger.warning("%s; retrying in %.0f s", e, reconnect_delay)
+                        if client is None:
+                            break
+                        logger.info("Reconnected to %s", client.description)
+                        poller.client = client
+                        next_tick = time.monotonic()
+                        continue
+                else:
+                    reconnect_delay = RECONNECT_MIN
+                    for table in poller.tables:
+                        bank = table.function
+                        state.update(table.name, [(reg, values[(bank, reg["address"])]) for reg in table.registers
+                                                  if (bank, reg["address"]) in values])
+                    state.publish(timestamp)
+                    state.set_status(None)
+            elif attached and client.snapshot is not None:
+                age = time.time() - client.snapshot.timestamp
+                if age > max(STALE_AFTER_MIN, STALE_AFTER_INTERVALS * interval):
+                    state.set_status(f"stale data ({age:.0f} s old)")
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                next_tick = time.monotonic()
+                delay = 0
+            stop_event.wait(delay)
+    finally:
+        # The caller closes the client it passed in; reconnected ones are ours.
+        if client is not None and client is not first_client:
+            client.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a live inverter dashboard over HTTP.")
+    add_transport_args(parser)
+    parser.add_argument("--attach", default=None, metavar="NAME",
+                        help="Read snapshots from a running modbus_poller.py --name NAME instead of polling")
+    parser.add_argument("--listen", default=DEFAULT_LISTEN, metavar="[ADDR:]PORT", help="HTTP listen address")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds")
+    parser.add_argument("--model", default="auto", help="Model profile: auto, all, or a model such as X1/X3")
+    parser.add_argument("--register-map", default=None, help="Register map file (default: bundled Solax G3 map)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    register_map = load_register_map(args.register_map)
+    connect = None
+    try:
+        if args.attach:
+            client = SnapshotClient(SharedSnapshotReader(args.attach, register_map))
+        else:
+            connect = functools.partial(connect_client, **client_kwargs_from_args(args))
+            client = connect()
+    except (ConnectionError, OSError, ValueError) as e:
+        sys.exit(str(e))
+    state = DashboardState(load_definitions(register_map))
+    server = DashboardServer(state, args.listen).start()
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    try:
+        run_dashboard(state, client, register_map, args.model, args.interval, stop_event, connect)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())